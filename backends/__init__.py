@@ -5,10 +5,30 @@ TTS 后端模块（EasyttsPugin）
 import sys
 sys.dont_write_bytecode = True
 
+from .admission import EndpointAdmissionQueue
+from .affinity import CharacterAffinity
 from .base import TTSBackendBase, TTSBackendRegistry, TTSResult
+from .config_snapshot import EasyTTSConfig, EasyTTSConfigCache, EasyTTSEndpoint
 from .easytts import EasyTTSBackend
+from .endpoint_health import EndpointHealthRegistry
+from .endpoint_schema import EndpointSchemaIndex
+from .endpoint_status import EndpointStatusPoller, EndpointStatusTable
 
 TTSBackendRegistry.register("easytts", EasyTTSBackend)
 
-__all__ = ["TTSBackendBase", "TTSBackendRegistry", "TTSResult", "EasyTTSBackend"]
+__all__ = [
+    "TTSBackendBase",
+    "TTSBackendRegistry",
+    "TTSResult",
+    "EasyTTSBackend",
+    "EasyTTSConfig",
+    "EasyTTSConfigCache",
+    "EasyTTSEndpoint",
+    "CharacterAffinity",
+    "EndpointAdmissionQueue",
+    "EndpointHealthRegistry",
+    "EndpointSchemaIndex",
+    "EndpointStatusPoller",
+    "EndpointStatusTable",
+]
 
@@ -0,0 +1,163 @@
+"""
+云端仓库准入队列：每个仓库按 max_concurrency 限制同时处理的合成任务数（计数名额）；
+所有候选仓库都满载时按 FIFO 排队等待，而不是直接判定失败。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional, Sequence
+
+from src.common.logger import get_logger
+
+logger = get_logger("easytts_backend.admission")
+
+
+@dataclass
+class _Waiter:
+    keys: Sequence[str]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class EndpointAdmissionQueue:
+    """
+    进程内共享的仓库名额表（in_flight / capacity）+ FIFO 等待队列。
+
+    释放名额时会立即把它交给队首第一个能使用该仓库的等待者（不经过“空闲”状态），
+    因此新来的请求不会插队到等待者前面。
+    """
+
+    _in_flight: Dict[str, int] = {}
+    _capacity: Dict[str, int] = {}
+    _waiters: Deque[_Waiter] = deque()
+
+    # 统计
+    _admitted_immediately: int = 0
+    _admitted_after_wait: int = 0
+    _timeouts: int = 0
+    _total_wait: float = 0.0
+    _max_wait: float = 0.0
+    _max_depth: int = 0
+
+    @classmethod
+    def set_capacity(cls, key: str, capacity: int) -> None:
+        """设置仓库的并发名额（至少 1）；名额变大时立即唤醒可以使用它的等待者。"""
+        capacity = max(1, int(capacity))
+        old = cls._capacity.get(key, 1)
+        cls._capacity[key] = capacity
+        if capacity > old:
+            while cls.in_flight(key) < capacity and cls._hand_over(key):
+                cls._in_flight[key] = cls.in_flight(key) + 1
+
+    @classmethod
+    def capacity(cls, key: str) -> int:
+        return cls._capacity.get(key, 1)
+
+    @classmethod
+    def in_flight(cls, key: str) -> int:
+        return cls._in_flight.get(key, 0)
+
+    @classmethod
+    def is_busy(cls, key: str) -> bool:
+        return cls.in_flight(key) >= cls.capacity(key)
+
+    @classmethod
+    def try_acquire(cls, keys: Sequence[str]) -> Optional[str]:
+        """按给定顺序占用第一个还有名额的仓库；全满时返回 None（不等待）。"""
+        for key in keys:
+            if not cls.is_busy(key):
+                cls._in_flight[key] = cls.in_flight(key) + 1
+                cls._admitted_immediately += 1
+                return key
+        return None
+
+    @classmethod
+    async def acquire(cls, keys: Sequence[str], timeout: float) -> Optional[str]:
+        """
+        占用 keys 中任意一个仓库；全忙时排队等待，最多 timeout 秒。
+        返回拿到的仓库 key，超时返回 None。
+        """
+        key = cls.try_acquire(keys)
+        if key is not None or timeout <= 0:
+            return key
+
+        waiter = _Waiter(keys=list(keys), future=asyncio.get_running_loop().create_future())
+        cls._waiters.append(waiter)
+        cls._max_depth = max(cls._max_depth, len(cls._waiters))
+        try:
+            key = await asyncio.wait_for(asyncio.shield(waiter.future), timeout=timeout)
+        except asyncio.TimeoutError:
+            key = None
+        except asyncio.CancelledError:
+            key = cls._abandon(waiter)
+            if key is not None:
+                cls.release(key)
+            raise
+        if key is None:
+            # 超时的同时可能刚好被分配到名额：此时要把名额还回去，避免泄漏。
+            key = cls._abandon(waiter)
+            if key is not None:
+                cls.release(key)
+            cls._timeouts += 1
+            return None
+
+        waited = time.monotonic() - waiter.enqueued_at
+        cls._admitted_after_wait += 1
+        cls._total_wait += waited
+        cls._max_wait = max(cls._max_wait, waited)
+        return key
+
+    @classmethod
+    def release(cls, key: str) -> None:
+        # 名额超出（例如并发数被调小）时直接回收，不转交
+        if cls.in_flight(key) <= cls.capacity(key) and cls._hand_over(key):
+            return
+        cls._in_flight[key] = max(0, cls.in_flight(key) - 1)
+
+    @classmethod
+    def _hand_over(cls, key: str) -> bool:
+        """把 key 的一个名额转交给队首第一个能使用它的等待者；in_flight 由调用方维护。"""
+        for waiter in list(cls._waiters):
+            if waiter.future.done():
+                cls._waiters.remove(waiter)
+                continue
+            if key in waiter.keys:
+                cls._waiters.remove(waiter)
+                waiter.future.set_result(key)
+                return True
+        return False
+
+    @classmethod
+    def _abandon(cls, waiter: _Waiter) -> Optional[str]:
+        """把等待者移出队列；若它已经被分配了名额则返回该 key。"""
+        try:
+            cls._waiters.remove(waiter)
+        except ValueError:
+            pass
+        fut = waiter.future
+        if fut.done() and not fut.cancelled():
+            return fut.result()
+        fut.cancel()
+        return None
+
+    @classmethod
+    def depth(cls) -> int:
+        return sum(1 for w in cls._waiters if not w.future.done())
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        waited = cls._admitted_after_wait
+        return {
+            "depth": cls.depth(),
+            "max_depth": cls._max_depth,
+            "in_flight": {k: v for k, v in cls._in_flight.items() if v},
+            "admitted_immediately": cls._admitted_immediately,
+            "admitted_after_wait": waited,
+            "timeouts": cls._timeouts,
+            "avg_wait_ms": round(cls._total_wait / waited * 1000, 1) if waited else 0.0,
+            "max_wait_ms": round(cls._max_wait * 1000, 1),
+        }
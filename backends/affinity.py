@@ -0,0 +1,58 @@
+"""
+角色 -> 仓库 亲和路由（粘滞表）。
+
+云端 Genie-TTS 会把最近用过的角色模型与参考音频编码保留在内存里；同一角色连续落到不同仓库时，
+每个仓库都要冷加载一次。亲和模式下同一角色优先发往上次成功合成它的仓库，
+该仓库排队超过溢出阈值时才按常规排序溢出到其它仓库。
+
+同时按“热/冷”分别统计 join -> process_completed 耗时：
+仓库在 保温时间 内合成过该角色记为热命中，否则记为冷启动。
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from ..utils.metrics import LatencyWindow
+
+
+class CharacterAffinity:
+    # 角色 -> 最近一次成功合成它的仓库 key
+    _sticky: Dict[str, str] = {}
+    # (仓库 key, 角色) -> 最近一次成功合成的时间（time.monotonic()）
+    _last_served: Dict[Tuple[str, str], float] = {}
+    _warm_latency = LatencyWindow()
+    _cold_latency = LatencyWindow()
+    _counters: Dict[str, int] = {"sticky_hits": 0, "spillovers": 0}
+
+    @classmethod
+    def preferred(cls, character: str) -> Optional[str]:
+        return cls._sticky.get(character)
+
+    @classmethod
+    def note_route(cls, *, sticky: bool) -> None:
+        cls._counters["sticky_hits" if sticky else "spillovers"] += 1
+
+    @classmethod
+    def record(cls, character: str, key: str, seconds: float, *, warm_ttl: float) -> bool:
+        """记录一次成功合成并更新粘滞表；返回这次是否为热命中。"""
+        now = time.monotonic()
+        last = cls._last_served.get((key, character))
+        warm = last is not None and (now - last) <= warm_ttl
+        (cls._warm_latency if warm else cls._cold_latency).add(seconds)
+        cls._last_served[(key, character)] = now
+        cls._sticky[character] = key
+        return warm
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        warm, cold = cls._warm_latency.summary(), cls._cold_latency.summary()
+        return {
+            **cls._counters,
+            "warm": warm,
+            "cold": cold,
+            "warm_speedup_p50": (
+                round(cold["p50_ms"] / warm["p50_ms"], 2) if warm["p50_ms"] and cold["p50_ms"] else None
+            ),
+        }
@@ -4,16 +4,27 @@ TTS 后端抽象基类与注册表（参考 tts_voice_plugin）
 
 import asyncio
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional, Tuple, Type
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Type
 
 from src.common.logger import get_logger
 
 from ..config_keys import ConfigKeys
+from ..utils.delivery import TTSDeliveryMemory
+from ..utils.download import AudioData
 
 logger = get_logger("easytts_backend")
 
+# 单次调用的上下文 (send_custom, log_prefix, 发送方式记忆的作用域)：后端实例会被多个会话并发复用，这些不能存在实例上。
+# asyncio 任务创建时会复制当前 context，因此 execute 内部派生的任务（如对冲请求）也能读到。
+_CALL_CONTEXT: ContextVar[Optional[Tuple[Optional[Callable], str, str]]] = ContextVar("tts_backend_call", default=None)
+
+# 文件发送模式下的发送方式（默认尝试顺序）
+DELIVERY_METHODS = ("file_uri", "path", "base64")
+
 
 @dataclass
 class TTSResult:
@@ -21,6 +32,10 @@ class TTSResult:
     message: str
     audio_path: Optional[str] = None
     backend_name: str = ""
+    # 仅 synthesize() 的结果：合成出的音频（尚未发送）与 角色:预设；
+    # 下载时已直接落盘的结果 audio_data 为 None，音频在 audio_path
+    audio_data: Optional[AudioData] = None
+    voice_info: str = ""
 
     def __iter__(self):
         return iter((self.success, self.message))
@@ -34,15 +49,70 @@ class TTSBackendBase(ABC):
 
     def __init__(self, config_getter: Callable[[str, Any], Any], log_prefix: str = ""):
         self.get_config = config_getter
-        self.log_prefix = log_prefix or f"[{self.backend_name}]"
+        self._log_prefix = log_prefix or f"[{self.backend_name}]"
         self._send_custom = None
 
     def set_send_custom(self, send_custom_func: Callable) -> None:
+        """旧接口：把发送函数绑定在实例上（仅适用于不复用的实例）；复用实例请用 run(send_custom=...)。"""
         self._send_custom = send_custom_func
 
+    @property
+    def log_prefix(self) -> str:
+        ctx = _CALL_CONTEXT.get()
+        return ctx[1] if ctx and ctx[1] else self._log_prefix
+
+    @property
+    def send_custom(self) -> Optional[Callable]:
+        ctx = _CALL_CONTEXT.get()
+        return ctx[0] if ctx and ctx[0] else self._send_custom
+
+    @property
+    def delivery_scope(self) -> str:
+        """发送方式记忆按平台（适配器）区分；未传入时共用一条。"""
+        ctx = _CALL_CONTEXT.get()
+        return ctx[2] if ctx else ""
+
+    @contextmanager
+    def _call_context(self, send_custom: Optional[Callable], log_prefix: str, delivery_scope: str = "") -> Iterator[None]:
+        token = _CALL_CONTEXT.set((send_custom, log_prefix, delivery_scope))
+        try:
+            yield
+        finally:
+            _CALL_CONTEXT.reset(token)
+
+    async def run(
+        self,
+        text: str,
+        voice: Optional[str] = None,
+        *,
+        send_custom: Callable = None,
+        log_prefix: str = "",
+        delivery_scope: str = "",
+        **kwargs,
+    ) -> "TTSResult":
+        """按调用传入 send_custom / 日志前缀 / 平台执行一次合成并发送（可在共享实例上并发调用）。"""
+        with self._call_context(send_custom, log_prefix, delivery_scope):
+            return await self.execute(text, voice, **kwargs)
+
+    async def run_synthesize(self, text: str, voice: Optional[str] = None, *, log_prefix: str = "", **kwargs) -> "TTSResult":
+        """只合成不发送（见 synthesize）；用于先并行合成多句、再按顺序发送。"""
+        with self._call_context(None, log_prefix):
+            return await self.synthesize(text, voice, **kwargs)
+
+    async def run_send(
+        self, result: "TTSResult", *, send_custom: Callable, log_prefix: str = "", delivery_scope: str = ""
+    ) -> "TTSResult":
+        """发送 run_synthesize 得到的音频。"""
+        with self._call_context(send_custom, log_prefix, delivery_scope):
+            if result.audio_data is None and result.audio_path:
+                return await self.send_audio_file(result.audio_path, voice_info=result.voice_info)
+            return await self.send_audio(
+                result.audio_data or b"", audio_format=self.default_audio_format, voice_info=result.voice_info
+            )
+
     async def send_audio(
         self,
-        audio_data: bytes,
+        audio_data: AudioData,
         audio_format: str = "wav",
         prefix: str = "tts",
         voice_info: str = "",
@@ -51,17 +121,20 @@ class TTSBackendBase(ABC):
 
         if not audio_data:
             return TTSResult(False, "音频数据为空", backend_name=self.backend_name)
-        if not self._send_custom:
+        send_custom = self.send_custom
+        if not send_custom:
             return TTSResult(False, "send_custom 未设置", backend_name=self.backend_name)
 
         use_base64 = bool(self.get_config(ConfigKeys.GENERAL_USE_BASE64_AUDIO, True))
         if use_base64:
             # MaiBot 的消息处理链路里，语音类型是 "voice"，并且 data 预期是 base64 字符串。
-            base64_audio = TTSFileManager.audio_to_base64(audio_data)
-            if not base64_audio:
+            base64_uri = await TTSFileManager.audio_to_base64_uri_async(audio_data)
+            if not base64_uri:
                 return TTSResult(False, "音频转 base64 失败", backend_name=self.backend_name)
             # NapCat/OneBot11 more reliably supports `record(file="base64://...")` than `data:audio/wav;base64,...`
-            ok = await self._send_custom(message_type="voiceurl", content=f"base64://{base64_audio}")
+            ok = await send_custom(message_type="voiceurl", content=base64_uri)
+            # base64 模式只有一种方式，只计数不参与排序
+            TTSDeliveryMemory.record(self.delivery_scope, "base64", ok, 0)
             if not ok:
                 return TTSResult(False, "发送语音失败（base64）", backend_name=self.backend_name)
             return TTSResult(
@@ -70,53 +143,100 @@ class TTSBackendBase(ABC):
                 backend_name=self.backend_name,
             )
 
+        delivery_ttl = float(self.get_config(ConfigKeys.GENERAL_DELIVERY_MEMORY_TTL, 600) or 0)
+        skip = ()
+        if TTSDeliveryMemory.preferred(self.delivery_scope, delivery_ttl) == "base64":
+            # 该平台上次只有 base64 能发出去：先不写文件，失败再按文件方式走一遍（不再重复 base64）
+            result = await self._deliver({"base64": None}, audio_data=audio_data, voice_info=voice_info)
+            if result.success:
+                return result
+            skip = ("base64",)
+
         output_dir = self.get_config(ConfigKeys.GENERAL_AUDIO_OUTPUT_DIR, "")
         audio_path = TTSFileManager.generate_temp_path(prefix=prefix, suffix=f".{audio_format}", output_dir=output_dir)
         if not await TTSFileManager.write_audio_async(audio_path, audio_data):
             return TTSResult(False, "save audio file failed", backend_name=self.backend_name)
+        return await self.send_audio_file(audio_path, voice_info=voice_info, audio_data=audio_data, skip=skip)
 
-        # Try local file first, then file:// URI, then fallback to base64.
+    async def send_audio_file(
+        self, audio_path: str, voice_info: str = "", audio_data: Optional[AudioData] = None, skip: Tuple[str, ...] = ()
+    ) -> TTSResult:
+        """
+        发送已写入磁盘的音频（文件方式）；audio_data 为空时（下载时已直接落盘）仅在 base64 兜底时才读文件。
+        """
+        # Default order: file:// URI, then bare path, then base64 (works across containers without shared volumes).
         # Docker/NapCat deployments often cannot resolve bare absolute paths like "/xxx.wav".
-        candidates = []
+        attempts: Dict[str, Optional[str]] = {}
         try:
             pp = Path(audio_path)
             if pp.is_absolute():
-                candidates.append(pp.as_uri())
+                attempts["file_uri"] = pp.as_uri()
         except Exception:
             pass
-        candidates.append(audio_path)
+        attempts["path"] = audio_path
+        attempts["base64"] = None
+        for method in skip:
+            attempts.pop(method, None)
+        return await self._deliver(attempts, audio_path=audio_path, audio_data=audio_data, voice_info=voice_info)
 
+    async def _deliver(
+        self,
+        attempts: Dict[str, Optional[str]],
+        *,
+        audio_path: Optional[str] = None,
+        audio_data: Optional[AudioData] = None,
+        voice_info: str = "",
+    ) -> TTSResult:
+        """
+        按 发送方式记忆 排好的顺序逐个尝试 voiceurl 发送；base64 内容在轮到时才编码。
+        成功后删除 audio_path（延迟 60 秒，等适配器读完）。
+        """
+        from ..utils.file import TTSFileManager
+
+        send_custom = self.send_custom
+        if not send_custom:
+            return TTSResult(False, "send_custom 未设置", backend_name=self.backend_name)
+
+        scope = self.delivery_scope
+        ttl = float(self.get_config(ConfigKeys.GENERAL_DELIVERY_MEMORY_TTL, 600) or 0)
         last_err = ""
-        for c in candidates:
+        for method in TTSDeliveryMemory.order(scope, list(attempts), ttl):
+            content = attempts[method]
             try:
-                ok = await self._send_custom(message_type="voiceurl", content=c)
-                if ok:
-                    asyncio.create_task(TTSFileManager.cleanup_file_async(audio_path, delay=60))
-                    return TTSResult(
-                        True,
-                        f"sent {self.backend_name} voice (voiceurl)",
-                        audio_path=audio_path,
-                        backend_name=self.backend_name,
-                    )
+                if method == "base64":
+                    if audio_data is None:
+                        loop = asyncio.get_event_loop()
+                        audio_data = await loop.run_in_executor(None, Path(audio_path).read_bytes)
+                    content = await TTSFileManager.audio_to_base64_uri_async(audio_data)
+                    if not content:
+                        last_err = "base64 encode failed"
+                        continue
+                ok = await send_custom(message_type="voiceurl", content=content)
             except Exception as e:
                 last_err = str(e)
-
-        # Fallback: base64 (works across containers without shared volumes).
-        try:
-            base64_audio = TTSFileManager.audio_to_base64(audio_data)
-            if base64_audio:
-                ok = await self._send_custom(message_type="voiceurl", content=f"base64://{base64_audio}")
-                if ok:
+                ok = False
+            TTSDeliveryMemory.record(scope, method, ok, ttl)
+            if ok:
+                if audio_path:
                     asyncio.create_task(TTSFileManager.cleanup_file_async(audio_path, delay=60))
-                    return TTSResult(True, f"sent {self.backend_name} voice (base64-fallback)", backend_name=self.backend_name)
-        except Exception as e:
-            last_err = str(e)
+                return TTSResult(
+                    True,
+                    f"sent {self.backend_name} voice{(' (' + voice_info + ')') if voice_info else ''} ({method})",
+                    audio_path=audio_path if method != "base64" else None,
+                    backend_name=self.backend_name,
+                )
+            logger.debug(f"{self.log_prefix} voice delivery via {method} failed, delivery={TTSDeliveryMemory.stats()}")
+
+        return TTSResult(False, f"send voice failed ({'/'.join(attempts)}): {last_err}", backend_name=self.backend_name)
 
-        return TTSResult(False, f"send voice failed (voiceurl/file + base64 fallback): {last_err}", backend_name=self.backend_name)
     @abstractmethod
     async def execute(self, text: str, voice: Optional[str] = None, **kwargs) -> TTSResult:
         raise NotImplementedError
 
+    async def synthesize(self, text: str, voice: Optional[str] = None, **kwargs) -> TTSResult:
+        """只合成、不发送：成功时 TTSResult.audio_data 为音频字节。后端不支持拆分时返回失败。"""
+        return TTSResult(False, f"{self.backend_name} 不支持单独合成", backend_name=self.backend_name)
+
     def validate_config(self) -> Tuple[bool, str]:
         return True, ""
 
@@ -127,6 +247,9 @@ class TTSBackendBase(ABC):
 
 class TTSBackendRegistry:
     _backends: Dict[str, Type[TTSBackendBase]] = {}
+    # (后端名, 配置版本) -> 长期复用的实例
+    _instances: Dict[Tuple[str, Any], TTSBackendBase] = {}
+    _instance_stats: Dict[str, int] = {"hits": 0, "creates": 0}
 
     @classmethod
     def register(cls, name: str, backend_class: Type[TTSBackendBase]) -> None:
@@ -143,3 +266,39 @@ class TTSBackendRegistry:
         if not backend_class:
             return None
         return backend_class(config_getter, log_prefix)
+
+    @classmethod
+    def acquire(
+        cls,
+        name: str,
+        config_getter: Callable[[str, Any], Any],
+        *,
+        config_version: Any,
+        log_prefix: str = "",
+        setup: Optional[Callable[[TTSBackendBase], None]] = None,
+    ) -> Optional[TTSBackendBase]:
+        """
+        取长期复用的后端实例，按 (name, config_version) 缓存；config_version 应随配置快照的每次重建而变化，
+        变化后该后端的旧实例被丢弃（新实例经 setup 拿到新快照）。
+        setup 只在新建实例时调用一次（例如注入配置快照）。
+        复用实例上不要 set_send_custom，应通过 run(send_custom=...) 按调用传入。
+        """
+        key = (name, config_version)
+        backend = cls._instances.get(key)
+        if backend is not None:
+            cls._instance_stats["hits"] += 1
+            return backend
+        backend = cls.create(name, config_getter, log_prefix)
+        if backend is None:
+            return None
+        if setup:
+            setup(backend)
+        cls._instances = {k: v for k, v in cls._instances.items() if k[0] != name}
+        cls._instances[key] = backend
+        cls._instance_stats["creates"] += 1
+        logger.debug(f"create pooled backend: {name} config_version={config_version}")
+        return backend
+
+    @classmethod
+    def instance_stats(cls) -> Dict[str, int]:
+        return {**cls._instance_stats, "live": len(cls._instances)}
@@ -0,0 +1,259 @@
+"""
+EasyTTS 后端的只读配置快照。
+
+热路径（每次合成）上不再逐项走 get_config_with_aliases（每个 key 可能要查两次字典路径），
+而是在配置版本变化时一次性解析成冻结的 slotted dataclass：仓库池、角色 -> 预设索引、各项超时与阈值。
+快照由插件按 (版本号, 配置内容指纹) 缓存；插件自己改动内存配置（schema 同步、槽位回填）后调用 invalidate()。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from ..config_keys import ConfigKeys
+from ..utils.audio_post import AudioPostOptions
+from ..utils.file import TTSFileManager
+from .endpoint_health import EndpointHealth, EndpointHealthRegistry
+
+
+@dataclass(frozen=True, slots=True)
+class EasyTTSEndpoint:
+    name: str
+    base_url: str
+    studio_token: str
+    fn_index: int
+    trigger_id: int
+    # 该仓库允许同时处理的合成任务数（自建的多并发 Genie-TTS 可调大）
+    max_concurrency: int = 1
+    # 共享状态表/健康度/名额的索引 key，构造时算好
+    key: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "key", f"{self.base_url}|{self.studio_token}|{self.fn_index}|{self.trigger_id}")
+
+    @property
+    def health(self) -> EndpointHealth:
+        """滚动健康状态（按 key 跨请求共享）。"""
+        return EndpointHealthRegistry.get(self.key)
+
+
+def _parse_endpoints(raw: Any) -> Tuple[EasyTTSEndpoint, ...]:
+    endpoints: List[EasyTTSEndpoint] = []
+    for idx, item in enumerate(raw if isinstance(raw, list) else []):
+        if not isinstance(item, dict):
+            continue
+
+        # 新版中文 key（推荐）+ 旧版英文 key（兼容）
+        base_url = str(item.get("基地址", item.get("base_url", ""))).rstrip("/")
+        studio_token = str(item.get("令牌", item.get("studio_token", ""))).strip()
+        name = str(item.get("名称", item.get("name", f"endpoint-{idx}"))).strip() or f"endpoint-{idx}"
+        fn_index = int(item.get("函数索引", item.get("fn_index", 3)) or 3)
+        trigger_id = int(item.get("触发ID", item.get("trigger_id", 19)) or 19)
+        max_concurrency = max(1, int(item.get("最大并发", item.get("max_concurrency", 1)) or 1))
+        if base_url:
+            endpoints.append(
+                EasyTTSEndpoint(
+                    name=name,
+                    base_url=base_url,
+                    studio_token=studio_token,
+                    fn_index=fn_index,
+                    trigger_id=trigger_id,
+                    max_concurrency=max_concurrency,
+                )
+            )
+    return tuple(endpoints)
+
+
+def _parse_characters(raw: Any) -> Dict[str, Tuple[str, ...]]:
+    """easytts.characters -> {角色: (预设, ...)}；同名角色以第一项为准。"""
+    out: Dict[str, Tuple[str, ...]] = {}
+    for item in raw if isinstance(raw, list) else []:
+        if not isinstance(item, dict):
+            continue
+        name = str(item.get("角色名", item.get("name", ""))).strip()
+        if not name or name in out:
+            continue
+        presets = item.get("预设列表", item.get("presets", []))
+        out[name] = tuple(str(x).strip() for x in presets if str(x).strip()) if isinstance(presets, list) else ()
+    return out
+
+
+@dataclass(frozen=True, slots=True)
+class EasyTTSConfig:
+    version: int
+    endpoints: Tuple[EasyTTSEndpoint, ...]
+    # 角色 -> 预设（有序，用于展示/回退）与 角色 -> 预设集合（用于校验）
+    character_preset_list: Mapping[str, Tuple[str, ...]]
+    character_presets: Mapping[str, FrozenSet[str]]
+    default_character: str
+    default_preset: str
+    remote_split_sentence: bool
+    schema_version: str
+    # 路由 / 状态
+    prefer_idle_endpoint: bool
+    busy_queue_threshold: int
+    status_timeout: int
+    concurrent_status_probe: bool
+    status_poller: bool
+    status_poll_min_interval: float
+    status_poll_max_interval: float
+    status_ttl: float
+    queue_wait_timeout: float
+    # 合成各阶段超时（秒）
+    join_timeout: int
+    sse_timeout: int
+    download_timeout: int
+    # 单个音频的下载上限（字节，0=不限）
+    download_max_bytes: int
+    # 发送方式（general 段）：base64 / 文件；文件模式下的输出目录
+    use_base64_audio: bool
+    audio_output_dir: str
+    # HTTP
+    trust_env: bool
+    http_keep_alive: bool
+    http_keepalive_timeout: float
+    http_prewarm: bool
+    # 健康度 / 熔断
+    health_ewma_alpha: float
+    breaker_failure_threshold: int
+    breaker_cooldown: float
+    # 对冲
+    hedge_enabled: bool
+    hedge_percentile: float
+    hedge_min_delay: float
+    hedge_default_delay: float
+    # 角色亲和
+    affinity_enabled: bool
+    affinity_spillover_queue: int
+    affinity_warm_ttl: float
+    # 音频缓存（已换算为字节 / 绝对路径；磁盘上限为 0 时 disk_dir 为空）
+    audio_cache_enabled: bool
+    audio_cache_memory_bytes: int
+    audio_cache_disk_dir: str
+    audio_cache_disk_bytes: int
+    # 音频后处理（未开启时为 None）
+    audio_post: Optional[AudioPostOptions]
+
+    @classmethod
+    def from_getter(cls, get_config: Callable[..., Any], *, version: int = 0) -> "EasyTTSConfig":
+        g = get_config
+        character_preset_list = _parse_characters(g(ConfigKeys.EASYTTS_CHARACTERS, []) or [])
+
+        disk_mb = float(g(ConfigKeys.EASYTTS_AUDIO_CACHE_DISK_MB, 256) or 0)
+        disk_dir = str(g(ConfigKeys.EASYTTS_AUDIO_CACHE_DIR, "") or "").strip()
+        if disk_mb > 0:
+            disk_dir = (
+                TTSFileManager.resolve_path(disk_dir)
+                if disk_dir
+                else os.path.join(TTSFileManager.get_temp_dir(), "easytts_audio_cache")
+            )
+        else:
+            disk_dir = ""
+
+        audio_post = None
+        if bool(g(ConfigKeys.EASYTTS_AUDIO_POST_ENABLED, False)):
+            audio_post = AudioPostOptions(
+                trim_db=float(g(ConfigKeys.EASYTTS_AUDIO_POST_TRIM_DB, -45) or 0),
+                normalize_db=float(g(ConfigKeys.EASYTTS_AUDIO_POST_NORMALIZE_DB, -1) or 0),
+                mono=bool(g(ConfigKeys.EASYTTS_AUDIO_POST_MONO, True)),
+                sample_rate=int(g(ConfigKeys.EASYTTS_AUDIO_POST_SAMPLE_RATE, 0) or 0),
+            )
+
+        min_interval = float(g(ConfigKeys.EASYTTS_STATUS_POLL_MIN_INTERVAL, 3) or 3)
+        max_interval = float(g(ConfigKeys.EASYTTS_STATUS_POLL_MAX_INTERVAL, 20) or 20)
+
+        return cls(
+            version=version,
+            endpoints=_parse_endpoints(g(ConfigKeys.EASYTTS_ENDPOINTS, []) or []),
+            character_preset_list=MappingProxyType(character_preset_list),
+            character_presets=MappingProxyType({c: frozenset(p) for c, p in character_preset_list.items()}),
+            default_character=str(g(ConfigKeys.EASYTTS_DEFAULT_CHARACTER, "mika")),
+            default_preset=str(g(ConfigKeys.EASYTTS_DEFAULT_PRESET, "普通")),
+            remote_split_sentence=bool(g(ConfigKeys.EASYTTS_REMOTE_SPLIT_SENTENCE, True)),
+            schema_version=str(g(ConfigKeys.EASYTTS_SCHEMA_VERSION, "") or ""),
+            prefer_idle_endpoint=bool(g(ConfigKeys.EASYTTS_PREFER_IDLE_ENDPOINT, True)),
+            busy_queue_threshold=int(g(ConfigKeys.EASYTTS_BUSY_QUEUE_THRESHOLD, 0) or 0),
+            status_timeout=int(g(ConfigKeys.EASYTTS_STATUS_TIMEOUT, 3) or 3),
+            concurrent_status_probe=bool(g(ConfigKeys.EASYTTS_CONCURRENT_STATUS_PROBE, True)),
+            status_poller=bool(g(ConfigKeys.EASYTTS_STATUS_POLLER, True)),
+            status_poll_min_interval=min_interval,
+            status_poll_max_interval=max(max_interval, min_interval),
+            status_ttl=float(g(ConfigKeys.EASYTTS_STATUS_TTL, 30) or 30),
+            queue_wait_timeout=float(g(ConfigKeys.EASYTTS_QUEUE_WAIT_TIMEOUT, 60) or 0),
+            join_timeout=int(g(ConfigKeys.EASYTTS_JOIN_TIMEOUT, 30) or 30),
+            sse_timeout=int(g(ConfigKeys.EASYTTS_SSE_TIMEOUT, 300) or 300),
+            download_timeout=int(g(ConfigKeys.EASYTTS_DOWNLOAD_TIMEOUT, 120) or 120),
+            download_max_bytes=int(float(g(ConfigKeys.EASYTTS_DOWNLOAD_MAX_MB, 50) or 0) * 1024 * 1024),
+            use_base64_audio=bool(g(ConfigKeys.GENERAL_USE_BASE64_AUDIO, True)),
+            audio_output_dir=str(g(ConfigKeys.GENERAL_AUDIO_OUTPUT_DIR, "") or ""),
+            trust_env=bool(g(ConfigKeys.EASYTTS_TRUST_ENV, False)),
+            http_keep_alive=bool(g(ConfigKeys.EASYTTS_HTTP_KEEP_ALIVE, True)),
+            http_keepalive_timeout=float(g(ConfigKeys.EASYTTS_HTTP_KEEPALIVE_TIMEOUT, 30) or 30),
+            http_prewarm=bool(g(ConfigKeys.EASYTTS_HTTP_PREWARM, True)),
+            health_ewma_alpha=float(g(ConfigKeys.EASYTTS_HEALTH_EWMA_ALPHA, 0.3) or 0.3),
+            breaker_failure_threshold=int(g(ConfigKeys.EASYTTS_BREAKER_FAILURE_THRESHOLD, 3) or 3),
+            breaker_cooldown=float(g(ConfigKeys.EASYTTS_BREAKER_COOLDOWN, 60) or 60),
+            hedge_enabled=bool(g(ConfigKeys.EASYTTS_HEDGE_ENABLED, False)),
+            hedge_percentile=float(g(ConfigKeys.EASYTTS_HEDGE_PERCENTILE, 90) or 90),
+            hedge_min_delay=float(g(ConfigKeys.EASYTTS_HEDGE_MIN_DELAY, 3) or 0),
+            hedge_default_delay=float(g(ConfigKeys.EASYTTS_HEDGE_DEFAULT_DELAY, 10) or 10),
+            affinity_enabled=bool(g(ConfigKeys.EASYTTS_AFFINITY_ENABLED, False)),
+            affinity_spillover_queue=int(g(ConfigKeys.EASYTTS_AFFINITY_SPILLOVER_QUEUE, 2) or 0),
+            affinity_warm_ttl=float(g(ConfigKeys.EASYTTS_AFFINITY_WARM_TTL, 600) or 600),
+            audio_cache_enabled=bool(g(ConfigKeys.EASYTTS_AUDIO_CACHE_ENABLED, True)),
+            audio_cache_memory_bytes=int(float(g(ConfigKeys.EASYTTS_AUDIO_CACHE_MEMORY_MB, 32) or 0) * 1024 * 1024),
+            audio_cache_disk_dir=disk_dir,
+            audio_cache_disk_bytes=int(disk_mb * 1024 * 1024),
+            audio_post=audio_post,
+        )
+
+
+class EasyTTSConfigCache:
+    """
+    缓存最近一次构建的快照：invalidate() 版本号与配置内容指纹都没变时直接复用，否则重新构建。
+    指纹覆盖 easytts / general 两段，原地修改同一个 dict（WebUI 写入、热重载）也能被发现；只保留最新一份。
+    """
+
+    _version: int = 0
+    # (构建时的版本号, 内容指纹, 快照)
+    _latest: Optional[Tuple[int, str, EasyTTSConfig]] = None
+    _builds: int = 0
+
+    @classmethod
+    def invalidate(cls) -> int:
+        """内存配置被改动后调用；下次 get() 会重新构建快照。"""
+        cls._version += 1
+        return cls._version
+
+    @classmethod
+    def version(cls) -> int:
+        return cls._version
+
+    @staticmethod
+    def fingerprint(cfg: dict) -> str:
+        raw = json.dumps(
+            [cfg.get("easytts"), cfg.get("general")], sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def get(cls, cfg: dict, build: Callable[[int], EasyTTSConfig]) -> EasyTTSConfig:
+        latest = cls._latest
+        if latest is not None and latest[0] == cls._version and latest[1] == cls.fingerprint(cfg):
+            return latest[2]
+        version = cls._version
+        # 快照的 version 取构建序号（每次重建都不同），后端池按它区分实例，新快照必然换到新实例上
+        cls._builds += 1
+        snapshot = build(cls._builds)
+        # 构建时会回填槽位字段（改动 cfg），指纹取构建之后的内容
+        cls._latest = (version, cls.fingerprint(cfg), snapshot)
+        return snapshot
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        return {"version": cls._version, "builds": cls._builds}
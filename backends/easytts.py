@@ -1,46 +1,56 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import time
 import uuid
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from src.common.logger import get_logger
 
-from ..config_keys import ConfigKeys
+from ..utils.audio_cache import TTSAudioCache
+from ..utils.audio_post import AudioPostOptions, TTSAudioPostProcessor
+from ..utils.download import AudioData, SpooledAudio, TTSDownloadStats, stream_audio
 from ..utils.file import TTSFileManager
+from ..utils.metrics import LatencyWindow
 from ..utils.session import TTSSessionManager
+from ..utils.sse import iter_sse_events
+from .admission import EndpointAdmissionQueue
+from .affinity import CharacterAffinity
 from .base import TTSBackendBase, TTSResult
+from .config_snapshot import EasyTTSConfig, EasyTTSEndpoint
+from .endpoint_health import BREAKER_CLOSED, BREAKER_HALF_OPEN
+from .endpoint_schema import EndpointSchemaIndex
+from .endpoint_status import EndpointStatusPoller, EndpointStatusTable
 
 logger = get_logger("easytts_backend.easytts")
 
 
-@dataclass(frozen=True)
-class EasyTTSEndpoint:
-    name: str
-    base_url: str
-    studio_token: str
-    fn_index: int
-    trigger_id: int
-
-    @property
-    def key(self) -> str:
-        return f"{self.base_url}|{self.studio_token}|{self.fn_index}|{self.trigger_id}"
-
-
 class EasyTTSBackend(TTSBackendBase):
     backend_name = "easytts"
     backend_description = "EasyTTS（ModelScope Studio / Gradio）后端 + 云端仓库池自动切换"
     default_audio_format = "wav"
 
-    _endpoint_locks: Dict[str, asyncio.Lock] = {}
-    _locks_guard = asyncio.Lock()
+    # 最近成功合成的耗时（整次合成 / join -> process_completed），用于对冲延迟与报表
+    _synth_latency = LatencyWindow()
+    _completion_latency = LatencyWindow()
+    _hedge_counters: Dict[str, int] = {"requests": 0, "hedged": 0, "backup_wins": 0}
 
     def __init__(self, config_getter, log_prefix: str = ""):
         super().__init__(config_getter, log_prefix)
         self._data_type = ["dropdown", "textbox", "checkbox", "radio", "dropdown", "audio", "textbox"]
+        # 最近一次 queue/status 探测耗时（毫秒），用于观察路由开销
+        self.last_probe_ms: float = 0.0
+        self._config: Optional[EasyTTSConfig] = None
+
+    def set_config_snapshot(self, config: EasyTTSConfig) -> None:
+        self._config = config
+
+    @property
+    def cfg(self) -> EasyTTSConfig:
+        """只读配置快照；调用方没有传入时按 get_config 现场构建一次。"""
+        if self._config is None:
+            self._config = EasyTTSConfig.from_getter(self.get_config)
+        return self._config
 
     def validate_config(self) -> Tuple[bool, str]:
         endpoints = self._load_endpoints()
@@ -52,35 +62,7 @@ class EasyTTSBackend(TTSBackendBase):
         return True, ""
 
     def _load_endpoints(self) -> List[EasyTTSEndpoint]:
-        raw = self.get_config(ConfigKeys.EASYTTS_ENDPOINTS, []) or []
-        endpoints: List[EasyTTSEndpoint] = []
-        for idx, item in enumerate(raw):
-            if not isinstance(item, dict):
-                continue
-
-            # 新版中文 key（推荐）+ 旧版英文 key（兼容）
-            base_url = str(item.get("基地址", item.get("base_url", ""))).rstrip("/")
-            studio_token = str(item.get("令牌", item.get("studio_token", ""))).strip()
-            name = str(item.get("名称", item.get("name", f"endpoint-{idx}"))).strip() or f"endpoint-{idx}"
-            fn_index = int(item.get("函数索引", item.get("fn_index", 3)) or 3)
-            trigger_id = int(item.get("触发ID", item.get("trigger_id", 19)) or 19)
-            if base_url:
-                endpoints.append(
-                    EasyTTSEndpoint(
-                        name=name,
-                        base_url=base_url,
-                        studio_token=studio_token,
-                        fn_index=fn_index,
-                        trigger_id=trigger_id,
-                    )
-                )
-        return endpoints
-
-    async def _get_or_create_lock(self, key: str) -> asyncio.Lock:
-        async with self._locks_guard:
-            if key not in self._endpoint_locks:
-                self._endpoint_locks[key] = asyncio.Lock()
-            return self._endpoint_locks[key]
+        return list(self.cfg.endpoints)
 
     def _headers(self, token: str, *, json_content: bool = True) -> Dict[str, str]:
         headers: Dict[str, str] = {
@@ -92,11 +74,33 @@ class EasyTTSBackend(TTSBackendBase):
             headers["Content-Type"] = "application/json"
         return headers
 
+    async def _session_manager(self, *endpoints: EasyTTSEndpoint) -> TTSSessionManager:
+        """
+        取共享的 session 管理器，并按当前配置设置连接模式。
+        连接池模式下每个仓库的单 host 连接数 = 2 * 最大并发 + 1（SSE 与下载可能同时占用，另留一条给状态探测）。
+        """
+        trust_env = self.cfg.trust_env
+        session_manager = await TTSSessionManager.get_instance(trust_env=trust_env)
+        session_manager.configure_pool(
+            pooled=self.cfg.http_keep_alive,
+            keepalive_timeout=self.cfg.http_keepalive_timeout,
+        )
+        for ep in endpoints:
+            session_manager.set_host_limit(f"easytts:{ep.name}", 2 * ep.max_concurrency + 1)
+        return session_manager
+
+    async def prewarm_connections(self) -> Dict[str, bool]:
+        """连接池模式下，提前与所有仓库建立连接（TCP+TLS 握手），返回各仓库是否成功。"""
+        endpoints = self._load_endpoints()
+        if not endpoints or not self.cfg.http_prewarm:
+            return {}
+        session_manager = await self._session_manager(*endpoints)
+        return await session_manager.prewarm({f"easytts:{ep.name}": ep.base_url for ep in endpoints})
+
     async def _get_queue_size(self, ep: EasyTTSEndpoint) -> Optional[int]:
         status_url = f"{ep.base_url}/gradio_api/queue/status"
-        status_timeout = int(self.get_config(ConfigKeys.EASYTTS_STATUS_TIMEOUT, 3) or 3)
-        trust_env = bool(self.get_config(ConfigKeys.EASYTTS_TRUST_ENV, False))
-        session_manager = await TTSSessionManager.get_instance(trust_env=trust_env)
+        status_timeout = self.cfg.status_timeout
+        session_manager = await self._session_manager(ep)
         try:
             async with session_manager.get(
                 status_url,
@@ -112,25 +116,118 @@ class EasyTTSBackend(TTSBackendBase):
         except Exception:
             return None
 
-    async def _sorted_endpoints(self, endpoints: List[EasyTTSEndpoint]) -> List[EasyTTSEndpoint]:
-        prefer_idle = bool(self.get_config(ConfigKeys.EASYTTS_PREFER_IDLE_ENDPOINT, True))
-        busy_threshold = int(self.get_config(ConfigKeys.EASYTTS_BUSY_QUEUE_THRESHOLD, 0) or 0)
+    async def _probe_queue_sizes(
+        self, endpoints: List[EasyTTSEndpoint], *, source: str = "request"
+    ) -> Dict[str, Optional[int]]:
+        """
+        探测各仓库的 queue_size，并写入共享状态表 EndpointStatusTable。
+        并发模式下所有仓库同时探测，整体只等待一次 状态超时；到期仍未返回的仓库视为未知。
+        """
+        concurrent = self.cfg.concurrent_status_probe
+        status_timeout = self.cfg.status_timeout
+        sizes: Dict[str, Optional[int]] = {}
+        started = time.perf_counter()
+
+        if not concurrent or len(endpoints) <= 1:
+            for ep in endpoints:
+                sizes[ep.key] = await self._get_queue_size(ep)
+        else:
+            tasks = {asyncio.create_task(self._get_queue_size(ep)): ep for ep in endpoints}
+            done, pending = await asyncio.wait(tasks.keys(), timeout=status_timeout)
+            for task in pending:
+                task.cancel()
+            for task, ep in tasks.items():
+                sizes[ep.key] = task.result() if task in done and not task.cancelled() else None
 
-        sizes: List[Tuple[EasyTTSEndpoint, int]] = []
         for ep in endpoints:
-            qs = await self._get_queue_size(ep)
-            sizes.append((ep, qs if isinstance(qs, int) else 10_000))
+            EndpointStatusTable.record(ep.key, ep.name, sizes.get(ep.key), max_concurrency=ep.max_concurrency)
 
-        sizes.sort(key=lambda x: (x[1], x[0].name))
-        if not prefer_idle:
-            return [ep for ep, _ in sizes]
-        idle = [ep for ep, qs in sizes if qs <= busy_threshold]
-        busy = [ep for ep, qs in sizes if qs > busy_threshold]
-        return idle + busy
+        took_ms = (time.perf_counter() - started) * 1000
+        answered = sum(1 for qs in sizes.values() if isinstance(qs, int))
+        msg = (
+            f"{self.log_prefix} status probe source={source} mode={'concurrent' if concurrent else 'serial'} "
+            f"endpoints={len(endpoints)} answered={answered} took={took_ms:.0f}ms"
+        )
+        if source == "poller":
+            logger.debug(msg)
+        else:
+            self.last_probe_ms = took_ms
+            logger.info(msg)
+        return sizes
+
+    async def _queue_sizes_for_routing(self, endpoints: List[EasyTTSEndpoint]) -> Dict[str, Optional[int]]:
+        """
+        优先读取后台轮询维护的状态表（不发网络请求）；过期/缺失的仓库才按需探测。
+        """
+        self.last_probe_ms = 0.0
+        if not self.cfg.status_poller:
+            return await self._probe_queue_sizes(endpoints)
+
+        EndpointStatusPoller.ensure_started()
+        ttl = self.cfg.status_ttl
+        sizes: Dict[str, Optional[int]] = {}
+        stale: List[EasyTTSEndpoint] = []
+        for ep in endpoints:
+            entry = EndpointStatusTable.get_fresh(ep.key, ttl)
+            if entry is None:
+                stale.append(ep)
+            else:
+                sizes[ep.key] = entry.queue_size
+        if stale:
+            sizes.update(await self._probe_queue_sizes(stale))
+        logger.debug(f"{self.log_prefix} status table fresh={len(endpoints) - len(stale)} probed={len(stale)}")
+        return sizes
+
+    async def _sorted_endpoints(
+        self, endpoints: List[EasyTTSEndpoint], character: str = ""
+    ) -> Tuple[List[EasyTTSEndpoint], List[EasyTTSEndpoint]]:
+        """
+        返回 (排好序的仓库, 本次占到试探名额的半开仓库)；后者若最终没有派发，调用方需 on_abandon 归还。
+        按预估完成时间排序（queue_size、并发数、阶段耗时 EWMA、错误率），并跳过熔断中的仓库。
+        优先空闲仓库 开启时，queue_size <= 繁忙阈值 的仓库整体排在前面。
+        启用角色亲和时，上次合成该角色的仓库排在最前，除非其 queue_size 超过溢出阈值（或未知）。
+        """
+        prefer_idle = self.cfg.prefer_idle_endpoint
+        busy_threshold = self.cfg.busy_queue_threshold
+        cooldown = self.cfg.breaker_cooldown
+
+        allowed: List[EasyTTSEndpoint] = []
+        trials: List[EasyTTSEndpoint] = []
+        for ep in endpoints:
+            if ep.health.allow_request(cooldown):
+                allowed.append(ep)
+                if ep.health.state == BREAKER_HALF_OPEN:
+                    trials.append(ep)
+            else:
+                logger.debug(f"{self.log_prefix} skip endpoint={ep.name}: breaker {ep.health.state}")
+
+        probed = await self._queue_sizes_for_routing(allowed)
+        ranked: List[Tuple[bool, float, str, EasyTTSEndpoint]] = []
+        for ep in allowed:
+            qs = probed.get(ep.key)
+            busy = not isinstance(qs, int) or qs > busy_threshold
+            expected = ep.health.expected_completion(qs, ep.max_concurrency)
+            ranked.append((busy and prefer_idle, expected, ep.name, ep))
+        ranked.sort(key=lambda x: x[:3])
+        ordered = [item[-1] for item in ranked]
+
+        if character and self.cfg.affinity_enabled:
+            sticky = next((ep for ep in ordered if ep.key == CharacterAffinity.preferred(character)), None)
+            if sticky is not None:
+                spillover = self.cfg.affinity_spillover_queue
+                qs = probed.get(sticky.key)
+                if isinstance(qs, int) and qs <= spillover:
+                    ordered.remove(sticky)
+                    ordered.insert(0, sticky)
+                    CharacterAffinity.note_route(sticky=True)
+                else:
+                    CharacterAffinity.note_route(sticky=False)
+                    logger.info(f"{self.log_prefix} affinity spillover: {character} endpoint={sticky.name} queue={qs}")
+        return ordered, trials
 
     def _parse_voice(self, voice: Optional[str]) -> Tuple[str, str, str, bool]:
-        default_character = self.get_config(ConfigKeys.EASYTTS_DEFAULT_CHARACTER, "mika")
-        default_preset = self.get_config(ConfigKeys.EASYTTS_DEFAULT_PRESET, "普通")
+        default_character = self.cfg.default_character
+        default_preset = self.cfg.default_preset
         raw = (voice or "").strip()
         if not raw:
             return default_character, default_preset, f"{default_character}:{default_preset}", False
@@ -147,19 +244,7 @@ class EasyTTSBackend(TTSBackendBase):
         读取 easytts.characters 中该角色支持的 preset 列表。
         注意：preset 必须是云端 WebUI 里真实存在的下拉值，否则会触发 Gradio 报错。
         """
-        chars = self.get_config(ConfigKeys.EASYTTS_CHARACTERS, []) or []
-        if not isinstance(chars, list):
-            return []
-        for item in chars:
-            if not isinstance(item, dict):
-                continue
-            name = str(item.get("角色名", item.get("name", ""))).strip()
-            if name != character:
-                continue
-            raw = item.get("预设列表", item.get("presets", []))
-            if isinstance(raw, list):
-                return [str(x).strip() for x in raw if str(x).strip()]
-        return []
+        return list(self.cfg.character_preset_list.get(character, ()))
 
     def _resolve_preset_by_emotion(self, *, character: str, preset: str, emotion: str, explicit_preset: bool) -> str:
         """
@@ -173,13 +258,40 @@ class EasyTTSBackend(TTSBackendBase):
         if not emo or explicit_preset:
             return preset
 
-        allowed_presets = self._load_character_presets(character)
-        if allowed_presets and emo in set(allowed_presets):
+        if emo in self.cfg.character_presets.get(character, ()):
             return emo
 
         # 仅回退，不做同义词/映射
         return preset
 
+    def _route_by_schema(
+        self, endpoints: List[EasyTTSEndpoint], character: str, preset: str
+    ) -> Tuple[List[EasyTTSEndpoint], str, Optional[str]]:
+        """
+        按分仓库 schema 过滤出能提供 角色:预设 的仓库（还没抓到 schema 的仓库视为可用）。
+        返回 (仓库列表, 预设, 错误信息)：
+        - 有仓库的角色存在但预设不存在时，在本地回退到这些仓库支持的默认预设，不再发到云端碰运气；
+        - 没有任何仓库提供该角色时返回错误。
+        """
+        capable = [ep for ep in endpoints if EndpointSchemaIndex.can_serve(ep.base_url, character, preset) is not False]
+        if capable:
+            return capable, preset, None
+
+        hosts = [ep for ep in endpoints if EndpointSchemaIndex.presets_for(ep.base_url, character)]
+        if not hosts:
+            return [], preset, f"没有云端仓库提供角色 {character}"
+
+        default_preset = self.cfg.default_preset
+        first_presets = EndpointSchemaIndex.presets_for(hosts[0].base_url, character) or ()
+        fallback = default_preset if any(
+            EndpointSchemaIndex.can_serve(ep.base_url, character, default_preset) for ep in hosts
+        ) else first_presets[0]
+        logger.warning(
+            f"{self.log_prefix} preset not served by any endpoint, fallback locally. "
+            f"character={character}, requested={preset}, resolved={fallback}"
+        )
+        return [ep for ep in hosts if EndpointSchemaIndex.can_serve(ep.base_url, character, fallback)], fallback, None
+
     def _pick_output_audio(self, out: List[Any]) -> Any:
         best_idx = -1
         best_score = -1
@@ -211,11 +323,19 @@ class EasyTTSBackend(TTSBackendBase):
         character: str,
         preset: str,
         split_sentence: bool,
-    ) -> bytes:
-        join_timeout = int(self.get_config(ConfigKeys.EASYTTS_JOIN_TIMEOUT, 30) or 30)
-        sse_timeout = int(self.get_config(ConfigKeys.EASYTTS_SSE_TIMEOUT, 300) or 300)
-        download_timeout = int(self.get_config(ConfigKeys.EASYTTS_DOWNLOAD_TIMEOUT, 120) or 120)
-        trust_env = bool(self.get_config(ConfigKeys.EASYTTS_TRUST_ENV, False))
+        progress: Optional[Dict[str, float]] = None,
+        spool_dir: Optional[str] = None,
+    ) -> Union[AudioData, SpooledAudio]:
+        """
+        在指定仓库上完成一次 queue/join -> queue/data(SSE) -> 下载。
+        progress 若提供，会写入各阶段完成时刻（time.monotonic()）：started / joined / completed / downloaded。
+        spool_dir 不为 None 时音频边下载边写入该目录下的新文件（返回 SpooledAudio），否则流式读入内存。
+        """
+        progress = progress if progress is not None else {}
+        progress["started"] = time.monotonic()
+        join_timeout = self.cfg.join_timeout
+        sse_timeout = self.cfg.sse_timeout
+        download_timeout = self.cfg.download_timeout
 
         payload: Dict[str, Any] = {
             "fn_index": ep.fn_index,
@@ -231,7 +351,7 @@ class EasyTTSBackend(TTSBackendBase):
         )
         data_url = f"{ep.base_url}/gradio_api/queue/data?session_hash={payload['session_hash']}&studio_token={ep.studio_token}"
 
-        session_manager = await TTSSessionManager.get_instance(trust_env=trust_env)
+        session_manager = await self._session_manager(ep)
 
         async with session_manager.post(
             join_url,
@@ -243,6 +363,7 @@ class EasyTTSBackend(TTSBackendBase):
             if join_resp.status != 200:
                 body = await join_resp.text()
                 raise RuntimeError(f"queue/join failed: {join_resp.status} {body[:200]}")
+        progress["joined"] = time.monotonic()
 
         audio_url: Optional[str] = None
         file_path: Optional[str] = None
@@ -257,44 +378,33 @@ class EasyTTSBackend(TTSBackendBase):
                 body = await data_resp.text()
                 raise RuntimeError(f"queue/data failed: {data_resp.status} {body[:200]}")
 
-            buffer = ""
-            async for chunk in data_resp.content.iter_chunked(4096):
-                if not chunk:
+            async for sse_evt in iter_sse_events(data_resp.content.iter_any()):
+                if not sse_evt.data:
                     continue
-                buffer += chunk.decode("utf-8", errors="ignore")
-                while "\n" in buffer:
-                    line, buffer = buffer.split("\n", 1)
-                    line = line.strip()
-                    if not line.startswith("data:"):
-                        continue
-                    data_str = line[5:].strip()
-                    if not data_str:
-                        continue
-                    try:
-                        evt = json.loads(data_str)
-                    except Exception:
-                        continue
-                    if evt.get("msg") != "process_completed":
-                        continue
-                    if not evt.get("success", True):
-                        raise RuntimeError(f"process_completed but success=false: {evt}")
-                    out = (evt.get("output") or {}).get("data") or []
-                    if not out:
-                        raise RuntimeError(f"process_completed but output.data empty: {evt}")
-                    picked = self._pick_output_audio(out)
-                    if isinstance(picked, dict):
-                        file_path = picked.get("path")
-                        audio_url = picked.get("url") or None
-                        if not audio_url and isinstance(file_path, str):
-                            if file_path.startswith("/tmp/"):
-                                audio_url = f"{ep.base_url}/gradio_api/file={file_path}"
-                            elif file_path.startswith("/"):
-                                audio_url = f"{ep.base_url}{file_path}"
-                    elif isinstance(picked, str):
-                        audio_url = picked
-                    break
-                if audio_url:
-                    break
+                try:
+                    evt = sse_evt.json()
+                except Exception:
+                    continue
+                if not isinstance(evt, dict) or evt.get("msg") != "process_completed":
+                    continue
+                progress["completed"] = time.monotonic()
+                if not evt.get("success", True):
+                    raise RuntimeError(f"process_completed but success=false: {evt}")
+                out = (evt.get("output") or {}).get("data") or []
+                if not out:
+                    raise RuntimeError(f"process_completed but output.data empty: {evt}")
+                picked = self._pick_output_audio(out)
+                if isinstance(picked, dict):
+                    file_path = picked.get("path")
+                    audio_url = picked.get("url") or None
+                    if not audio_url and isinstance(file_path, str):
+                        if file_path.startswith("/tmp/"):
+                            audio_url = f"{ep.base_url}/gradio_api/file={file_path}"
+                        elif file_path.startswith("/"):
+                            audio_url = f"{ep.base_url}{file_path}"
+                elif isinstance(picked, str):
+                    audio_url = picked
+                break
 
         if not audio_url:
             raise RuntimeError("No audio url returned from SSE.")
@@ -310,13 +420,193 @@ class EasyTTSBackend(TTSBackendBase):
             if dl_resp.status != 200:
                 body = await dl_resp.text()
                 raise RuntimeError(f"download failed: {dl_resp.status} {body[:200]}")
-            audio_bytes = await dl_resp.read()
-            ok, err = TTSFileManager.validate_audio_data(audio_bytes)
+            spool_path = TTSFileManager.generate_temp_path(prefix="tts", output_dir=spool_dir) if spool_dir is not None else ""
+            audio = await stream_audio(dl_resp, max_bytes=self.cfg.download_max_bytes, spool_path=spool_path)
+            ok, err = TTSFileManager.validate_audio_data(audio)
             if not ok:
+                if isinstance(audio, SpooledAudio):
+                    TTSFileManager.cleanup_file(audio.path)
                 raise RuntimeError(f"invalid audio data: {err}")
+            progress["downloaded"] = time.monotonic()
+            logger.debug(f"{self.log_prefix} downloaded {len(audio)} bytes, download={TTSDownloadStats.stats()}")
+            return audio
+
+    def _hedge_delay(self) -> Optional[float]:
+        """
+        对冲等待时间：取最近 join -> process_completed 耗时的第 对冲分位数；
+        样本不足时使用 对冲默认延迟。未开启对冲时返回 None。
+        """
+        if not self.cfg.hedge_enabled:
+            return None
+        percentile = self.cfg.hedge_percentile
+        min_delay = self.cfg.hedge_min_delay
+        default_delay = self.cfg.hedge_default_delay
+        window = EasyTTSBackend._completion_latency
+        delay = window.percentile(percentile) if len(window) >= 10 else None
+        return max(min_delay, delay if delay is not None else default_delay)
+
+    async def _synthesize_holding_slot(
+        self, ep: EasyTTSEndpoint, key: str, progress: Dict[str, float], **kwargs
+    ) -> Union[AudioData, SpooledAudio]:
+        """
+        在已占用的仓库名额上合成；无论成功/失败/被取消都会归还名额。
+        成败与各阶段耗时会记入该仓库的健康状态（熔断器/EWMA）。
+        """
+        alpha = self.cfg.health_ewma_alpha
+        failure_threshold = self.cfg.breaker_failure_threshold
+        health = ep.health
+        try:
+            audio_bytes = await self._synthesize_on_endpoint(ep, progress=progress, **kwargs)
+        except asyncio.CancelledError:
+            health.on_abandon()
+            raise
+        except Exception:
+            health.record_failure(alpha=alpha, failure_threshold=failure_threshold)
+            if health.state != BREAKER_CLOSED:
+                logger.warning(f"{self.log_prefix} endpoint={ep.name} breaker {health.state}: {health.to_dict()}")
+            raise
+        finally:
+            EndpointAdmissionQueue.release(key)
+
+        stages = {
+            "join": progress["joined"] - progress["started"],
+            "queue": progress["completed"] - progress["joined"],
+            "download": progress["downloaded"] - progress["completed"],
+            "total": progress["downloaded"] - progress["started"],
+        }
+        health.record_success(stages, alpha=alpha)
+        EasyTTSBackend._completion_latency.add(stages["queue"])
+        character = str(kwargs.get("character") or "")
+        if character:
+            warm_ttl = self.cfg.affinity_warm_ttl
+            warm = CharacterAffinity.record(character, ep.key, stages["queue"], warm_ttl=warm_ttl)
+            logger.debug(
+                f"{self.log_prefix} endpoint={ep.name} {character} {'warm' if warm else 'cold'} "
+                f"queue={stages['queue'] * 1000:.0f}ms affinity={CharacterAffinity.stats()}"
+            )
+        return audio_bytes
+
+    async def _synthesize_hedged(
+        self,
+        primary: EasyTTSEndpoint,
+        *,
+        ordered: List[EasyTTSEndpoint],
+        tried: set,
+        voice_info: str,
+        **kwargs,
+    ) -> Union[AudioData, SpooledAudio]:
+        """
+        在 primary 上合成；开启对冲时，若超过对冲延迟仍未收到 process_completed，
+        则在下一个空闲仓库上同时提交同一任务，先拿到音频的一方胜出，另一方被取消。
+        名额已由调用方占用（primary.key），这里负责归还。
+        """
+        started = time.monotonic()
+        hedge_delay = self._hedge_delay()
+        tasks: Dict[asyncio.Task, EasyTTSEndpoint] = {}
+        primary_progress: Dict[str, float] = {}
+        primary_task = asyncio.create_task(
+            self._synthesize_holding_slot(primary, primary.key, primary_progress, **kwargs)
+        )
+        tasks[primary_task] = primary
+        winner_task: Optional[asyncio.Task] = None
+        hedged = False
+        try:
+            if hedge_delay is not None:
+                done, _ = await asyncio.wait({primary_task}, timeout=hedge_delay)
+                if not done and "completed" not in primary_progress:
+                    backup_key = EndpointAdmissionQueue.try_acquire([ep.key for ep in ordered if ep.key not in tried])
+                    if backup_key is not None:
+                        tried.add(backup_key)
+                        backup = next(ep for ep in ordered if ep.key == backup_key)
+                        hedged = True
+                        logger.info(
+                            f"{self.log_prefix} hedge: {primary.name} no result after {hedge_delay:.1f}s, "
+                            f"also submit to {backup.name} {voice_info}"
+                        )
+                        backup_task = asyncio.create_task(self._synthesize_holding_slot(backup, backup_key, {}, **kwargs))
+                        tasks[backup_task] = backup
+
+            errors: List[str] = []
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner_task = task
+                        winner = tasks[task]
+                        EasyTTSBackend._record_hedge(time.monotonic() - started, hedged, winner is not primary)
+                        if hedged:
+                            logger.info(
+                                f"{self.log_prefix} hedge winner={winner.name}, stats={EasyTTSBackend.hedge_stats()}"
+                            )
+                        return task.result()
+                    errors.append(f"{tasks[task].name}: {task.exception()}")
+            raise RuntimeError("; ".join(errors))
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif task is not winner_task and not task.cancelled() and task.exception() is None:
+                    # 对冲落败但也已下载完成：落盘的文件没人用，删掉
+                    loser = task.result()
+                    if isinstance(loser, SpooledAudio):
+                        TTSFileManager.cleanup_file(loser.path)
+
+    @classmethod
+    def _record_hedge(cls, seconds: float, hedged: bool, backup_won: bool) -> None:
+        cls._hedge_counters["requests"] += 1
+        cls._hedge_counters["hedged"] += int(hedged)
+        cls._hedge_counters["backup_wins"] += int(backup_won)
+        cls._synth_latency.add(seconds)
+
+    @classmethod
+    def hedge_stats(cls) -> Dict[str, Any]:
+        requests = cls._hedge_counters["requests"]
+        return {
+            **cls._hedge_counters,
+            "hedge_rate": round(cls._hedge_counters["hedged"] / requests, 3) if requests else 0.0,
+            "synth": cls._synth_latency.summary(),
+            "completion": cls._completion_latency.summary(),
+        }
+
+    def _audio_cache_settings(self) -> Tuple[bool, int, str, int]:
+        """返回 (是否启用, 内存上限字节, 磁盘目录, 磁盘上限字节)；磁盘上限为 0 时不启用磁盘层。"""
+        cfg = self.cfg
+        return cfg.audio_cache_enabled, cfg.audio_cache_memory_bytes, cfg.audio_cache_disk_dir, cfg.audio_cache_disk_bytes
+
+    async def _post_process_audio(self, audio_bytes: AudioData, options: AudioPostOptions, voice_info: str) -> AudioData:
+        """可选后处理（去静音/归一化/单声道/重采样），在线程池里执行；numpy 缺失或处理失败时原样返回。"""
+        if not TTSAudioPostProcessor.available():
+            TTSAudioPostProcessor.note_skipped()
+            logger.warning(f"{self.log_prefix} audio post-processing enabled but numpy is not installed, skipped")
+            return audio_bytes
+        try:
+            loop = asyncio.get_event_loop()
+            out, info = await loop.run_in_executor(None, TTSAudioPostProcessor.process, audio_bytes, options)
+        except Exception as e:
+            TTSAudioPostProcessor.note_skipped()
+            logger.warning(f"{self.log_prefix} audio post-processing failed, send original audio: {e}")
             return audio_bytes
+        logger.info(
+            f"{self.log_prefix} audio post {voice_info}: {info['bytes_in']} -> {info['bytes_out']} bytes "
+            f"({info['ms']}ms), stats={TTSAudioPostProcessor.stats()}"
+        )
+        return out
 
     async def execute(self, text: str, voice: Optional[str] = None, **kwargs) -> TTSResult:
+        # 文件发送模式下音频边下载边写进输出文件，不在内存里攒整段
+        result = await self.synthesize(text, voice, spool=not self.cfg.use_base64_audio, **kwargs)
+        if not result.success:
+            return result
+        if result.audio_data is None and result.audio_path:
+            return await self.send_audio_file(result.audio_path, voice_info=result.voice_info)
+        return await self.send_audio(result.audio_data, audio_format="wav", prefix="tts", voice_info=result.voice_info)
+
+    async def synthesize(self, text: str, voice: Optional[str] = None, *, spool: bool = False, **kwargs) -> TTSResult:
+        """
+        spool=True 时下载直接落盘到输出目录（TTSResult.audio_path，audio_data 为 None）；
+        开启音频后处理时需要在内存里处理，忽略 spool。
+        """
         ok, err = self.validate_config()
         if not ok:
             return TTSResult(False, err, backend_name=self.backend_name)
@@ -340,31 +630,111 @@ class EasyTTSBackend(TTSBackendBase):
                 f"{self.log_prefix} preset not in available presets, fallback to default. "
                 f"character={character}, requested={emotion}, resolved={preset}, available={available_presets}"
             )
+        # 分仓库 schema：只路由到能提供 角色:预设 的仓库，预设在本地校验/回退
+        endpoints, preset, route_error = self._route_by_schema(self._load_endpoints(), character, preset)
+        if route_error:
+            return TTSResult(False, route_error, backend_name=self.backend_name)
         voice_info = f"{character}:{preset}"
-        remote_split = bool(self.get_config(ConfigKeys.EASYTTS_REMOTE_SPLIT_SENTENCE, True))
+        remote_split = self.cfg.remote_split_sentence
+
+        cache_enabled, cache_memory_bytes, cache_dir, cache_disk_bytes = self._audio_cache_settings()
+        cache_key = ""
+        if cache_enabled:
+            cache_key = TTSAudioCache.make_key(
+                text=text,
+                character=character,
+                preset=preset,
+                remote_split=remote_split,
+                schema_version=self.cfg.schema_version,
+                variant=self.cfg.audio_post.signature() if self.cfg.audio_post else "",
+            )
+            cached = await TTSAudioCache.get(cache_key, memory_max_bytes=cache_memory_bytes, disk_dir=cache_dir)
+            if cached is not None:
+                logger.info(f"{self.log_prefix} audio cache hit {voice_info}, stats={TTSAudioCache.stats()}")
+                return TTSResult(
+                    True, "audio cache hit", backend_name=self.backend_name, audio_data=cached, voice_info=voice_info
+                )
 
-        endpoints = self._load_endpoints()
-        ordered = await self._sorted_endpoints(endpoints)
+        ordered, trials = await self._sorted_endpoints(endpoints, character)
+        if not ordered:
+            return TTSResult(False, "所有云端仓库均处于熔断冷却中，请稍后再试", backend_name=self.backend_name)
 
-        last_error: Optional[str] = None
-        for ep in ordered:
-            lock = await self._get_or_create_lock(ep.key)
-            if lock.locked():
-                continue
-            async with lock:
+        tried: set = set()
+        try:
+            by_key = {ep.key: ep for ep in ordered}
+            for ep in ordered:
+                EndpointAdmissionQueue.set_capacity(ep.key, ep.max_concurrency)
+            queue_wait_timeout = self.cfg.queue_wait_timeout
+            deadline = time.monotonic() + queue_wait_timeout
+            last_error: Optional[str] = None
+            while True:
+                candidates = [ep.key for ep in ordered if ep.key not in tried]
+                if not candidates:
+                    break
+                # 所有候选仓库名额都占满时排队等待（FIFO），直到任一仓库空出名额或超过 排队等待超时。
+                key = await EndpointAdmissionQueue.acquire(candidates, timeout=deadline - time.monotonic())
+                if key is None:
+                    logger.warning(
+                        f"{self.log_prefix} all endpoints busy, queue wait timeout ({queue_wait_timeout:.0f}s), "
+                        f"queue={EndpointAdmissionQueue.stats()}"
+                    )
+                    if last_error is None:
+                        return TTSResult(
+                            False,
+                            f"所有云端仓库均繁忙：排队等待超时（{queue_wait_timeout:.0f}s）",
+                            backend_name=self.backend_name,
+                        )
+                    break
+                tried.add(key)
+                ep = by_key[key]
                 try:
                     logger.info(f"{self.log_prefix} use endpoint={ep.name} {voice_info}")
-                    audio_bytes = await self._synthesize_on_endpoint(
+                    audio_bytes = await self._synthesize_hedged(
                         ep,
+                        ordered=ordered,
+                        tried=tried,
+                        voice_info=voice_info,
                         text=text,
                         character=character,
                         preset=preset,
                         split_sentence=remote_split,
+                        spool_dir=self.cfg.audio_output_dir if spool and not self.cfg.audio_post else None,
                     )
-                    return await self.send_audio(audio_bytes, audio_format="wav", prefix="tts", voice_info=voice_info)
                 except Exception as e:
-                    last_error = f"{ep.name}: {e}"
+                    # _synthesize_hedged 抛出的错误已带上仓库名（可能包含主/备两个仓库）
+                    last_error = str(e)
                     logger.warning(f"{self.log_prefix} endpoint failed: {last_error}")
                     continue
+                if isinstance(audio_bytes, SpooledAudio):
+                    # 已落盘：缓存只写磁盘层（复制文件），不把整段读回内存
+                    if cache_key and cache_dir:
+                        await TTSAudioCache.put_file(
+                            cache_key, audio_bytes.path, disk_dir=cache_dir, disk_max_bytes=cache_disk_bytes
+                        )
+                    return TTSResult(
+                        True,
+                        f"synthesized on {ep.name}",
+                        audio_path=audio_bytes.path,
+                        backend_name=self.backend_name,
+                        voice_info=voice_info,
+                    )
+                if self.cfg.audio_post:
+                    audio_bytes = await self._post_process_audio(audio_bytes, self.cfg.audio_post, voice_info)
+                if cache_key:
+                    await TTSAudioCache.put(
+                        cache_key,
+                        audio_bytes,
+                        memory_max_bytes=cache_memory_bytes,
+                        disk_dir=cache_dir,
+                        disk_max_bytes=cache_disk_bytes,
+                    )
+                return TTSResult(
+                    True, f"synthesized on {ep.name}", backend_name=self.backend_name, audio_data=audio_bytes, voice_info=voice_info
+                )
 
-        return TTSResult(False, f"所有云端仓库均失败：{last_error or 'unknown error'}", backend_name=self.backend_name)
+            return TTSResult(False, f"所有云端仓库均失败：{last_error or 'unknown error'}", backend_name=self.backend_name)
+        finally:
+            # 路由时占到的试探名额，最终没派发到该仓库（选了别的仓库/排队超时/出错）：归还
+            for ep in trials:
+                if ep.key not in tried:
+                    ep.health.on_abandon()
@@ -0,0 +1,116 @@
+"""
+云端仓库健康度：各阶段耗时 EWMA、近期错误率 EWMA，以及熔断器（closed / open / half_open）。
+
+- closed：正常参与路由；
+- open：连续失败达到阈值后打开，冷却期内不参与路由；
+- half_open：冷却期结束后放行一次试探请求，成功则恢复 closed，失败则重新 open。
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+# 没有任何成功样本时，假定一次合成的耗时（秒）
+DEFAULT_SYNTH_SECONDS = 10.0
+
+
+@dataclass
+class EndpointHealth:
+    key: str
+    # 阶段耗时 EWMA（秒）：join / queue(join -> process_completed) / download / total
+    stage_ewma: Dict[str, float] = field(default_factory=dict)
+    # 失败指示（0/1）的 EWMA
+    error_rate: float = 0.0
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    state: str = BREAKER_CLOSED
+    opened_at: float = 0.0
+    trial_in_flight: bool = False
+
+    def _ewma(self, old: Optional[float], value: float, alpha: float) -> float:
+        return value if old is None else (alpha * value + (1 - alpha) * old)
+
+    def record_success(self, stages: Dict[str, float], *, alpha: float = 0.3) -> None:
+        for name, seconds in stages.items():
+            if seconds >= 0:
+                self.stage_ewma[name] = self._ewma(self.stage_ewma.get(name), seconds, alpha)
+        self.error_rate = self._ewma(self.error_rate if self.successes + self.failures else None, 0.0, alpha)
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.trial_in_flight = False
+        self.state = BREAKER_CLOSED
+
+    def record_failure(self, *, alpha: float = 0.3, failure_threshold: int = 3) -> None:
+        self.error_rate = self._ewma(self.error_rate if self.successes + self.failures else None, 1.0, alpha)
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.trial_in_flight = False
+        if self.state == BREAKER_HALF_OPEN or self.consecutive_failures >= max(1, failure_threshold):
+            self.state = BREAKER_OPEN
+            self.opened_at = time.monotonic()
+
+    def allow_request(self, cooldown: float) -> bool:
+        """
+        是否允许路由到该仓库；open 状态冷却结束后转为 half_open，只放行一个试探请求。
+        half_open 下返回 True 即占住试探名额（路由时就占，避免排队期间放行多个试探）；
+        占到名额的请求要么派发（成败由 record_* 结算），要么调用 on_abandon 归还。
+        """
+        if self.state == BREAKER_OPEN:
+            if time.monotonic() - self.opened_at < cooldown:
+                return False
+            self.state = BREAKER_HALF_OPEN
+        if self.state == BREAKER_HALF_OPEN:
+            if self.trial_in_flight:
+                return False
+            self.trial_in_flight = True
+        return True
+
+    def on_abandon(self) -> None:
+        """请求被取消（例如对冲落败）或最终没有派发：不计成败，只释放试探名额。"""
+        self.trial_in_flight = False
+
+    def expected_completion(self, queue_size: Optional[int], max_concurrency: int = 1) -> float:
+        """
+        预估在该仓库完成一次合成的耗时（秒）：
+        (排在前面的任务数 / 并发数 + 1) * 单次耗时 EWMA，再按错误率放大（失败需要重试其它仓库）。
+        queue_size 未知时按 10 个排队任务估计。
+        """
+        per_job = self.stage_ewma.get("total", DEFAULT_SYNTH_SECONDS)
+        ahead = queue_size if isinstance(queue_size, int) else 10
+        expected = (ahead / max(1, max_concurrency) + 1) * per_job
+        return expected / max(0.1, 1.0 - self.error_rate)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "error_rate": round(self.error_rate, 3),
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "stage_ewma_ms": {k: round(v * 1000, 1) for k, v in self.stage_ewma.items()},
+        }
+
+
+class EndpointHealthRegistry:
+    """按 EasyTTSEndpoint.key 共享的健康状态（跨后端实例/跨请求保留）。"""
+
+    _entries: Dict[str, EndpointHealth] = {}
+
+    @classmethod
+    def get(cls, key: str) -> EndpointHealth:
+        entry = cls._entries.get(key)
+        if entry is None:
+            entry = EndpointHealth(key=key)
+            cls._entries[key] = entry
+        return entry
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Dict[str, Any]]:
+        return {k: v.to_dict() for k, v in cls._entries.items()}
@@ -0,0 +1,104 @@
+"""
+按仓库（base_url）索引的 Gradio schema：角色 -> 该仓库可用的预设。
+
+不同仓库可能部署了不同的模型包，路由时据此只选择能提供 角色:预设 的仓库；
+索引由插件的 schema 刷新按仓库增量写入，并随 schema 缓存文件落盘。
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class EndpointSchemaIndex:
+    # base_url -> {角色: (预设, ...)}；保留预设顺序，方便合并后回写配置
+    _entries: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+    _fetched_at: Dict[str, float] = {}
+
+    @staticmethod
+    def _norm(base_url: str) -> str:
+        return str(base_url or "").rstrip("/")
+
+    @classmethod
+    def record(
+        cls,
+        base_url: str,
+        char_presets: Dict[str, Iterable[str]],
+        *,
+        failed: Iterable[str] = (),
+        fetched_at: Optional[float] = None,
+    ) -> None:
+        """
+        写入一个仓库的抓取结果：以本次结果为准（云端删掉的角色会被移除），
+        但本次抓取失败的角色沿用旧条目。
+        """
+        key = cls._norm(base_url)
+        old = cls._entries.get(key, {})
+        entry: Dict[str, Tuple[str, ...]] = {}
+        for c, presets in char_presets.items():
+            presets = tuple(str(p).strip() for p in presets if str(p).strip())
+            if presets:
+                entry[str(c).strip()] = presets
+        for c in failed:
+            if c not in entry and c in old:
+                entry[c] = old[c]
+        cls._entries[key] = entry
+        cls._fetched_at[key] = float(fetched_at if fetched_at is not None else time.time())
+
+    @classmethod
+    def fetched_at(cls, base_url: str) -> float:
+        return cls._fetched_at.get(cls._norm(base_url), 0.0)
+
+    @classmethod
+    def get(cls, base_url: str) -> Optional[Dict[str, Tuple[str, ...]]]:
+        return cls._entries.get(cls._norm(base_url))
+
+    @classmethod
+    def can_serve(cls, base_url: str, character: str, preset: str) -> Optional[bool]:
+        """该仓库能否合成 角色:预设；仓库尚未抓取过 schema 时返回 None（未知）。"""
+        entry = cls._entries.get(cls._norm(base_url))
+        if entry is None:
+            return None
+        return preset in entry.get(character, ())
+
+    @classmethod
+    def presets_for(cls, base_url: str, character: str) -> Optional[Tuple[str, ...]]:
+        entry = cls._entries.get(cls._norm(base_url))
+        if entry is None:
+            return None
+        return entry.get(character, ())
+
+    @classmethod
+    def merged(cls, base_urls: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+        """
+        多个仓库的并集（角色 -> 预设列表，保持首次出现的顺序），用于回写配置、约束 LLM。
+        base_urls 为 None 时合并全部仓库。
+        """
+        keys = list(cls._entries) if base_urls is None else [cls._norm(u) for u in base_urls]
+        out: Dict[str, List[str]] = {}
+        for entry in (cls._entries[k] for k in keys if k in cls._entries):
+            for c, presets in entry.items():
+                bucket = out.setdefault(c, [])
+                bucket.extend(p for p in presets if p not in bucket)
+        return out
+
+    @classmethod
+    def dump(cls) -> Dict[str, dict]:
+        """落盘格式：{base_url: {"fetched_at": ..., "characters": {角色: [预设...]}}}。"""
+        return {
+            k: {"fetched_at": int(cls._fetched_at.get(k, 0)), "characters": {c: list(p) for c, p in v.items()}}
+            for k, v in cls._entries.items()
+        }
+
+    @classmethod
+    def load(cls, data: Dict[str, dict]) -> None:
+        for base_url, item in (data or {}).items():
+            if not isinstance(item, dict) or not isinstance(item.get("characters"), dict):
+                continue
+            cls.record(base_url, item["characters"], fetched_at=float(item.get("fetched_at", 0) or 0))
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._entries.clear()
+        cls._fetched_at.clear()
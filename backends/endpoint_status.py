@@ -0,0 +1,175 @@
+"""
+云端仓库状态表 + 后台轮询（queue_size / 最近可达时间 / 可达性）。
+
+状态表是进程内共享的：后台轮询与按需探测都会写入，EasyTTSBackend.execute 读取时不发网络请求；
+条目超过 TTL 视为过期，由调用方回退到按需探测。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from src.common.logger import get_logger
+
+from .admission import EndpointAdmissionQueue
+
+logger = get_logger("easytts_backend.status")
+
+
+@dataclass
+class EndpointStatus:
+    key: str
+    name: str
+    queue_size: Optional[int] = None
+    reachable: bool = False
+    # 最近一次探测成功的时间（time.time()），0 表示从未成功
+    last_seen: float = 0.0
+    # 最近一次探测（无论成败）的时间（time.monotonic()），用于 TTL 判断
+    probed_at: float = 0.0
+    consecutive_failures: int = 0
+    max_concurrency: int = 1
+
+    def is_fresh(self, ttl: float) -> bool:
+        return self.probed_at > 0 and (time.monotonic() - self.probed_at) <= ttl
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "queue_size": self.queue_size,
+            "reachable": self.reachable,
+            "last_seen": self.last_seen,
+            "age": round(time.monotonic() - self.probed_at, 3) if self.probed_at else None,
+            "consecutive_failures": self.consecutive_failures,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": EndpointAdmissionQueue.in_flight(self.key),
+        }
+
+
+class EndpointStatusTable:
+    """按 EasyTTSEndpoint.key 索引的共享状态表。"""
+
+    _entries: Dict[str, EndpointStatus] = {}
+
+    @classmethod
+    def record(cls, key: str, name: str, queue_size: Optional[int], *, max_concurrency: int = 1) -> EndpointStatus:
+        entry = cls._entries.get(key)
+        if entry is None:
+            entry = EndpointStatus(key=key, name=name)
+            cls._entries[key] = entry
+        entry.name = name
+        entry.max_concurrency = max_concurrency
+        entry.probed_at = time.monotonic()
+        if isinstance(queue_size, int):
+            entry.queue_size = queue_size
+            entry.reachable = True
+            entry.last_seen = time.time()
+            entry.consecutive_failures = 0
+        else:
+            entry.queue_size = None
+            entry.reachable = False
+            entry.consecutive_failures += 1
+        return entry
+
+    @classmethod
+    def get(cls, key: str) -> Optional[EndpointStatus]:
+        return cls._entries.get(key)
+
+    @classmethod
+    def get_fresh(cls, key: str, ttl: float) -> Optional[EndpointStatus]:
+        entry = cls._entries.get(key)
+        if entry is None or not entry.is_fresh(ttl):
+            return None
+        return entry
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Dict[str, Any]]:
+        return {k: v.to_dict() for k, v in cls._entries.items()}
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._entries.clear()
+
+
+class EndpointStatusPoller:
+    """
+    后台轮询任务（由插件持有）：按自适应间隔刷新 EndpointStatusTable。
+
+    - 有仓库繁忙/不可达时按最小间隔轮询；
+    - 全部空闲且稳定时间隔逐步翻倍，直到最大间隔。
+    backend_factory 每轮调用一次，以便读取最新配置。
+    """
+
+    _backend_factory: Optional[Callable[[], Any]] = None
+    _task: Optional[asyncio.Task] = None
+    _interval: float = 0.0
+
+    @classmethod
+    def configure(cls, backend_factory: Callable[[], Any]) -> None:
+        cls._backend_factory = backend_factory
+
+    @classmethod
+    def is_running(cls) -> bool:
+        return cls._task is not None and not cls._task.done()
+
+    @classmethod
+    def ensure_started(cls) -> bool:
+        """在已有事件循环中启动轮询（幂等）；没有 factory 或没有运行中的事件循环时返回 False。"""
+        if cls.is_running():
+            return True
+        if cls._backend_factory is None:
+            return False
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        cls._task = loop.create_task(cls._run())
+        logger.info("endpoint status poller started")
+        return True
+
+    @classmethod
+    async def stop(cls) -> None:
+        """插件卸载时调用：停止轮询并丢弃 factory（它引用着旧插件实例），之后 ensure_started 不再自动启动。"""
+        cls._backend_factory = None
+        cls._interval = 0.0
+        task, cls._task = cls._task, None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    @classmethod
+    def _next_interval(cls, backend: Any, statuses: List[EndpointStatus]) -> float:
+        min_interval = backend.cfg.status_poll_min_interval
+        max_interval = backend.cfg.status_poll_max_interval
+        unsettled = any((not s.reachable) or (s.queue_size or 0) > 0 for s in statuses)
+        if unsettled or cls._interval <= 0:
+            return min_interval
+        return min(cls._interval * 2, max_interval)
+
+    @classmethod
+    async def _run(cls) -> None:
+        while True:
+            backend = None
+            try:
+                factory = cls._backend_factory
+                backend = factory() if factory else None
+                if backend is None or not backend.cfg.status_poller:
+                    cls._interval = 0.0
+                    await asyncio.sleep(30)
+                    continue
+                endpoints = backend._load_endpoints()
+                if endpoints:
+                    await backend._probe_queue_sizes(endpoints, source="poller")
+                statuses = [s for s in (EndpointStatusTable.get(ep.key) for ep in endpoints) if s]
+                cls._interval = cls._next_interval(backend, statuses)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"endpoint status poller error: {e}")
+                cls._interval = 0.0
+            await asyncio.sleep(cls._interval or 5)
@@ -16,9 +16,22 @@ class ConfigKeys:
     GENERAL_USE_REPLYER_REWRITE = "general.使用LLM润色"
     GENERAL_AUDIO_OUTPUT_DIR = "general.音频输出目录"
     GENERAL_USE_BASE64_AUDIO = "general.使用Base64语音"
+    GENERAL_DELIVERY_MEMORY_TTL = "general.发送方式记忆时长"
     GENERAL_SPLIT_SENTENCES = "general.分句发送"
     GENERAL_SPLIT_DELAY = "general.分句间隔"
     GENERAL_SEND_ERROR_MESSAGES = "general.发送错误提示"
+    GENERAL_FIXED_MODE_PIPELINE_DEPTH = "general.固定模式并行句数"
+    GENERAL_FIXED_MODE_BATCH_LLM = "general.固定模式批量LLM"
+    GENERAL_TRANSLATION_CACHE_ENABLED = "general.启用翻译记忆"
+    GENERAL_TRANSLATION_CACHE_SIZE = "general.翻译记忆条数"
+    GENERAL_TRANSLATION_CACHE_TTL = "general.翻译记忆有效期"
+    GENERAL_TRANSLATION_CACHE_FILE = "general.翻译记忆文件"
+    GENERAL_EMOTION_LEXICON = "general.情绪关键词"
+    GENERAL_EMOTION_CONFIDENCE_THRESHOLD = "general.情绪置信度阈值"
+    GENERAL_LONG_TEXT_ENABLED = "general.长文本分段合成"
+    GENERAL_LONG_TEXT_MAX_LENGTH = "general.长文本最大长度"
+    GENERAL_LONG_TEXT_CHUNK_LENGTH = "general.长文本分段长度"
+    GENERAL_LONG_TEXT_SILENCE_MS = "general.长文本段间静音"
 
     # Components
     COMPONENTS_ACTION_ENABLED = "components.启用Action"
@@ -34,10 +47,49 @@ class ConfigKeys:
     EASYTTS_PREFER_IDLE_ENDPOINT = "easytts.优先空闲仓库"
     EASYTTS_BUSY_QUEUE_THRESHOLD = "easytts.繁忙阈值"
     EASYTTS_STATUS_TIMEOUT = "easytts.状态超时"
+    EASYTTS_CONCURRENT_STATUS_PROBE = "easytts.并发探测状态"
+    EASYTTS_STATUS_POLLER = "easytts.后台状态轮询"
+    EASYTTS_STATUS_POLL_MIN_INTERVAL = "easytts.轮询最小间隔"
+    EASYTTS_STATUS_POLL_MAX_INTERVAL = "easytts.轮询最大间隔"
+    EASYTTS_STATUS_TTL = "easytts.状态有效期"
+    EASYTTS_QUEUE_WAIT_TIMEOUT = "easytts.排队等待超时"
     EASYTTS_JOIN_TIMEOUT = "easytts.加入队列超时"
     EASYTTS_SSE_TIMEOUT = "easytts.SSE超时"
     EASYTTS_DOWNLOAD_TIMEOUT = "easytts.下载超时"
     EASYTTS_TRUST_ENV = "easytts.继承系统代理"
+    # HTTP 连接池
+    EASYTTS_HTTP_KEEP_ALIVE = "easytts.连接复用"
+    EASYTTS_HTTP_KEEPALIVE_TIMEOUT = "easytts.空闲连接超时"
+    EASYTTS_HTTP_PREWARM = "easytts.启动预热连接"
+    # Gradio schema 抓取
+    EASYTTS_SCHEMA_FETCH_CONCURRENCY = "easytts.预设抓取并发数"
+    EASYTTS_SCHEMA_FETCH_TIMEOUT = "easytts.预设抓取超时"
+    # 仓库健康度 / 熔断
+    EASYTTS_HEALTH_EWMA_ALPHA = "easytts.健康度平滑系数"
+    EASYTTS_BREAKER_FAILURE_THRESHOLD = "easytts.熔断失败次数"
+    EASYTTS_BREAKER_COOLDOWN = "easytts.熔断冷却时间"
+    # 对冲请求（主仓库迟迟没出结果时，同时提交到下一个空闲仓库）
+    EASYTTS_HEDGE_ENABLED = "easytts.启用对冲请求"
+    EASYTTS_HEDGE_PERCENTILE = "easytts.对冲分位数"
+    EASYTTS_HEDGE_MIN_DELAY = "easytts.对冲最小延迟"
+    EASYTTS_HEDGE_DEFAULT_DELAY = "easytts.对冲默认延迟"
+    # 角色亲和路由（同一角色优先发往上次合成它的仓库，模型保持常驻）
+    EASYTTS_AFFINITY_ENABLED = "easytts.启用角色亲和"
+    EASYTTS_AFFINITY_SPILLOVER_QUEUE = "easytts.亲和溢出阈值"
+    EASYTTS_AFFINITY_WARM_TTL = "easytts.模型保温时间"
+    # 合成音频缓存
+    EASYTTS_AUDIO_CACHE_ENABLED = "easytts.启用音频缓存"
+    EASYTTS_AUDIO_CACHE_MEMORY_MB = "easytts.音频缓存内存上限"
+    EASYTTS_AUDIO_CACHE_DISK_MB = "easytts.音频缓存磁盘上限"
+    EASYTTS_AUDIO_CACHE_DIR = "easytts.音频缓存目录"
+    EASYTTS_DOWNLOAD_MAX_MB = "easytts.下载大小上限"
+    EASYTTS_AUDIO_POST_ENABLED = "easytts.启用音频后处理"
+    EASYTTS_AUDIO_POST_TRIM_DB = "easytts.去静音阈值"
+    EASYTTS_AUDIO_POST_NORMALIZE_DB = "easytts.归一化峰值"
+    EASYTTS_AUDIO_POST_MONO = "easytts.转单声道"
+    EASYTTS_AUDIO_POST_SAMPLE_RATE = "easytts.输出采样率"
+    # 由插件在应用 Gradio schema 时写入内存配置（不落盘），用于区分不同版本的云端模型/预设
+    EASYTTS_SCHEMA_VERSION = "easytts.schema_version"
 
 
 # 兼容旧英文 key（老配置不用改也能跑）
@@ -49,9 +101,22 @@ CONFIG_KEY_ALIASES = {
     ConfigKeys.GENERAL_USE_REPLYER_REWRITE: "general.use_replyer_rewrite",
     ConfigKeys.GENERAL_AUDIO_OUTPUT_DIR: "general.audio_output_dir",
     ConfigKeys.GENERAL_USE_BASE64_AUDIO: "general.use_base64_audio",
+    ConfigKeys.GENERAL_DELIVERY_MEMORY_TTL: "general.delivery_memory_ttl",
     ConfigKeys.GENERAL_SPLIT_SENTENCES: "general.split_sentences",
     ConfigKeys.GENERAL_SPLIT_DELAY: "general.split_delay",
     ConfigKeys.GENERAL_SEND_ERROR_MESSAGES: "general.send_error_messages",
+    ConfigKeys.GENERAL_FIXED_MODE_PIPELINE_DEPTH: "general.fixed_mode_pipeline_depth",
+    ConfigKeys.GENERAL_FIXED_MODE_BATCH_LLM: "general.fixed_mode_batch_llm",
+    ConfigKeys.GENERAL_TRANSLATION_CACHE_ENABLED: "general.translation_cache_enabled",
+    ConfigKeys.GENERAL_TRANSLATION_CACHE_SIZE: "general.translation_cache_size",
+    ConfigKeys.GENERAL_TRANSLATION_CACHE_TTL: "general.translation_cache_ttl",
+    ConfigKeys.GENERAL_TRANSLATION_CACHE_FILE: "general.translation_cache_file",
+    ConfigKeys.GENERAL_EMOTION_LEXICON: "general.emotion_lexicon",
+    ConfigKeys.GENERAL_EMOTION_CONFIDENCE_THRESHOLD: "general.emotion_confidence_threshold",
+    ConfigKeys.GENERAL_LONG_TEXT_ENABLED: "general.long_text_enabled",
+    ConfigKeys.GENERAL_LONG_TEXT_MAX_LENGTH: "general.long_text_max_length",
+    ConfigKeys.GENERAL_LONG_TEXT_CHUNK_LENGTH: "general.long_text_chunk_length",
+    ConfigKeys.GENERAL_LONG_TEXT_SILENCE_MS: "general.long_text_silence_ms",
     # Components
     ConfigKeys.COMPONENTS_ACTION_ENABLED: "components.action_enabled",
     ConfigKeys.COMPONENTS_COMMAND_ENABLED: "components.command_enabled",
@@ -64,10 +129,41 @@ CONFIG_KEY_ALIASES = {
     ConfigKeys.EASYTTS_PREFER_IDLE_ENDPOINT: "easytts.prefer_idle_endpoint",
     ConfigKeys.EASYTTS_BUSY_QUEUE_THRESHOLD: "easytts.busy_queue_threshold",
     ConfigKeys.EASYTTS_STATUS_TIMEOUT: "easytts.status_timeout",
+    ConfigKeys.EASYTTS_CONCURRENT_STATUS_PROBE: "easytts.concurrent_status_probe",
+    ConfigKeys.EASYTTS_STATUS_POLLER: "easytts.status_poller",
+    ConfigKeys.EASYTTS_STATUS_POLL_MIN_INTERVAL: "easytts.status_poll_min_interval",
+    ConfigKeys.EASYTTS_STATUS_POLL_MAX_INTERVAL: "easytts.status_poll_max_interval",
+    ConfigKeys.EASYTTS_STATUS_TTL: "easytts.status_ttl",
+    ConfigKeys.EASYTTS_QUEUE_WAIT_TIMEOUT: "easytts.queue_wait_timeout",
     ConfigKeys.EASYTTS_JOIN_TIMEOUT: "easytts.join_timeout",
     ConfigKeys.EASYTTS_SSE_TIMEOUT: "easytts.sse_timeout",
     ConfigKeys.EASYTTS_DOWNLOAD_TIMEOUT: "easytts.download_timeout",
     ConfigKeys.EASYTTS_TRUST_ENV: "easytts.trust_env",
+    ConfigKeys.EASYTTS_HTTP_KEEP_ALIVE: "easytts.http_keep_alive",
+    ConfigKeys.EASYTTS_HTTP_KEEPALIVE_TIMEOUT: "easytts.http_keepalive_timeout",
+    ConfigKeys.EASYTTS_HTTP_PREWARM: "easytts.http_prewarm",
+    ConfigKeys.EASYTTS_SCHEMA_FETCH_CONCURRENCY: "easytts.schema_fetch_concurrency",
+    ConfigKeys.EASYTTS_SCHEMA_FETCH_TIMEOUT: "easytts.schema_fetch_timeout",
+    ConfigKeys.EASYTTS_HEALTH_EWMA_ALPHA: "easytts.health_ewma_alpha",
+    ConfigKeys.EASYTTS_BREAKER_FAILURE_THRESHOLD: "easytts.breaker_failure_threshold",
+    ConfigKeys.EASYTTS_BREAKER_COOLDOWN: "easytts.breaker_cooldown",
+    ConfigKeys.EASYTTS_HEDGE_ENABLED: "easytts.hedge_enabled",
+    ConfigKeys.EASYTTS_HEDGE_PERCENTILE: "easytts.hedge_percentile",
+    ConfigKeys.EASYTTS_HEDGE_MIN_DELAY: "easytts.hedge_min_delay",
+    ConfigKeys.EASYTTS_HEDGE_DEFAULT_DELAY: "easytts.hedge_default_delay",
+    ConfigKeys.EASYTTS_AFFINITY_ENABLED: "easytts.affinity_enabled",
+    ConfigKeys.EASYTTS_AFFINITY_SPILLOVER_QUEUE: "easytts.affinity_spillover_queue",
+    ConfigKeys.EASYTTS_AFFINITY_WARM_TTL: "easytts.affinity_warm_ttl",
+    ConfigKeys.EASYTTS_AUDIO_CACHE_ENABLED: "easytts.audio_cache_enabled",
+    ConfigKeys.EASYTTS_AUDIO_CACHE_MEMORY_MB: "easytts.audio_cache_memory_mb",
+    ConfigKeys.EASYTTS_AUDIO_CACHE_DISK_MB: "easytts.audio_cache_disk_mb",
+    ConfigKeys.EASYTTS_AUDIO_CACHE_DIR: "easytts.audio_cache_dir",
+    ConfigKeys.EASYTTS_DOWNLOAD_MAX_MB: "easytts.download_max_mb",
+    ConfigKeys.EASYTTS_AUDIO_POST_ENABLED: "easytts.audio_post_enabled",
+    ConfigKeys.EASYTTS_AUDIO_POST_TRIM_DB: "easytts.audio_post_trim_db",
+    ConfigKeys.EASYTTS_AUDIO_POST_NORMALIZE_DB: "easytts.audio_post_normalize_db",
+    ConfigKeys.EASYTTS_AUDIO_POST_MONO: "easytts.audio_post_mono",
+    ConfigKeys.EASYTTS_AUDIO_POST_SAMPLE_RATE: "easytts.audio_post_sample_rate",
 }
 
 
@@ -12,13 +12,14 @@ import sys
 sys.dont_write_bytecode = True
 
 import asyncio
+import hashlib
 import json
 import os
 import re
 import time
-import urllib.request
+import wave
 from pathlib import Path
-from typing import List, Tuple, Type
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Type
 
 from src.common.logger import get_logger
 from src.plugin_system.base.base_plugin import BasePlugin
@@ -29,14 +30,63 @@ from src.plugin_system.base.component_types import ComponentInfo, ChatMode
 from src.plugin_system.base.config_types import ConfigField, ConfigSection
 from src.plugin_system.apis import generator_api
 
-from .backends import TTSBackendRegistry, TTSResult
+from .backends import (
+    EasyTTSConfig,
+    EasyTTSConfigCache,
+    EndpointSchemaIndex,
+    EndpointStatusPoller,
+    TTSBackendRegistry,
+    TTSResult,
+)
 from .config_keys import ConfigKeys, get_config_with_aliases
+from .utils.emotion_lexicon import EmotionLexicon
+from .utils.file import TTSFileManager
+from .utils.gradio_schema import GradioSchemaFetcher
+from .utils.metrics import StageTimer
 from .utils.text import TTSTextUtils
+from .utils.translation_cache import TTSTranslationCache
+from .utils.wav import TTSWavUtils
 
 logger = get_logger("EasyPlugin")
 
 VALID_BACKENDS = ["easytts"]
 
+# 插件构造时不一定已有运行中的事件循环：此时后台任务先登记，等首次执行 Action/Command 时再启动。
+_DEFERRED_BACKGROUND_TASKS: List[Tuple[str, Callable[[], Awaitable]]] = []
+# 持有后台任务的引用，避免被 GC 回收
+_BACKGROUND_TASKS: set = set()
+
+
+def _spawn_background(name: str, coro_factory: Callable[[], Awaitable]) -> bool:
+    """在运行中的事件循环里启动后台任务；没有事件循环则延后启动。返回是否已立即启动。"""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _DEFERRED_BACKGROUND_TASKS.append((name, coro_factory))
+        return False
+    task = loop.create_task(coro_factory(), name=f"easytts:{name}")
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_BACKGROUND_TASKS.discard)
+    return True
+
+
+def _run_deferred_background_tasks() -> None:
+    while _DEFERRED_BACKGROUND_TASKS:
+        name, coro_factory = _DEFERRED_BACKGROUND_TASKS.pop(0)
+        _spawn_background(name, coro_factory)
+
+
+async def _stop_background_tasks() -> None:
+    """插件卸载/重载时调用：取消 _spawn_background 启动的任务和仓库状态轮询，避免旧实例的任务继续运行；翻译记忆落盘。"""
+    _DEFERRED_BACKGROUND_TASKS.clear()
+    tasks = [t for t in _BACKGROUND_TASKS if not t.done()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await EndpointStatusPoller.stop()
+    # 翻译记忆是延迟落盘的，卸载前把还没写回的条目写掉
+    await TTSTranslationCache.flush()
+
 def _force_niisan_token(text: str) -> str:
     """
     Fix a common translation pitfall for the Sagiri persona.
@@ -55,7 +105,28 @@ def _force_niisan_token(text: str) -> str:
     return t
 
 
+_TRANSLATE_TO_JA_PROMPT = (
+    "请把【原文】翻译成自然的日语。\n"
+    "严格要求：\n"
+    "1) 只输出日语译文，不要解释，不要前缀（例如“翻译：”），不要引号，不要代码块；\n"
+    "2) 不要新增信息，不要改变语气；\n"
+    "3) 尽量简短（<=60日文字符左右），多用“。？！……”分句。"
+)
+
+_TRANSLATE_TO_ZH_PROMPT = (
+    "请把【原文】翻译成简体中文。\n"
+    "严格要求：\n"
+    "1) 只输出中文译文，不要解释，不要前缀，不要引号，不要代码块；\n"
+    "2) 不要新增信息，不要改变语气；\n"
+    "3) 尽量简短。"
+)
+
+
 class TTSExecutorMixin:
+    # Action/Command 每次调用都是新实例：一次请求内只比对一次配置内容，之后直接用记下的快照；
+    # 插件实例常驻（后台任务用），每次都比对
+    _snapshot_per_request: bool = True
+
     def _config_dict(self) -> dict:
         """
         MaiBot 里：
@@ -121,6 +192,7 @@ class TTSExecutorMixin:
             token = str(easytts_cfg.get(f"endpoint_{i}_studio_token", "") or "").strip()
             fn_index = int(easytts_cfg.get(f"endpoint_{i}_fn_index", 3) or 3)
             trigger_id = int(easytts_cfg.get(f"endpoint_{i}_trigger_id", 19) or 19)
+            max_concurrency = int(easytts_cfg.get(f"endpoint_{i}_max_concurrency", 1) or 1)
 
             if not base_url or not token:
                 continue
@@ -131,6 +203,7 @@ class TTSExecutorMixin:
                     "studio_token": token,
                     "fn_index": fn_index,
                     "trigger_id": trigger_id,
+                    "max_concurrency": max_concurrency,
                 }
             )
         return out
@@ -200,24 +273,149 @@ class TTSExecutorMixin:
                 easytts_cfg.setdefault(f"endpoint_{idx}_studio_token", token)
                 easytts_cfg.setdefault(f"endpoint_{idx}_fn_index", int(item.get("fn_index", item.get("函数索引", 3)) or 3))
                 easytts_cfg.setdefault(f"endpoint_{idx}_trigger_id", int(item.get("trigger_id", item.get("触发ID", 19)) or 19))
+                easytts_cfg.setdefault(f"endpoint_{idx}_max_concurrency", int(item.get("max_concurrency", item.get("最大并发", 1)) or 1))
+
+    def _config_snapshot(self) -> EasyTTSConfig:
+        """
+        后端用的只读配置快照：配置内容（easytts/general 段）与版本号都未变时直接复用。
+        重建时先同步槽位字段，确保后端总能读到 endpoints/characters（无论用户是在 WebUI 槽位编辑，还是旧版 list 配置）。
+        同一次请求内的后续调用只比较版本号，不再序列化配置算指纹。
+        """
+        memo = self.__dict__.get("_snapshot_memo")
+        if memo is not None and memo[0] == EasyTTSConfigCache.version():
+            return memo[1]
+
+        def build(version: int) -> EasyTTSConfig:
+            self._sync_visual_fields()
+            return EasyTTSConfig.from_getter(
+                lambda k, d=None: get_config_with_aliases(self.get_config, k, d), version=version
+            )
+
+        snapshot = EasyTTSConfigCache.get(self._config_dict(), build)
+        if self._snapshot_per_request:
+            self.__dict__["_snapshot_memo"] = (EasyTTSConfigCache.version(), snapshot)
+        return snapshot
 
     def _create_backend(self, backend_name: str):
-        # 确保后端总能读到 endpoints/characters（无论用户是在 WebUI 槽位编辑，还是旧版 list 配置）。
-        self._sync_visual_fields()
-        backend = TTSBackendRegistry.create(
+        """取复用的后端实例（按配置版本缓存）；send_custom 不绑定在实例上，由 run() 按调用传入。"""
+        snapshot = self._config_snapshot()
+
+        def setup(backend) -> None:
+            if hasattr(backend, "set_config_snapshot"):
+                backend.set_config_snapshot(snapshot)
+
+        return TTSBackendRegistry.acquire(
             backend_name,
             lambda k, d=None: get_config_with_aliases(self.get_config, k, d),
-            self.log_prefix,
+            config_version=snapshot.version,
+            log_prefix=self.log_prefix,
+            setup=setup,
         )
-        if backend and hasattr(backend, "set_send_custom"):
-            backend.set_send_custom(self.send_custom)
-        return backend
 
     async def _execute_backend(self, backend_name: str, text: str, voice: str = "", emotion: str = "") -> TTSResult:
+        _run_deferred_background_tasks()
         backend = self._create_backend(backend_name)
         if not backend:
             return TTSResult(success=False, message=f"未知的 TTS 后端: {backend_name}")
-        return await backend.execute(text, voice, emotion=emotion)
+        return await backend.run(
+            text,
+            voice,
+            send_custom=self.send_custom,
+            log_prefix=self.log_prefix,
+            delivery_scope=self._delivery_scope(),
+            emotion=emotion,
+        )
+
+    async def _synthesize_backend(self, backend_name: str, text: str, voice: str = "", emotion: str = "") -> TTSResult:
+        """只合成不发送（audio_data 为音频）；配合 _send_backend_audio 实现“先并行合成、再按序发送”。"""
+        _run_deferred_background_tasks()
+        backend = self._create_backend(backend_name)
+        if not backend:
+            return TTSResult(success=False, message=f"未知的 TTS 后端: {backend_name}")
+        return await backend.run_synthesize(text, voice, log_prefix=self.log_prefix, emotion=emotion)
+
+    async def _send_backend_audio(self, backend_name: str, result: TTSResult) -> TTSResult:
+        backend = self._create_backend(backend_name)
+        if not backend:
+            return TTSResult(success=False, message=f"未知的 TTS 后端: {backend_name}")
+        return await backend.run_send(
+            result, send_custom=self.send_custom, log_prefix=self.log_prefix, delivery_scope=self._delivery_scope()
+        )
+
+    def _delivery_scope(self) -> str:
+        """发送方式记忆按平台（适配器）区分：Action 上有 chat_stream，Command 在 message 上。"""
+        stream = getattr(self, "chat_stream", None) or getattr(getattr(self, "message", None), "chat_stream", None)
+        return str(getattr(stream, "platform", "") or "")
+
+    def _translation_cache_path(self) -> str:
+        path = str(self._cfg(ConfigKeys.GENERAL_TRANSLATION_CACHE_FILE, "") or "").strip()
+        return TTSFileManager.resolve_path(path) if path else ""
+
+    def _long_text_limit(self) -> int:
+        """长文本分段合成允许的最大长度；未开启时返回 0（超长仍降级为文字）。"""
+        if not bool(self._cfg(ConfigKeys.GENERAL_LONG_TEXT_ENABLED, True)):
+            return 0
+        return int(self._cfg(ConfigKeys.GENERAL_LONG_TEXT_MAX_LENGTH, 1000) or 0)
+
+    async def _execute_long_text(
+        self,
+        backend_name: str,
+        text: str,
+        voice: str = "",
+        emotion: str = "",
+        *,
+        prepare: Optional[Callable[[str], Awaitable[Tuple[str, str]]]] = None,
+    ) -> TTSResult:
+        """
+        长文本：按句打包成若干段，各段并行合成（经准入队列分摊到仓库池），再按采样拼接成一条语音发送。
+        prepare(段落) -> (语音文本, emotion)，用于逐段翻译/判断情绪；不传则直接合成原文。
+        拼接失败（格式不一致、wave 读不了的 WAV）时按顺序逐段发送；有段落合成失败时返回失败，由调用方降级为文字。
+        """
+        max_length = int(self._cfg(ConfigKeys.GENERAL_MAX_TEXT_LENGTH, 200) or 200)
+        chunk_length = int(self._cfg(ConfigKeys.GENERAL_LONG_TEXT_CHUNK_LENGTH, 0) or 0) or max_length
+        chunks = TTSTextUtils.chunk_text(text, min(chunk_length, max_length))
+        sem = asyncio.Semaphore(self._pipeline_depth())
+
+        async def synth(chunk: str) -> TTSResult:
+            async with sem:
+                voice_text, chunk_emotion = await prepare(chunk) if prepare else (chunk, emotion)
+                if not voice_text:
+                    return TTSResult(success=False, message="voice text empty")
+                return await self._synthesize_backend(backend_name, voice_text, voice, chunk_emotion)
+
+        tasks = [asyncio.ensure_future(synth(chunk)) for chunk in chunks]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        failed = next((r for r in results if not r.success or r.audio_data is None), None)
+        if failed is not None:
+            return failed
+        try:
+            audio = TTSWavUtils.concat(
+                [r.audio_data for r in results],
+                silence_ms=int(self._cfg(ConfigKeys.GENERAL_LONG_TEXT_SILENCE_MS, 250) or 0),
+            )
+        except (wave.Error, ValueError, EOFError) as e:
+            logger.warning(f"{self.log_prefix} 长文本语音拼接失败，改为逐段发送: {e}")
+            for r in results:
+                sent = await self._send_backend_audio(backend_name, r)
+                if not sent.success:
+                    return sent
+            return TTSResult(True, f"sent {len(results)} voice segments", backend_name=backend_name)
+        logger.info(f"{self.log_prefix} 长文本 {len(text)} 字分 {len(chunks)} 段合成并拼接")
+        stitched = TTSResult(True, "stitched", backend_name=backend_name, audio_data=audio, voice_info=results[0].voice_info)
+        return await self._send_backend_audio(backend_name, stitched)
+
+    def _pipeline_depth(self) -> int:
+        """固定模式最多提前准备（翻译/情绪/合成）几句；0=按仓库池总并发自动决定。"""
+        depth = int(self._cfg(ConfigKeys.GENERAL_FIXED_MODE_PIPELINE_DEPTH, 0) or 0)
+        if depth > 0:
+            return depth
+        return max(1, sum(ep.max_concurrency for ep in self._config_snapshot().endpoints))
 
     def _get_default_backend(self) -> str:
         backend = self._cfg(ConfigKeys.GENERAL_DEFAULT_BACKEND, "easytts")
@@ -300,6 +498,7 @@ class UnifiedTTSAction(BaseAction, TTSExecutorMixin):
 
     async def _execute_fixed_mode(self) -> Tuple[bool, str]:
         """Fixed mode: split sentences and send voice per sentence."""
+        timer = StageTimer()
         try:
             raw_text = (self.action_data.get("text") or "").strip()
             voice = (self.action_data.get("voice") or "").strip()
@@ -325,48 +524,97 @@ class UnifiedTTSAction(BaseAction, TTSExecutorMixin):
             delay = float(self._cfg(ConfigKeys.GENERAL_SPLIT_DELAY, 0.0) or 0.0)
             infer_emotion = bool(self._cfg("general.fixed_mode_infer_emotion", True))
 
-            sentences = TTSTextUtils.split_sentences(clean_text, min_length=1) or [clean_text]
-
-            for idx, sent in enumerate(sentences):
-                sent = TTSTextUtils.clean_text(sent, self.max_text_length)
-                if not sent:
-                    continue
-
-                if send_text:
-                    # Only send the visible text (avoid sending the JP translation).
-                    display_text = sent
-                    force_text_lang = str(self._cfg("general.force_text_language", "zh") or "").strip().lower()
-                    if force_text_lang in ("zh", "zh-cn", "chinese", "cn") and TTSTextUtils.detect_language(display_text) == "ja":
-                        zh_text = await self._translate_to_zh(display_text)
-                        if zh_text:
-                            display_text = zh_text
-                    await self.send_text(display_text)
-
-                voice_text = await self._voice_text_from_text(sent)
-                if not voice_text:
-                    logger.info(f"{self.log_prefix} 跳过语音：语音文本为空（translate/clean empty, fixed mode）")
-                    return False, "voice text empty"
-                if len(voice_text) > self.max_text_length:
-                    voice_text = voice_text[: self.max_text_length].strip()
+            force_text_lang = str(self._cfg("general.force_text_language", "zh") or "").strip().lower()
 
-                emotion = base_emotion
-                if not emotion and infer_emotion:
-                    emotion = await self._infer_emotion(sent, voice=voice)
+            sentences = TTSTextUtils.split_sentences(clean_text, min_length=1) or [clean_text]
+            sentences = [s for s in (TTSTextUtils.clean_text(x, self.max_text_length) for x in sentences) if s]
+            if not sentences:
+                return False, "clean text empty"
 
-                result = await self._execute_backend(backend, voice_text, voice, emotion)
-                if not result.success:
-                    await self._send_error(f"语音合成失败: {result.message}")
-                    return False, result.message
+            # 流水线：每句的 显示文字翻译 / 语音文本 / 情绪 / 合成 提前并行准备（最多 depth 句同时在途，分摊到仓库池），
+            # 发送端严格按句序：等第 i 句准备好 -> 发文字 -> 发语音 -> 分句间隔。
+            sem = asyncio.Semaphore(self._pipeline_depth())
+
+            force_zh = send_text and force_text_lang in ("zh", "zh-cn", "chinese", "cn")
+            label_preset = infer_emotion and not base_emotion
+
+            # 整段回复的翻译/preset 选择/中文显示文字先尝试合并成一次 LLM 调用；缺失的字段再逐句补调。
+            labels: List[Dict[str, str]] = [{} for _ in sentences]
+            if bool(self._cfg(ConfigKeys.GENERAL_FIXED_MODE_BATCH_LLM, True)):
+                labels = (
+                    await timer.run(
+                        "batch_llm",
+                        self._batch_label_sentences(sentences, voice=voice, label_preset=label_preset, display_zh=force_zh),
+                    )
+                    or labels
+                )
 
-                if delay > 0 and idx != len(sentences) - 1:
-                    await asyncio.sleep(delay)
+            async def display_stage(sent: str, label: Dict[str, str]) -> str:
+                # Only send the visible text (avoid sending the JP translation).
+                if force_zh and TTSTextUtils.detect_language(sent) == "ja":
+                    zh_text = label.get("text_zh") or await self._translate_to_zh(sent)
+                    if zh_text:
+                        return zh_text
+                return sent
+
+            async def voice_stage(sent: str, label: Dict[str, str]) -> str:
+                return label.get("voice_text") or await self._voice_text_from_text(sent)
+
+            async def emotion_stage(sent: str, label: Dict[str, str]) -> str:
+                if not label_preset:
+                    return base_emotion
+                return label.get("preset") or await self._infer_emotion(sent, voice=voice)
+
+            async def prepare(sent: str, label: Dict[str, str]) -> Tuple[str, str, Optional[TTSResult]]:
+                async with sem:
+                    display_text, voice_text, emotion = await asyncio.gather(
+                        display_stage(sent, label) if send_text else asyncio.sleep(0, result=""),
+                        voice_stage(sent, label),
+                        emotion_stage(sent, label),
+                    )
+                    if not voice_text:
+                        return display_text, "", None
+                    if len(voice_text) > self.max_text_length:
+                        voice_text = voice_text[: self.max_text_length].strip()
+                    result = await self._synthesize_backend(backend, voice_text, voice, emotion)
+                    return display_text, voice_text, result
+
+            tasks = [asyncio.ensure_future(prepare(sent, label)) for sent, label in zip(sentences, labels)]
+            try:
+                for idx, task in enumerate(tasks):
+                    display_text, voice_text, result = await task
+                    if send_text:
+                        await self.send_text(display_text)
+                    if not voice_text:
+                        logger.info(f"{self.log_prefix} 跳过语音：语音文本为空（translate/clean empty, fixed mode）")
+                        return False, "voice text empty"
+                    if result.success:
+                        result = await self._send_backend_audio(backend, result)
+                    if not result.success:
+                        await self._send_error(f"语音合成失败: {result.message}")
+                        return False, result.message
+                    if idx == 0:
+                        timer.mark("first_voice")
+
+                    if delay > 0 and idx != len(tasks) - 1:
+                        await asyncio.sleep(delay)
+            finally:
+                # 提前退出（失败/空语音）时取消未发送的句子；已结束的任务取走异常，避免 “never retrieved” 告警
+                for task in tasks:
+                    if task.done():
+                        if not task.cancelled():
+                            task.exception()
+                    else:
+                        task.cancel()
+
+            logger.info(f"{self.log_prefix} 固定模式 {len(tasks)} 句耗时: {timer.format()}")
 
             await self.store_action_info(
                 action_build_into_prompt=True,
                 action_prompt_display="已按固定模式逐句发送语音",
                 action_done=True,
             )
-            return True, "fixed mode ok"
+            return True, f"fixed mode ok [{timer.format()}]"
 
         except Exception as e:
             logger.error(f"{self.log_prefix} 固定模式 TTS 出错: {e}")
@@ -427,81 +675,122 @@ class UnifiedTTSAction(BaseAction, TTSExecutorMixin):
             t = t[1:-1].strip()
         return t
 
-    async def _voice_text_from_text(self, text: str) -> str:
-        """
-        将“要发送的文本”转换成“要合成语音的文本”。
-        默认：若文本非日语，则用 LLM 翻译成日语；若已是日语则直接使用，保证文本/语音一致。
-        """
+    def _voice_translate_needed(self, text: str) -> bool:
+        """按 general.voice_translate_to 判断这句话的语音文本是否需要 LLM 翻译成日语。"""
         target = str(self._cfg("general.voice_translate_to", "auto") or "").strip().lower()
         if not target or target in ("none", "off", "false", "0", "disable", "disabled"):
-            return text
+            return False
 
         # Auto mode: keep original language (recommended for Chinese models).
         # Users can explicitly set ja/zh/en when they know the model expects a fixed language.
         if target in ("auto",):
-            return text
+            return False
 
         # 仅对“目标为日语”做语言检测，避免把已经是日语的内容又改写一遍导致不一致。
         if target in ("ja", "jp", "japanese") and TTSTextUtils.detect_language(text) == "ja":
+            return False
+        return True
+
+    def _translation_cache_get(self, text: str, target: str, prompt: str) -> Optional[str]:
+        if not bool(self._cfg(ConfigKeys.GENERAL_TRANSLATION_CACHE_ENABLED, True)):
+            return None
+        key = TTSTranslationCache.make_key(
+            text=text, target=target, prompt_version=TTSTranslationCache.prompt_version(prompt)
+        )
+        return TTSTranslationCache.get(
+            key,
+            ttl=float(self._cfg(ConfigKeys.GENERAL_TRANSLATION_CACHE_TTL, 604800) or 0),
+            path=self._translation_cache_path(),
+        )
+
+    async def _translation_cache_put(
+        self, text: str, target: str, prompt: str, value: str, *, llm_seconds: float = 0.0
+    ) -> None:
+        if not bool(self._cfg(ConfigKeys.GENERAL_TRANSLATION_CACHE_ENABLED, True)):
+            return
+        key = TTSTranslationCache.make_key(
+            text=text, target=target, prompt_version=TTSTranslationCache.prompt_version(prompt)
+        )
+        await TTSTranslationCache.put(
+            key,
+            value,
+            max_entries=int(self._cfg(ConfigKeys.GENERAL_TRANSLATION_CACHE_SIZE, 2000) or 0),
+            path=self._translation_cache_path(),
+            llm_seconds=llm_seconds,
+        )
+
+    async def _cached_translation(self, text: str, target: str, prompt: str, translate: Callable[[], Awaitable[str]]) -> str:
+        """
+        翻译记忆：命中直接返回缓存的译文（已做过 _force_niisan_token 等后处理），否则调用 translate() 并写入。
+        translate() 返回空串表示失败，失败结果不缓存。
+        """
+        cached = self._translation_cache_get(text, target, prompt)
+        if cached:
+            logger.debug(f"{self.log_prefix} translation cache hit ({target}), stats={TTSTranslationCache.stats()}")
+            return cached
+        started = time.perf_counter()
+        value = await translate()
+        await self._translation_cache_put(text, target, prompt, value, llm_seconds=time.perf_counter() - started)
+        return value
+
+    async def _voice_text_from_text(self, text: str) -> str:
+        """
+        将“要发送的文本”转换成“要合成语音的文本”。
+        默认：若文本非日语，则用 LLM 翻译成日语；若已是日语则直接使用，保证文本/语音一致。
+        """
+        if not self._voice_translate_needed(text):
             return text
+        target = str(self._cfg("general.voice_translate_to", "auto") or "").strip().lower()
+        raw_reply = text
+        if target in ("ja", "jp", "japanese"):
+            raw_reply = _force_niisan_token(raw_reply)
 
-        try:
-            raw_reply = text
-            if target in ("ja", "jp", "japanese"):
-                raw_reply = _force_niisan_token(raw_reply)
+        async def translate() -> str:
+            try:
+                ok, llm_response = await generator_api.rewrite_reply(
+                    chat_stream=self.chat_stream,
+                    raw_reply=raw_reply,
+                    reason=_TRANSLATE_TO_JA_PROMPT,
+                    enable_splitter=False,
+                    enable_chinese_typo=False,
+                    request_type="easytts_translate_to_ja",
+                )
+                if ok and llm_response and getattr(llm_response, "content", None):
+                    jp = self._strip_llm_wrappers(llm_response.content)
+                    jp = TTSTextUtils.clean_text(jp, self.max_text_length)
+                    return _force_niisan_token(jp)
+            except Exception as e:
+                logger.error(f"{self.log_prefix} 翻译日语失败，回退使用原文: {e}")
+            return ""
 
-            ok, llm_response = await generator_api.rewrite_reply(
-                chat_stream=self.chat_stream,
-                raw_reply=raw_reply,
-                reason=(
-                    "请把【原文】翻译成自然的日语。\n"
-                    "严格要求：\n"
-                    "1) 只输出日语译文，不要解释，不要前缀（例如“翻译：”），不要引号，不要代码块；\n"
-                    "2) 不要新增信息，不要改变语气；\n"
-                    "3) 尽量简短（<=60日文字符左右），多用“。？！……”分句。"
-                ),
-                enable_splitter=False,
-                enable_chinese_typo=False,
-                request_type="easytts_translate_to_ja",
-            )
-            if ok and llm_response and getattr(llm_response, "content", None):
-                jp = self._strip_llm_wrappers(llm_response.content)
-                jp = TTSTextUtils.clean_text(jp, self.max_text_length)
-                jp = _force_niisan_token(jp)
-                return jp or text
-        except Exception as e:
-            logger.error(f"{self.log_prefix} 翻译日语失败，回退使用原文: {e}")
-        return text
+        return await self._cached_translation(raw_reply, "ja", _TRANSLATE_TO_JA_PROMPT, translate) or text
 
     async def _translate_to_zh(self, text: str) -> str:
         """把日语/英文等翻译成简体中文（仅用于“发出去的文字”，避免把日语译文直接发出去）。"""
         if not text:
             return ""
-        try:
-            ok, llm_response = await generator_api.rewrite_reply(
-                chat_stream=self.chat_stream,
-                raw_reply=text,
-                reason=(
-                    "请把【原文】翻译成简体中文。\n"
-                    "严格要求：\n"
-                    "1) 只输出中文译文，不要解释，不要前缀，不要引号，不要代码块；\n"
-                    "2) 不要新增信息，不要改变语气；\n"
-                    "3) 尽量简短。"
-                ),
-                enable_splitter=False,
-                enable_chinese_typo=False,
-                request_type="easytts_translate_to_zh",
-            )
-            if ok and llm_response and getattr(llm_response, "content", None):
-                zh = self._strip_llm_wrappers(llm_response.content)
-                zh = TTSTextUtils.clean_text(zh, self.max_text_length)
-                return zh or ""
-        except Exception as e:
-            logger.error(f"{self.log_prefix} 翻译中文失败: {e}")
-        return ""
+
+        async def translate() -> str:
+            try:
+                ok, llm_response = await generator_api.rewrite_reply(
+                    chat_stream=self.chat_stream,
+                    raw_reply=text,
+                    reason=_TRANSLATE_TO_ZH_PROMPT,
+                    enable_splitter=False,
+                    enable_chinese_typo=False,
+                    request_type="easytts_translate_to_zh",
+                )
+                if ok and llm_response and getattr(llm_response, "content", None):
+                    zh = self._strip_llm_wrappers(llm_response.content)
+                    return TTSTextUtils.clean_text(zh, self.max_text_length)
+            except Exception as e:
+                logger.error(f"{self.log_prefix} 翻译中文失败: {e}")
+            return ""
+
+        return await self._cached_translation(text, "zh", _TRANSLATE_TO_ZH_PROMPT, translate)
 
     def _get_character_from_voice(self, voice: str) -> str:
-        default_character = str(self._cfg(ConfigKeys.EASYTTS_DEFAULT_CHARACTER, "mika") or "mika").strip()
+        default_character = self._config_snapshot().default_character.strip() or "mika"
         raw = (voice or "").strip()
         if not raw:
             return default_character
@@ -515,19 +804,25 @@ class UnifiedTTSAction(BaseAction, TTSExecutorMixin):
         从配置 easytts.characters 中读取该角色支持的 preset 列表。
         这些 preset 名称就是“可用情绪/风格”，后端最终只能用这些值，不然 Gradio 会报错。
         """
-        chars = self._cfg(ConfigKeys.EASYTTS_CHARACTERS, []) or []
-        if not isinstance(chars, list):
-            return []
-        for item in chars:
-            if not isinstance(item, dict):
-                continue
-            name = str(item.get("角色名", item.get("name", "")) or "").strip()
-            if name != character:
-                continue
-            raw_presets = item.get("预设列表", item.get("presets", []))
-            if isinstance(raw_presets, list):
-                return [str(x).strip() for x in raw_presets if str(x).strip()]
-        return []
+        return list(self._config_snapshot().character_preset_list.get(character, ()))
+
+    def _heuristic_emotion(self, text: str, allowed: List[str]) -> str:
+        """
+        Heuristic: avoid overusing "普通/Normal" by catching obvious cases cheaply.
+        关键词词典（general.emotion_lexicon，未配置的 preset 用内置词表）单次扫描给 preset 计分，
+        置信度超过 general.emotion_confidence_threshold 才直接采用，否则返回空串交给 LLM
+        （两个 preset 各命中一次的平局恰好是 0.5，也交给 LLM，不按词表顺序硬选）。
+        """
+        lexicon = EmotionLexicon.from_config(self._cfg(ConfigKeys.GENERAL_EMOTION_LEXICON, ""))
+        preset, confidence = lexicon.match((text or "").strip(), allowed)
+        if not preset:
+            EmotionLexicon.note("no_match")
+            return ""
+        if confidence <= float(self._cfg(ConfigKeys.GENERAL_EMOTION_CONFIDENCE_THRESHOLD, 0.5) or 0):
+            EmotionLexicon.note("low_confidence")
+            return ""
+        EmotionLexicon.note("llm_avoided")
+        return preset
 
     async def _infer_emotion(self, text: str, *, voice: str = "") -> str:
         """
@@ -545,26 +840,10 @@ class UnifiedTTSAction(BaseAction, TTSExecutorMixin):
             if not allowed:
                 return ""
 
-            # Heuristic: avoid overusing "普通/Normal" by catching obvious cases cheaply.
-            # This keeps it responsive and reduces the chance the LLM always picks the neutral preset.
-            t = (text or "").strip()
-            if t:
-                allowed_set = set(allowed)
-                # Question -> 疑问
-                if ("?" in t or "？" in t) and "疑问" in allowed_set:
-                    return "疑问"
-                # Surprise -> 惊讶
-                if any(x in t for x in ("诶", "欸", "啊？", "啊!", "啊！", "什么？！", "真的假的", "卧槽", "我靠")) and "惊讶" in allowed_set:
-                    return "惊讶"
-                # Angry -> 生气
-                if any(x in t for x in ("烦", "别闹", "别吵", "讨厌", "生气", "气死", "滚", "闭嘴", "你有病", "可恶", "真是的")) and "生气" in allowed_set:
-                    return "生气"
-                # Happy -> 开心
-                if any(x in t for x in ("好耶", "太好了", "开心", "嘿嘿", "谢谢", "真棒", "喜欢", "耶")) and "开心" in allowed_set:
-                    return "开心"
-                # Sad -> 伤心
-                if any(x in t for x in ("难过", "伤心", "哭", "呜呜", "心痛", "好痛", "想哭", "不开心", "委屈")) and "伤心" in allowed_set:
-                    return "伤心"
+            heuristic = self._heuristic_emotion(text, allowed)
+            if heuristic:
+                logger.debug(f"{self.log_prefix} 关键词判断情绪: {heuristic}, stats={EmotionLexicon.stats()}")
+                return heuristic
 
             ok, llm_response = await generator_api.rewrite_reply(
                 chat_stream=self.chat_stream,
@@ -590,6 +869,121 @@ class UnifiedTTSAction(BaseAction, TTSExecutorMixin):
             logger.error(f"{self.log_prefix} 情绪判断失败: {e}")
         return ""
 
+    async def _batch_label_sentences(
+        self, sentences: List[str], *, voice: str, label_preset: bool, display_zh: bool
+    ) -> Optional[List[Dict[str, str]]]:
+        """
+        固定模式：一次 LLM 调用同时完成整段回复的 逐句日语译文 / preset 选择 / 日语原文的中文显示文字，
+        代替每句 2~3 次 rewrite_reply。
+
+        返回与 sentences 等长的列表，每项可能含 voice_text / preset / text_zh；缺失或不合法的字段留空，
+        由调用方回退到逐句调用。需要的 LLM 调用不足 2 次（批量不划算）或整体解析失败时返回 None。
+        """
+        allowed = self._get_presets_for_character(self._get_character_from_voice(voice)) if label_preset else []
+        heuristic = [self._heuristic_emotion(sent, allowed) if allowed else "" for sent in sentences]
+        # 翻译记忆里已有的译文直接用，不再让 LLM 重翻
+        voice_src = [_force_niisan_token(sent) for sent in sentences]
+        cached_voice = [
+            self._translation_cache_get(src, "ja", _TRANSLATE_TO_JA_PROMPT) if self._voice_translate_needed(sent) else None
+            for sent, src in zip(sentences, voice_src)
+        ]
+        cached_zh = [
+            self._translation_cache_get(sent, "zh", _TRANSLATE_TO_ZH_PROMPT)
+            if display_zh and TTSTextUtils.detect_language(sent) == "ja"
+            else None
+            for sent in sentences
+        ]
+        need_voice = [self._voice_translate_needed(sent) and not cached_voice[i] for i, sent in enumerate(sentences)]
+        need_preset = [bool(allowed) and not h for h in heuristic]
+        need_zh = [display_zh and TTSTextUtils.detect_language(sent) == "ja" and not cached_zh[i] for i, sent in enumerate(sentences)]
+        calls = sum(need_voice) + sum(need_preset) + sum(need_zh)
+        if calls < 2:
+            if not any(cached_voice) and not any(cached_zh):
+                return None
+            return [
+                {k: v for k, v in (("voice_text", cv), ("text_zh", cz)) if v}
+                for cv, cz in zip(cached_voice, cached_zh)
+            ]
+
+        fields = []
+        if any(need_voice):
+            fields.append('"voice_text"：该句自然的日语译文（不新增信息、不改变语气，尽量简短）')
+        if any(need_preset):
+            fields.append(f'"preset"：该句应使用的语音预设，只能从以下列表中选 1 个：{", ".join(allowed)}；尽量避免“普通/Normal”')
+        if any(need_zh):
+            fields.append('"text_zh"：该句的简体中文译文')
+        items = [{"i": i + 1, "text": voice_src[i] if need_voice[i] else sent} for i, sent in enumerate(sentences)]
+
+        try:
+            ok, llm_response = await generator_api.rewrite_reply(
+                chat_stream=self.chat_stream,
+                raw_reply=json.dumps(items, ensure_ascii=False),
+                reason=(
+                    "【原文】是一个 JSON 数组，每项是回复中的一句话（i 为序号）。请逐句处理，输出同样长度的 JSON 数组。\n"
+                    "每项是一个对象，包含 \"i\"（原序号）以及：\n"
+                    + "\n".join(f"- {f}" for f in fields)
+                    + "\n严格要求：只输出 JSON 数组本身，不要解释，不要代码块。"
+                ),
+                enable_splitter=False,
+                enable_chinese_typo=False,
+                request_type="easytts_batch_label",
+            )
+            payload = (
+                TTSTextUtils.parse_json_payload(llm_response.content)
+                if ok and llm_response and getattr(llm_response, "content", None)
+                else None
+            )
+        except Exception as e:
+            logger.error(f"{self.log_prefix} 批量翻译/情绪判断失败，回退逐句调用: {e}")
+            return None
+
+        if isinstance(payload, dict):
+            payload = payload.get("sentences") or payload.get("items")
+        if not isinstance(payload, list) or len(payload) != len(sentences):
+            logger.warning(f"{self.log_prefix} 批量翻译/情绪判断结果无法解析，回退逐句调用")
+            return None
+
+        by_index = {}
+        for pos, item in enumerate(payload):
+            if not isinstance(item, dict):
+                continue
+            try:
+                idx = int(item.get("i", pos + 1)) - 1
+            except (TypeError, ValueError):
+                idx = pos
+            by_index.setdefault(idx if 0 <= idx < len(sentences) else pos, item)
+
+        out: List[Dict[str, str]] = []
+        answered = 0
+        for i in range(len(sentences)):
+            item = by_index.get(i, {})
+            entry: Dict[str, str] = {}
+            if cached_voice[i]:
+                entry["voice_text"] = cached_voice[i]
+            elif need_voice[i]:
+                jp = TTSTextUtils.clean_text(self._strip_llm_wrappers(str(item.get("voice_text") or "")), self.max_text_length)
+                if jp:
+                    entry["voice_text"] = _force_niisan_token(jp)
+                    await self._translation_cache_put(voice_src[i], "ja", _TRANSLATE_TO_JA_PROMPT, entry["voice_text"])
+            if heuristic[i]:
+                entry["preset"] = heuristic[i]
+            elif need_preset[i]:
+                preset = str(item.get("preset") or "").strip()
+                # 只接受该角色真实存在的 preset；否则留空，回退逐句判断
+                if preset in allowed:
+                    entry["preset"] = preset
+            if cached_zh[i]:
+                entry["text_zh"] = cached_zh[i]
+            elif need_zh[i]:
+                zh = TTSTextUtils.clean_text(self._strip_llm_wrappers(str(item.get("text_zh") or "")), self.max_text_length)
+                if zh:
+                    entry["text_zh"] = zh
+                    await self._translation_cache_put(sentences[i], "zh", _TRANSLATE_TO_ZH_PROMPT, zh)
+            answered += len(entry) - (1 if heuristic[i] else 0) - (1 if cached_voice[i] else 0) - (1 if cached_zh[i] else 0)
+            out.append(entry)
+        logger.info(f"{self.log_prefix} 批量翻译/情绪判断：1 次 LLM 调用覆盖 {answered}/{calls} 项（{len(sentences)} 句）")
+        return out
+
     async def execute(self) -> Tuple[bool, str]:
         try:
             if self._effective_tts_mode() == "fixed":
@@ -603,9 +997,10 @@ class UnifiedTTSAction(BaseAction, TTSExecutorMixin):
 
             use_replyer = self._cfg(ConfigKeys.GENERAL_USE_REPLYER_REWRITE, True)
             infer_emotion = bool(self._cfg("general.free_mode_infer_emotion", True))
+            timer = StageTimer()
 
             # 获取最终文本
-            success, final_text = await self._get_final_text(raw_text, reason, use_replyer)
+            success, final_text = await timer.run("final_text", self._get_final_text(raw_text, reason, use_replyer))
             if not success or not final_text:
                 # LLM 有时会选择了 TTS action 但没有提供可用文本（例如本轮只想发 emoji）。
                 # 这种情况不应打扰用户；仅记录日志即可。
@@ -618,6 +1013,10 @@ class UnifiedTTSAction(BaseAction, TTSExecutorMixin):
                 await self._send_error("文本处理后为空")
                 return False, "clean text empty"
 
+            # 超长：开启长文本模式时分段并行合成、拼接成一条语音；超过长文本上限才降级为文字
+            if self.max_text_length < len(clean_text) <= self._long_text_limit():
+                return await self._execute_free_long_text(clean_text, voice, emotion, user_backend, infer_emotion, timer)
+
             # 长度限制：超长降级为文字
             if len(clean_text) > self.max_text_length:
                 logger.warning(
@@ -633,24 +1032,46 @@ class UnifiedTTSAction(BaseAction, TTSExecutorMixin):
                 return True, "too long, fallback to text"
 
             # 文字和语音的来源：避免把“翻译出来的日语”当作文字发出去。
-            display_text = clean_text
+            # 语音如果已经是日语，就直接用原文（不再二次翻译）
             voice_src_text = clean_text
+            send_text = bool(self._cfg("general.send_text_along_with_voice", True))
+
+            async def text_stage() -> None:
+                display_text = clean_text
+                force_text_lang = str(self._cfg("general.force_text_language", "zh") or "").strip().lower()
+                if force_text_lang in ("zh", "zh-cn", "chinese", "cn") and TTSTextUtils.detect_language(display_text) == "ja":
+                    # LLM 有时会把“用于语音的日语”写进 text：此处把文字翻译回中文，但语音仍用原日语，保证含义一致。
+                    zh_text = await timer.run("translate_zh", self._translate_to_zh(display_text))
+                    if zh_text:
+                        display_text = zh_text
+                await timer.run("send_text", self.send_text(display_text))
+
+            async def emotion_stage() -> str:
+                # 自由模式：默认自动按句意选择 emotion（=preset），无需用户点明。
+                # 仅在用户没有显式指定 emotion 时启用；如果 voice 写了 角色:预设，后端会忽略 emotion 覆盖。
+                if emotion or not infer_emotion:
+                    return emotion
+                try:
+                    return await timer.run("emotion", self._infer_emotion(clean_text, voice=voice))
+                except Exception as e:
+                    logger.error(f"{self.log_prefix} 自由模式情绪判断失败: {e}")
+                    return ""
+
+            # 三个阶段互不依赖，并发执行：发文字 ∥ 语音文本（默认翻译成日语，已是日语则保持原文） ∥ 情绪判断。
+            # 语音要等文字发出后才会合成发送，保证用户看到的顺序始终是“先文字、后语音”。
+            stages = [
+                asyncio.ensure_future(timer.run("translate", self._voice_text_from_text(voice_src_text))),
+                asyncio.ensure_future(emotion_stage()),
+            ]
+            if send_text:
+                stages.append(asyncio.ensure_future(text_stage()))
+            try:
+                voice_text, emotion = (await asyncio.gather(*stages))[:2]
+            except BaseException:
+                for task in stages:
+                    task.cancel()
+                raise
 
-            force_text_lang = str(self._cfg("general.force_text_language", "zh") or "").strip().lower()
-            if force_text_lang in ("zh", "zh-cn", "chinese", "cn") and TTSTextUtils.detect_language(display_text) == "ja":
-                # LLM 有时会把“用于语音的日语”写进 text：此处把文字翻译回中文，但语音仍用原日语，保证含义一致。
-                zh_text = await self._translate_to_zh(display_text)
-                if zh_text:
-                    display_text = zh_text
-                # 语音如果已经是日语，就直接用原文（不再二次翻译）
-                voice_src_text = clean_text
-
-            # 先发文字，再发语音：保证语音内容与文字绑定，避免“语音/文本不一致”。
-            if bool(self._cfg("general.send_text_along_with_voice", True)):
-                await self.send_text(display_text)
-
-            # 语音文本：默认翻译成日语（如果已是日语则保持原文）。
-            voice_text = await self._voice_text_from_text(voice_src_text)
             if not voice_text:
                 # 翻译/清洗导致空文本：不发“无法生成语音”提示，避免与 emoji 等动作混用时刷屏。
                 logger.info(f"{self.log_prefix} 跳过语音：语音文本为空（translate/clean empty）")
@@ -658,19 +1079,12 @@ class UnifiedTTSAction(BaseAction, TTSExecutorMixin):
             if len(voice_text) > self.max_text_length:
                 voice_text = voice_text[: self.max_text_length].strip()
 
-            # 自由模式：默认自动按句意选择 emotion（=preset），无需用户点明。
-            # 仅在用户没有显式指定 emotion 时启用；如果 voice 写了 角色:预设，后端会忽略 emotion 覆盖。
-            if not emotion and infer_emotion:
-                try:
-                    emotion = await self._infer_emotion(clean_text, voice=voice)
-                except Exception as e:
-                    logger.error(f"{self.log_prefix} 自由模式情绪判断失败: {e}")
-
             # 后端（仅 easytts）
             backend = user_backend if user_backend in VALID_BACKENDS else self._get_default_backend()
             logger.info(f"{self.log_prefix} 使用后端: {backend}, voice={voice}")
             # 严格控制：一个消息只发一次语音（不做“逐句多条语音”发送）。
-            result = await self._execute_backend(backend, voice_text, voice, emotion)
+            result = await timer.run("synth", self._execute_backend(backend, voice_text, voice, emotion))
+            logger.info(f"{self.log_prefix} 自由模式耗时: {timer.format()}")
             if result.success:
                 text_preview = voice_text[:80] + "..." if len(voice_text) > 80 else voice_text
                 await self.store_action_info(
@@ -680,7 +1094,7 @@ class UnifiedTTSAction(BaseAction, TTSExecutorMixin):
                 )
             else:
                 await self._send_error(f"语音合成失败: {result.message}")
-            return result.success, result.message
+            return result.success, f"{result.message} [{timer.format()}]"
 
         except Exception as e:
             logger.error(f"{self.log_prefix} TTS 语音合成出错: {e}")
@@ -688,6 +1102,49 @@ class UnifiedTTSAction(BaseAction, TTSExecutorMixin):
             return False, str(e)
 
 
+    async def _execute_free_long_text(
+        self, clean_text: str, voice: str, emotion: str, user_backend: str, infer_emotion: bool, timer: StageTimer
+    ) -> Tuple[bool, str]:
+        """自由模式的长文本：整段文字照常发送，语音按段翻译/判断情绪/合成后拼接成一条。"""
+        text_sent = bool(self._cfg("general.send_text_along_with_voice", True))
+        if text_sent:
+            display_text = clean_text
+            force_text_lang = str(self._cfg("general.force_text_language", "zh") or "").strip().lower()
+            if force_text_lang in ("zh", "zh-cn", "chinese", "cn") and TTSTextUtils.detect_language(display_text) == "ja":
+                display_text = await timer.run("translate_zh", self._translate_to_zh(display_text)) or display_text
+            await timer.run("send_text", self.send_text(display_text))
+
+        async def prepare(chunk: str) -> Tuple[str, str]:
+            voice_text, chunk_emotion = await asyncio.gather(
+                self._voice_text_from_text(chunk),
+                self._infer_emotion(chunk, voice=voice) if infer_emotion and not emotion else asyncio.sleep(0, result=emotion),
+            )
+            return voice_text, chunk_emotion
+
+        backend = user_backend if user_backend in VALID_BACKENDS else self._get_default_backend()
+        result = await timer.run("synth", self._execute_long_text(backend, clean_text, voice, emotion, prepare=prepare))
+        logger.info(f"{self.log_prefix} 自由模式（长文本 {len(clean_text)} 字）耗时: {timer.format()}")
+        if result.success:
+            text_preview = clean_text[:80] + "..." if len(clean_text) > 80 else clean_text
+            await self.store_action_info(
+                action_build_into_prompt=True,
+                action_prompt_display=f"已用语音回复（长文本分段合成）：{text_preview}",
+                action_done=True,
+            )
+            return True, f"{result.message} [{timer.format()}]"
+        # 语音失败时降级为文字（和超过长文本上限时一样），文字已随语音发出则不重复发送
+        logger.warning(f"{self.log_prefix} 长文本语音合成失败，降级为文字回复: {result.message}")
+        if not text_sent:
+            await self.send_text(clean_text)
+        text_preview = clean_text[:80] + "..." if len(clean_text) > 80 else clean_text
+        await self.store_action_info(
+            action_build_into_prompt=True,
+            action_prompt_display=f"已用文字回复（长文本语音合成失败）：{text_preview}",
+            action_done=True,
+        )
+        return True, f"long text synth failed, fallback to text: {result.message} [{timer.format()}]"
+
+
 class UnifiedTTSActionFixed(UnifiedTTSAction):
     """
     固定模式：每次执行都分句，并对每一句单独翻译后发送语音。
@@ -762,12 +1219,18 @@ class UnifiedTTSCommand(BaseCommand, TTSExecutorMixin):
             if not clean_text:
                 await self._send_error("文本处理后为空")
                 return False, "clean text empty", True
-            if len(clean_text) > max_length:
-                await self.send_text(clean_text)
-                return True, "too long, fallback to text", True
-
             backend = self._determine_backend("")
-            result = await self._execute_backend(backend, clean_text, voice, emotion)
+            if len(clean_text) > max_length:
+                if len(clean_text) > self._long_text_limit():
+                    await self.send_text(clean_text)
+                    return True, "too long, fallback to text", True
+                result = await self._execute_long_text(backend, clean_text, voice, emotion)
+                if not result.success:
+                    logger.warning(f"{self.log_prefix} 长文本语音合成失败，降级为文字: {result.message}")
+                    await self.send_text(clean_text)
+                    return True, "long text synth failed, fallback to text", True
+            else:
+                result = await self._execute_backend(backend, clean_text, voice, emotion)
             if not result.success:
                 await self._send_error(f"语音合成失败: {result.message}")
             return result.success, result.message, True
@@ -830,6 +1293,8 @@ class EasyttsTestCommand(BaseCommand):
 class EasyttsPuginPlugin(BasePlugin, TTSExecutorMixin):
     # 保持类名不变（兼容旧代码/旧安装目录），但对外展示名称修正为 EasyPlugin
     plugin_name = "EasyPlugin"
+    # 插件实例常驻：每次取快照都比对配置内容，以发现 WebUI/热重载对配置的原地修改
+    _snapshot_per_request = False
     plugin_description = "GPT-SoVITS 推理特化库 + 魔搭社区（ModelScope Studio）免费托管的语音合成插件（支持按情绪/预设生成语音）"
     plugin_version = "0.1.0"
     plugin_author = "yunchenqwq"
@@ -918,7 +1383,7 @@ class EasyttsPuginPlugin(BasePlugin, TTSExecutorMixin):
             "max_text_length": ConfigField(
                 type=int,
                 default=120,
-                description="最大文本长度（超出则降级为文字；语音建议更短）",
+                description="单次合成的最大文本长度（超出则按长文本分段合成，见 long_text_*；语音建议更短）",
                 min=1,
                 max=500,
                 hint="建议控制在较短的 1~2 句，语音更自然也更稳定。",
@@ -941,6 +1406,13 @@ class EasyttsPuginPlugin(BasePlugin, TTSExecutorMixin):
                 description="是否使用 base64 方式发送音频（关闭则使用本地文件路径发送）",
                 hint="部分环境不支持本地路径 record，可开启此项。",
             ),
+            "delivery_memory_ttl": ConfigField(
+                type=int,
+                default=600,
+                description="记住各平台上次成功的语音发送方式并优先尝试的时长（秒，0=关闭）",
+                hint="use_base64_audio=false 时按 file:// -> 本地路径 -> base64 尝试；到期后按默认顺序重新探测。",
+                min=0,
+            ),
             "split_sentences": ConfigField(
                 type=bool,
                 default=False,
@@ -988,12 +1460,77 @@ class EasyttsPuginPlugin(BasePlugin, TTSExecutorMixin):
                 hint="建议 zh：避免 LLM 把日语译文发到聊天里；如想允许发日语文字，改为 off。",
                 example="zh",
             ),
+            "emotion_lexicon": ConfigField(
+                type=str,
+                default="",
+                description="情绪关键词词典：preset=关键词1,关键词2（多个 preset 用 ; 分隔）；未列出的 preset 使用内置词表",
+                hint="句子命中关键词且置信度足够时直接选定 preset，不再调用 LLM；也可以写成 TOML 表 [general.emotion_lexicon]。",
+                example="开心=好耶,太好了,嘿嘿; 生气=烦,讨厌,可恶",
+            ),
+            "emotion_confidence_threshold": ConfigField(
+                type=float,
+                default=0.5,
+                description="关键词判断的置信度阈值（0~1）：最高分 preset 的命中占比不超过该值时改用 LLM 判断（0.5 即平局交给 LLM）",
+            ),
             "fixed_mode_infer_emotion": ConfigField(
                 type=bool,
                 default=True,
                 description="固定模式下是否逐句调用 LLM 选择 preset（只从该角色已有 presets 中选）",
                 hint="固定模式建议开启：让每句话都能选择更合适的预设（emotion=预设名，不做映射）。",
             ),
+            "translation_cache_enabled": ConfigField(
+                type=bool,
+                default=True,
+                description="翻译记忆：相同句子的日语/中文译文跨会话复用，命中时不再调用 LLM",
+            ),
+            "translation_cache_size": ConfigField(
+                type=int,
+                default=2000,
+                description="翻译记忆最多保留的条数（超出后淘汰最久未用的）",
+            ),
+            "translation_cache_ttl": ConfigField(
+                type=int,
+                default=604800,
+                description="翻译记忆有效期（秒）；0=不过期",
+            ),
+            "translation_cache_file": ConfigField(
+                type=str,
+                default="",
+                description="翻译记忆落盘文件（JSON）；留空则只保存在内存里，重启后清空",
+                example="data/easytts_translation_cache.json",
+            ),
+            "long_text_enabled": ConfigField(
+                type=bool,
+                default=True,
+                description="超过 max_text_length 的回复分段并行合成、拼接成一条语音（关闭则超长时降级为文字）",
+            ),
+            "long_text_max_length": ConfigField(
+                type=int,
+                default=1000,
+                description="长文本分段合成的最大长度；超过仍降级为文字回复",
+            ),
+            "long_text_chunk_length": ConfigField(
+                type=int,
+                default=0,
+                description="长文本每段的最大字数（按句打包）；0=使用 max_text_length",
+            ),
+            "long_text_silence_ms": ConfigField(
+                type=int,
+                default=250,
+                description="长文本拼接时段与段之间插入的静音（毫秒）",
+            ),
+            "fixed_mode_batch_llm": ConfigField(
+                type=bool,
+                default=True,
+                description="固定模式下把整段回复的逐句翻译/preset 选择合并成一次 LLM 调用（结构化 JSON 输出）",
+                hint="解析失败或缺字段时自动回退为逐句调用；关闭则始终逐句调用。",
+            ),
+            "fixed_mode_pipeline_depth": ConfigField(
+                type=int,
+                default=0,
+                description="固定模式最多提前准备几句（翻译/情绪/合成并行，发送仍按句序）；0=按仓库池总并发自动决定",
+                hint="1 表示只提前准备下一句；仓库多时保持 0 即可。",
+            ),
             "free_mode_infer_emotion": ConfigField(
                 type=bool,
                 default=True,
@@ -1050,6 +1587,21 @@ class EasyttsPuginPlugin(BasePlugin, TTSExecutorMixin):
                 description="schema 缓存文件名（相对插件目录；留空则不落盘缓存）",
                 hint="删除该文件可强制重新抓取。",
             ),
+            "schema_fetch_concurrency": ConfigField(
+                type=int,
+                default=8,
+                description="抓取 schema 时同时请求多少个角色的预设列表",
+                min=1,
+                max=64,
+                hint="角色很多的仓库调大可加快刷新；调小可减轻仓库压力。",
+            ),
+            "schema_fetch_timeout": ConfigField(
+                type=int,
+                default=15,
+                description="单个角色抓取预设的超时（秒）；超时/失败的角色沿用旧缓存",
+                min=1,
+                max=120,
+            ),
             # === 角色/预设（可视化编辑）===
             # MaiBot WebUI 对 list[object] 的渲染会显示为 [object Object]，不便于编辑；
             # 因此这里改为固定 5 个“角色槽位”，每个槽位独立字段，确保可视化表单可编辑。
@@ -1149,10 +1701,120 @@ class EasyttsPuginPlugin(BasePlugin, TTSExecutorMixin):
             "prefer_idle_endpoint": ConfigField(type=bool, default=True, description="优先选择空闲仓库（queue_size 低）"),
             "busy_queue_threshold": ConfigField(type=int, default=0, description="队列繁忙阈值（>此值视为忙）"),
             "status_timeout": ConfigField(type=int, default=3, description="queue/status 超时（秒）"),
+            "concurrent_status_probe": ConfigField(
+                type=bool,
+                default=True,
+                description="并发探测所有仓库的 queue/status（整体只等待一次 status_timeout）",
+                hint="关闭则逐个探测（旧行为）：仓库越多、越慢，合成前的等待越久。",
+            ),
+            "status_poller": ConfigField(
+                type=bool,
+                default=True,
+                description="后台定时刷新仓库状态表（合成时直接读表，不再每次请求都探测 queue/status）",
+                hint="状态表条目过期（status_ttl）时仍会回退到按需探测。",
+            ),
+            "status_poll_min_interval": ConfigField(type=int, default=3, description="后台轮询最小间隔（秒，有仓库繁忙/不可达时使用）", min=1, max=300),
+            "status_poll_max_interval": ConfigField(type=int, default=20, description="后台轮询最大间隔（秒，全部空闲时逐步放宽到该值）", min=1, max=600),
+            "status_ttl": ConfigField(type=int, default=30, description="仓库状态有效期（秒，过期则合成前按需探测；建议 >= 最大轮询间隔）", min=1, max=600),
             "join_timeout": ConfigField(type=int, default=30, description="queue/join 超时（秒）"),
             "sse_timeout": ConfigField(type=int, default=120, description="queue/data SSE 超时（秒）"),
             "download_timeout": ConfigField(type=int, default=120, description="音频下载超时（秒）"),
+            "download_max_mb": ConfigField(
+                type=float,
+                default=50.0,
+                description="单个音频下载大小上限（MB），超过立即中止并换仓库；0=不限",
+                min=0,
+            ),
+            "queue_wait_timeout": ConfigField(
+                type=int,
+                default=60,
+                description="所有仓库都在合成中时，排队等待空闲仓库的最长时间（秒，先到先得）",
+                min=0,
+                max=600,
+                hint="0=不等待，所有仓库都忙时直接失败（旧行为）。",
+            ),
             "trust_env": ConfigField(type=bool, default=False, description="aiohttp 是否继承系统代理"),
+            "http_keep_alive": ConfigField(
+                type=bool,
+                default=True,
+                description="复用到云端仓库的 HTTP 连接（keep-alive 连接池），避免每个请求都重新 TCP+TLS 握手",
+                hint="如遇到代理/网关不支持长连接导致的偶发断连，可关闭（每个请求新建连接，旧行为）。",
+            ),
+            "http_keepalive_timeout": ConfigField(type=int, default=30, description="空闲连接保留时间（秒），超时后关闭", min=1, max=600),
+            "http_prewarm": ConfigField(type=bool, default=True, description="插件启动时预先与所有仓库建立连接（仅连接池模式）"),
+            "breaker_failure_threshold": ConfigField(
+                type=int,
+                default=3,
+                description="熔断：仓库连续失败多少次后暂停使用",
+                min=1,
+                max=100,
+                hint="熔断期间该仓库不参与路由；冷却结束后放行一次试探请求，成功即恢复。",
+            ),
+            "breaker_cooldown": ConfigField(type=int, default=60, description="熔断冷却时间（秒）", min=1, max=3600),
+            "health_ewma_alpha": ConfigField(
+                type=float,
+                default=0.3,
+                description="仓库耗时/错误率的 EWMA 平滑系数（越大越看重最近几次）",
+                min=0.01,
+                max=1.0,
+            ),
+            "hedge_enabled": ConfigField(
+                type=bool,
+                default=False,
+                description="对冲请求：主仓库迟迟没有出结果时，同时提交到下一个空闲仓库，先返回的语音胜出",
+                hint="能明显降低偶发的长尾等待，但会多占用一个仓库名额；仓库较少时不建议开启。",
+            ),
+            "hedge_percentile": ConfigField(type=int, default=90, description="对冲延迟取最近合成耗时（join -> 完成）的第几百分位", min=50, max=99),
+            "hedge_min_delay": ConfigField(type=float, default=3.0, description="对冲延迟下限（秒）", min=0.0, max=120.0),
+            "hedge_default_delay": ConfigField(type=float, default=10.0, description="样本不足（<10 次）时使用的对冲延迟（秒）", min=0.0, max=300.0),
+            "affinity_enabled": ConfigField(
+                type=bool,
+                default=False,
+                description="角色亲和路由：同一角色优先发往上次合成它的仓库（云端模型仍在内存，省去冷加载）",
+                hint="该仓库排队超过 affinity_spillover_queue 或熔断时，按常规排序溢出到其它仓库。",
+            ),
+            "affinity_spillover_queue": ConfigField(type=int, default=2, description="亲和仓库 queue_size 超过此值时溢出到其它仓库", min=0, max=100),
+            "affinity_warm_ttl": ConfigField(type=int, default=600, description="仓库在多少秒内合成过该角色视为“热”（用于热/冷耗时统计）", min=1, max=86400),
+            "audio_cache_enabled": ConfigField(
+                type=bool,
+                default=True,
+                description="缓存合成好的语音（相同文本+角色+预设直接复用，不再请求云端）",
+                hint="适合“晚安/早上好”等高频短句；云端角色/预设变化后缓存自动失效。",
+            ),
+            "audio_cache_memory_mb": ConfigField(type=int, default=32, description="音频缓存：内存上限（MB，0=不使用内存层）", min=0, max=1024),
+            "audio_cache_disk_mb": ConfigField(type=int, default=256, description="音频缓存：磁盘上限（MB，0=不使用磁盘层）", min=0, max=10240),
+            "audio_cache_dir": ConfigField(
+                type=str,
+                default="",
+                description="音频缓存：磁盘目录（留空使用系统临时目录下的 easytts_audio_cache）",
+                hint="超过磁盘上限时会删除最久未使用的缓存文件。",
+            ),
+            "audio_post_enabled": ConfigField(
+                type=bool,
+                default=False,
+                description="音频后处理：去首尾静音、峰值归一化、转单声道、重采样（需要安装 numpy；未安装时自动跳过）",
+                hint="可明显减小 base64 语音体积；处理结果会写入音频缓存。",
+            ),
+            "audio_post_trim_db": ConfigField(
+                type=float,
+                default=-45.0,
+                description="音频后处理：去静音阈值（dBFS，按 10ms 窗口 RMS 判断）；0=不去静音",
+            ),
+            "audio_post_normalize_db": ConfigField(
+                type=float,
+                default=-1.0,
+                description="音频后处理：峰值归一化目标（dBFS）；0=不归一化",
+            ),
+            "audio_post_mono": ConfigField(
+                type=bool,
+                default=True,
+                description="音频后处理：多声道下混为单声道",
+            ),
+            "audio_post_sample_rate": ConfigField(
+                type=int,
+                default=0,
+                description="音频后处理：输出采样率（如 24000 / 16000）；0=保持原采样率",
+            ),
             # === 云端仓库池（可视化编辑）===
             "endpoint_1_name": ConfigField(
                 type=str,
@@ -1192,26 +1854,40 @@ class EasyttsPuginPlugin(BasePlugin, TTSExecutorMixin):
                 group="仓库池 1",
                 order=114,
             ),
+            "endpoint_1_max_concurrency": ConfigField(
+                type=int,
+                default=1,
+                description="仓库池 1：最大并发（同时处理的合成任务数）",
+                group="仓库池 1",
+                order=115,
+                min=1,
+                max=16,
+                hint="魔搭免费 Studio 建议保持 1；自建且能并行推理的 Genie-TTS 可调到 2~4。",
+            ),
             "endpoint_2_name": ConfigField(type=str, default="pool-2", description="仓库池 2：名称（用于日志）", group="仓库池 2", order=120),
             "endpoint_2_base_url": ConfigField(type=str, default="", description="仓库池 2：Gradio 基地址（base_url）", group="仓库池 2", order=121, placeholder="https://xxx.ms.show"),
             "endpoint_2_studio_token": ConfigField(type=str, default="", description="仓库池 2：studio_token", group="仓库池 2", order=122, input_type="password"),
             "endpoint_2_fn_index": ConfigField(type=int, default=3, description="仓库池 2：fn_index", group="仓库池 2", order=123),
             "endpoint_2_trigger_id": ConfigField(type=int, default=19, description="仓库池 2：trigger_id", group="仓库池 2", order=124),
+            "endpoint_2_max_concurrency": ConfigField(type=int, default=1, description="仓库池 2：最大并发（同时处理的合成任务数）", group="仓库池 2", order=125, min=1, max=16),
             "endpoint_3_name": ConfigField(type=str, default="pool-3", description="仓库池 3：名称（用于日志）", group="仓库池 3", order=130),
             "endpoint_3_base_url": ConfigField(type=str, default="", description="仓库池 3：Gradio 基地址（base_url）", group="仓库池 3", order=131, placeholder="https://xxx.ms.show"),
             "endpoint_3_studio_token": ConfigField(type=str, default="", description="仓库池 3：studio_token", group="仓库池 3", order=132, input_type="password"),
             "endpoint_3_fn_index": ConfigField(type=int, default=3, description="仓库池 3：fn_index", group="仓库池 3", order=133),
             "endpoint_3_trigger_id": ConfigField(type=int, default=19, description="仓库池 3：trigger_id", group="仓库池 3", order=134),
+            "endpoint_3_max_concurrency": ConfigField(type=int, default=1, description="仓库池 3：最大并发（同时处理的合成任务数）", group="仓库池 3", order=135, min=1, max=16),
             "endpoint_4_name": ConfigField(type=str, default="pool-4", description="仓库池 4：名称（用于日志）", group="仓库池 4", order=140),
             "endpoint_4_base_url": ConfigField(type=str, default="", description="仓库池 4：Gradio 基地址（base_url）", group="仓库池 4", order=141, placeholder="https://xxx.ms.show"),
             "endpoint_4_studio_token": ConfigField(type=str, default="", description="仓库池 4：studio_token", group="仓库池 4", order=142, input_type="password"),
             "endpoint_4_fn_index": ConfigField(type=int, default=3, description="仓库池 4：fn_index", group="仓库池 4", order=143),
             "endpoint_4_trigger_id": ConfigField(type=int, default=19, description="仓库池 4：trigger_id", group="仓库池 4", order=144),
+            "endpoint_4_max_concurrency": ConfigField(type=int, default=1, description="仓库池 4：最大并发（同时处理的合成任务数）", group="仓库池 4", order=145, min=1, max=16),
             "endpoint_5_name": ConfigField(type=str, default="pool-5", description="仓库池 5：名称（用于日志）", group="仓库池 5", order=150),
             "endpoint_5_base_url": ConfigField(type=str, default="", description="仓库池 5：Gradio 基地址（base_url）", group="仓库池 5", order=151, placeholder="https://xxx.ms.show"),
             "endpoint_5_studio_token": ConfigField(type=str, default="", description="仓库池 5：studio_token", group="仓库池 5", order=152, input_type="password"),
             "endpoint_5_fn_index": ConfigField(type=int, default=3, description="仓库池 5：fn_index", group="仓库池 5", order=153),
             "endpoint_5_trigger_id": ConfigField(type=int, default=19, description="仓库池 5：trigger_id", group="仓库池 5", order=154),
+            "endpoint_5_max_concurrency": ConfigField(type=int, default=1, description="仓库池 5：最大并发（同时处理的合成任务数）", group="仓库池 5", order=155, min=1, max=16),
         },
     }
 
@@ -1222,51 +1898,173 @@ class EasyttsPuginPlugin(BasePlugin, TTSExecutorMixin):
         super().__init__(plugin_dir=plugin_dir)
         # 让 WebUI 可视化字段与旧版 list 配置互通，并确保后端能读到 endpoints/characters。
         self._sync_visual_fields()
-        # 启动时同步一次 Gradio 的“角色/预设”枚举，避免 LLM 选到不存在的 preset。
+        # 启动时同步 Gradio 的“角色/预设”枚举，避免 LLM 选到不存在的 preset；网络刷新在后台进行，不阻塞插件加载。
         try:
-            self._maybe_refresh_gradio_schema_cache()
+            self._init_gradio_schema()
         except Exception as e:
-            logger.warning(f"{self.log_prefix} 自动抓取 Gradio schema 失败（将继续使用本地配置）：{e}")
+            logger.warning(f"{self.log_prefix} 加载 Gradio schema 失败（将继续使用本地配置）：{e}")
+        # 仓库状态后台轮询由插件持有；若此时还没有事件循环，会在首次合成时由后端补启动。
+        EndpointStatusPoller.configure(self._make_background_backend)
+        EndpointStatusPoller.ensure_started()
+        # 连接池模式下预先与所有仓库握手，首个语音请求不再承担建连耗时。
+        _spawn_background("prewarm", self._prewarm_connections)
+        # 翻译记忆的落盘文件在后台加载，不在首次查询时阻塞事件循环
+        _spawn_background("translation_cache", self._load_translation_cache)
+
+    async def on_unload(self) -> None:
+        """插件卸载/重载钩子：停止插件持有的后台任务（状态轮询、预热、schema 刷新）。"""
+        await _stop_background_tasks()
+        logger.info(f"{self.log_prefix} 后台任务已停止")
+
+    async def _load_translation_cache(self) -> None:
+        path = self._translation_cache_path()
+        if path and bool(self._cfg(ConfigKeys.GENERAL_TRANSLATION_CACHE_ENABLED, True)):
+            await TTSTranslationCache.load(path)
+
+    def _make_background_backend(self):
+        """给后台任务（状态轮询/连接预热/schema 刷新）用的后端实例：与请求共用同一个复用实例，不需要 send_custom。"""
+        return self._create_backend("easytts")
+
+    async def _prewarm_connections(self) -> None:
+        try:
+            backend = self._make_background_backend()
+            started = time.perf_counter()
+            results = await backend.prewarm_connections()
+            if results:
+                ok = sum(1 for v in results.values() if v)
+                logger.info(
+                    f"{self.log_prefix} 连接预热完成 {ok}/{len(results)}，耗时 {(time.perf_counter() - started) * 1000:.0f}ms"
+                )
+        except Exception as e:
+            logger.warning(f"{self.log_prefix} 连接预热失败：{e}")
+
+    def _schema_cache_path(self) -> str:
+        cache_name = str(self._cfg("easytts.schema_cache_file", "_gradio_schema_cache.json") or "").strip()
+        return os.path.join(self.plugin_dir, cache_name) if cache_name else ""
+
+    def _load_cached_gradio_schema(self) -> Tuple[dict, int]:
+        """
+        读取本地 schema 缓存（不论是否过期），返回 (schema, fetched_at)；没有可用缓存时返回 ({}, 0)。
+        缓存里的分仓库 schema 同时载入 EndpointSchemaIndex。
+        """
+        cache_path = self._schema_cache_path()
+        if not cache_path or not os.path.exists(cache_path):
+            return {}, 0
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            cached_schema = cached.get("schema") or {}
+            fetched_at = int(cached.get("fetched_at", 0) or 0)
+            # 兼容旧缓存格式：旧版可能是 {"characters":[...],"presets":[...]}，新版是 {"characters":{c:[...]}}
+            if (
+                isinstance(cached_schema, dict)
+                and isinstance(cached_schema.get("characters"), dict)
+                and cached_schema.get("characters")
+            ):
+                if isinstance(cached.get("endpoints"), dict):
+                    EndpointSchemaIndex.load(cached["endpoints"])
+                elif cached_schema.get("source"):
+                    # 旧缓存只有单个仓库的 schema
+                    EndpointSchemaIndex.record(cached_schema["source"], cached_schema["characters"], fetched_at=fetched_at)
+                return cached_schema, fetched_at
+        except Exception:
+            pass
+        return {}, 0
+
+    def _stale_schema_endpoints(self, ttl: int) -> list:
+        """需要（重新）抓取 schema 的仓库：从未抓取过，或距上次抓取超过 ttl。同一 base_url 只取一个。"""
+        now = time.time()
+        stale, seen = [], set()
+        for ep in self._make_background_backend()._load_endpoints():
+            if not ep.studio_token or ep.base_url in seen:
+                continue
+            seen.add(ep.base_url)
+            fetched_at = EndpointSchemaIndex.fetched_at(ep.base_url)
+            if ttl <= 0 or not fetched_at or (now - fetched_at) >= ttl:
+                stale.append(ep)
+        return stale
 
-    def _maybe_refresh_gradio_schema_cache(self) -> None:
+    def _init_gradio_schema(self) -> None:
+        """
+        启动时不发网络请求：先应用本地缓存（即使已过期），再在后台异步刷新缺失或过期的仓库。
+        就绪状态与刷新耗时记录在 self._schema_status 并写日志。
+        """
+        self._schema_status = {"ready": False, "source": "", "refreshing": False, "fetched_at": 0, "refresh_ms": None}
         if not bool(self._cfg("easytts.auto_fetch_gradio_schema", True)):
+            self._schema_status.update(ready=True, source="config")
             return
 
-        ttl = int(self._cfg("easytts.schema_cache_ttl", 86400) or 86400)
-        cache_name = str(self._cfg("easytts.schema_cache_file", "_gradio_schema_cache.json") or "").strip()
-        cache_path = os.path.join(self.plugin_dir, cache_name) if cache_name else ""
+        ttl = int(self._cfg("easytts.schema_cache_ttl", 86400) or 0)
+        schema, fetched_at = self._load_cached_gradio_schema()
+        stale = self._stale_schema_endpoints(ttl)
+        if schema:
+            self._apply_gradio_schema(schema)
+            # Also write back into config.toml so WebUI users can see the updated list.
+            self._maybe_write_schema_back_to_config(schema)
+            self._schema_status.update(ready=True, source="stale_cache" if stale else "cache", fetched_at=fetched_at)
+            logger.info(
+                f"{self.log_prefix} Gradio schema 已就绪（{'过期缓存' if stale else '缓存'}，{len(schema['characters'])} 个角色）"
+            )
+        if not stale:
+            return
+
+        self._schema_status["refreshing"] = True
+        started_now = _spawn_background("schema_refresh", self._refresh_gradio_schema)
+        logger.info(
+            f"{self.log_prefix} Gradio schema 将在后台刷新 {len(stale)} 个仓库"
+            f"（{'已启动' if started_now else '等待事件循环，首次执行时启动'}；刷新完成前使用本地配置）"
+        )
+
+    async def _refresh_gradio_schema(self) -> None:
+        started = time.perf_counter()
+        ttl = int(self._cfg("easytts.schema_cache_ttl", 86400) or 0)
+        results: dict = {}
+        try:
+            results = await self._fetch_gradio_schema(self._stale_schema_endpoints(ttl))
+        except Exception as e:
+            logger.warning(f"{self.log_prefix} 自动抓取 Gradio schema 失败（将继续使用本地配置）：{e}")
+        finally:
+            self._schema_status["refreshing"] = False
+            self._schema_status["refresh_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        refresh_ms = self._schema_status["refresh_ms"]
+        if not results:
+            logger.warning(f"{self.log_prefix} Gradio schema 后台刷新未拿到结果，耗时 {refresh_ms:.0f}ms")
+            return
 
         now = int(time.time())
-        if cache_path and os.path.exists(cache_path) and ttl > 0:
+        for base_url, ep_schema in results.items():
+            # 部分角色超时/失败：索引里沿用这些角色的旧条目
+            EndpointSchemaIndex.record(
+                base_url, ep_schema["characters"], failed=ep_schema.get("failed") or [], fetched_at=now
+            )
+            if ep_schema.get("partial"):
+                logger.warning(
+                    f"{self.log_prefix} Gradio schema 部分角色抓取失败（沿用旧缓存）：{base_url}: "
+                    f"{', '.join(ep_schema.get('failed') or [])}"
+                )
+
+        configured = [ep.base_url for ep in self._make_background_backend()._load_endpoints()]
+        schema = {"characters": EndpointSchemaIndex.merged(configured)}
+        self._apply_gradio_schema(schema)
+        self._maybe_write_schema_back_to_config(schema)
+        cache_path = self._schema_cache_path()
+        if cache_path:
             try:
-                with open(cache_path, "r", encoding="utf-8") as f:
-                    cached = json.load(f)
-                fetched_at = int(cached.get("fetched_at", 0) or 0)
-                if fetched_at and (now - fetched_at) < ttl:
-                    cached_schema = cached.get("schema") or {}
-                    # 兼容旧缓存格式：旧版可能是 {"characters":[...],"presets":[...]}，新版是 {"characters":{c:[...]}}
-                    if (
-                        isinstance(cached_schema, dict)
-                        and isinstance(cached_schema.get("characters"), dict)
-                        and cached_schema.get("characters")
-                    ):
-                        self._apply_gradio_schema(cached_schema)
-                        # Also write back into config.toml so WebUI users can see the updated list.
-                        self._maybe_write_schema_back_to_config(cached_schema)
-                        return
+                with open(cache_path, "w", encoding="utf-8") as f:
+                    json.dump(
+                        {"fetched_at": now, "schema": schema, "endpoints": EndpointSchemaIndex.dump()},
+                        f,
+                        ensure_ascii=False,
+                        indent=2,
+                    )
             except Exception:
                 pass
-
-        schema = self._fetch_gradio_schema()
-        if schema:
-            self._apply_gradio_schema(schema)
-            self._maybe_write_schema_back_to_config(schema)
-            if cache_path:
-                try:
-                    with open(cache_path, "w", encoding="utf-8") as f:
-                        json.dump({"fetched_at": now, "schema": schema}, f, ensure_ascii=False, indent=2)
-                except Exception:
-                    pass
+        self._schema_status.update(ready=True, source="remote", fetched_at=now)
+        logger.info(
+            f"{self.log_prefix} Gradio schema 后台刷新完成（{len(results)} 个仓库，合计 {len(schema['characters'])} 个角色），"
+            f"耗时 {refresh_ms:.0f}ms"
+        )
 
     def _maybe_write_schema_back_to_config(self, schema: dict) -> None:
         """
@@ -1323,6 +2121,7 @@ class EasyttsPuginPlugin(BasePlugin, TTSExecutorMixin):
                 else:
                     easytts_cfg["default_preset"] = presets_for_default[0]
 
+            EasyTTSConfigCache.invalidate()
             self._write_easytts_slots_to_toml_file(os.path.join(self.plugin_dir, "config.toml"), easytts_cfg)
         except Exception:
             # Don't block plugin startup.
@@ -1402,101 +2201,33 @@ class EasyttsPuginPlugin(BasePlugin, TTSExecutorMixin):
 
         Path(toml_path).write_text("".join(raw), encoding="utf-8")
 
-    def _fetch_gradio_schema(self) -> dict:
+    async def _fetch_gradio_schema(self, endpoints: list) -> dict:
         """
-        从云端 easytts（ms.show）抓取 Gradio schema：
-        1) 先从 /gradio_api/info 读取 character 枚举
-        2) 再对每个 character 调用 /gradio_api/call/update_preset_ui 拿到该角色真实的 preset 下拉列表
+        从云端 easytts（ms.show）并发抓取各仓库的 Gradio schema（角色枚举 + 每个角色真实的 preset 下拉列表）。
+        返回 {base_url: schema}，抓取失败的仓库不在结果里。
         """
-        endpoints = self._cfg(ConfigKeys.EASYTTS_ENDPOINTS, []) or []
-        if not isinstance(endpoints, list) or not endpoints:
+        if not endpoints:
             return {}
-
-        for item in endpoints:
-            if not isinstance(item, dict):
-                continue
-            base_url = str(item.get("base_url", item.get("基地址", "")) or "").rstrip("/")
-            token = str(item.get("studio_token", item.get("令牌", "")) or "").strip()
-            if not base_url or not token:
-                continue
-
+        backend = self._make_background_backend()
+        session_manager = await backend._session_manager(*endpoints)
+        concurrency = int(self._cfg(ConfigKeys.EASYTTS_SCHEMA_FETCH_CONCURRENCY, 8) or 8)
+        timeout = float(self._cfg(ConfigKeys.EASYTTS_SCHEMA_FETCH_TIMEOUT, 15) or 15)
+
+        async def fetch_one(ep) -> dict:
+            # 单独的 session：预设抓取的并发连接不挤占合成用的连接池
+            backend_name = f"easytts:schema:{ep.name}"
+            session_manager.set_host_limit(backend_name, concurrency)
             try:
-                headers = {"X-Studio-Token": token, "Cookie": f"studio_token={token}"}
-
-                # 1) character enum
-                info_url = f"{base_url}/gradio_api/info"
-                req = urllib.request.Request(info_url, headers=headers)
-                with urllib.request.urlopen(req, timeout=15) as resp:
-                    info = json.load(resp)
-                named = info.get("named_endpoints") or {}
-                upd = named.get("/update_preset_ui") or {}
-                params = upd.get("parameters") or []
-                char_enum = []
-
-                if params:
-                    t = (params[0].get("type") or {})
-                    char_enum = t.get("enum") or []
-
-                chars = [str(x).strip() for x in char_enum if str(x).strip()]
-                if not chars:
-                    continue
-
-                # 2) per-character presets
-                char_presets: dict = {}
-                for c in chars:
-                    try:
-                        call_url = f"{base_url}/gradio_api/call/update_preset_ui"
-                        payload = json.dumps({"data": [c]}, ensure_ascii=False).encode("utf-8")
-                        call_req = urllib.request.Request(
-                            call_url,
-                            data=payload,
-                            method="POST",
-                            headers={**headers, "Content-Type": "application/json"},
-                        )
-                        with urllib.request.urlopen(call_req, timeout=15) as call_resp:
-                            call_ret = json.load(call_resp)
-                        event_id = str(call_ret.get("event_id") or "").strip()
-                        if not event_id:
-                            continue
-
-                        ev_url = f"{base_url}/gradio_api/call/update_preset_ui/{event_id}"
-                        ev_req = urllib.request.Request(ev_url, headers={**headers, "Accept": "text/event-stream"})
-                        with urllib.request.urlopen(ev_req, timeout=15) as ev_resp:
-                            sse_text = ev_resp.read().decode("utf-8", errors="ignore")
-
-                        data_json = None
-                        for line in sse_text.splitlines():
-                            line = line.strip()
-                            if line.startswith("data:"):
-                                data_json = line[5:].strip()
-                                break
-                        if not data_json:
-                            continue
-
-                        updates = json.loads(data_json)
-                        if not isinstance(updates, list) or not updates:
-                            continue
-                        first = updates[0] if isinstance(updates[0], dict) else {}
-                        choices = first.get("choices") or []
-                        presets = []
-                        for pair in choices:
-                            if isinstance(pair, (list, tuple)) and len(pair) >= 2:
-                                presets.append(str(pair[1]).strip())
-                            elif isinstance(pair, str):
-                                presets.append(pair.strip())
-                        presets = [p for p in presets if p]
-                        if presets:
-                            char_presets[c] = presets
-                    except Exception:
-                        continue
-
-                if char_presets:
-                    return {"characters": char_presets, "source": base_url}
+                session = await session_manager.get_session(backend_name)
+                return await GradioSchemaFetcher(session, timeout=timeout, concurrency=concurrency).fetch(
+                    ep.base_url, ep.studio_token
+                )
             except Exception as e:
-                logger.warning(f"{self.log_prefix} 抓取 Gradio schema 失败: {base_url}: {e}")
-                continue
+                logger.warning(f"{self.log_prefix} 抓取 Gradio schema 失败: {ep.base_url}: {e}")
+                return {}
 
-        return {}
+        schemas = await asyncio.gather(*(fetch_one(ep) for ep in endpoints))
+        return {ep.base_url: sc for ep, sc in zip(endpoints, schemas) if sc}
 
     def _apply_gradio_schema(self, schema: dict) -> None:
         char_presets = schema.get("characters") or {}
@@ -1528,6 +2259,10 @@ class EasyttsPuginPlugin(BasePlugin, TTSExecutorMixin):
                 new_chars.append(it)
 
         easytts_cfg["characters"] = new_chars
+        # schema 版本：云端角色/预设变化后，音频缓存 key 随之变化，不会命中旧音频。
+        easytts_cfg["schema_version"] = hashlib.sha1(
+            json.dumps(char_presets, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:12]
 
         # 不维护任何“情绪->预设”映射：emotion 参数本身就是 preset。
         # 同步回填到可视化槽位字段，方便在 WebUI 里直接看到最新 presets。
@@ -1535,6 +2270,7 @@ class EasyttsPuginPlugin(BasePlugin, TTSExecutorMixin):
             self._sync_visual_fields()
         except Exception:
             pass
+        EasyTTSConfigCache.invalidate()
 
     def get_plugin_components(self) -> List[Tuple[ComponentInfo, Type]]:
         components: List[Tuple[ComponentInfo, Type]] = []
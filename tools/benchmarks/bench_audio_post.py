@@ -0,0 +1,83 @@
+"""
+Benchmark: audio post-processing (utils/audio_post.py) per clip.
+
+Builds 32 kHz 16-bit clips shaped like Genie-TTS output (speech-like noise
+with leading/trailing silence) and runs TTSAudioPostProcessor.process with
+the given options. Reports bytes before/after (and the base64 payload sent to
+NapCat) and processing time per clip.
+
+Usage:
+  python tools/benchmarks/bench_audio_post.py [--sample-rate 24000] [--channels 1] [--repeat 20]
+
+Requires numpy; utils/audio_post.py is loaded by file path, so this runs without MaiBot.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import io
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+PLUGIN_ROOT = Path(__file__).resolve().parents[2]
+SOURCE_RATE = 32000
+
+
+def load_module():
+    spec = importlib.util.spec_from_file_location("easytts_bench_audio_post", PLUGIN_ROOT / "utils" / "audio_post.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def make_clip(speech_s: float, channels: int, silence_s: float = 0.6, seed: int = 1) -> bytes:
+    rng = np.random.default_rng(seed)
+    n = int(SOURCE_RATE * speech_s)
+    envelope = 0.5 + 0.5 * np.sin(np.linspace(0, speech_s * 2 * np.pi * 3, n))
+    speech = rng.normal(0, 0.15, n) * envelope
+    pad = np.zeros(int(SOURCE_RATE * silence_s))
+    mono = np.concatenate([pad, speech, pad])
+    pcm = (np.clip(np.repeat(mono[:, None], channels, axis=1), -1, 1) * 32767).astype("<i2")
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(SOURCE_RATE)
+        w.writeframes(pcm.tobytes())
+    return buf.getvalue()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sample-rate", type=int, default=24000)
+    ap.add_argument("--channels", type=int, default=1)
+    ap.add_argument("--trim-db", type=float, default=-45.0)
+    ap.add_argument("--normalize-db", type=float, default=-1.0)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    mod = load_module()
+    options = mod.AudioPostOptions(
+        trim_db=args.trim_db, normalize_db=args.normalize_db, mono=True, sample_rate=args.sample_rate
+    )
+    print(f"{SOURCE_RATE} Hz x{args.channels} -> {options.signature()}")
+    for speech_s in (2, 5, 10, 30):
+        clip = make_clip(speech_s, args.channels)
+        out, _ = mod.TTSAudioPostProcessor.process(clip, options)
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            mod.TTSAudioPostProcessor.process(clip, options)
+        ms = (time.perf_counter() - t0) / args.repeat * 1000
+        b64_in, b64_out = (len(clip) + 2) // 3 * 4, (len(out) + 2) // 3 * 4
+        print(
+            f"{speech_s:3d}s speech  {len(clip) / 1024:8.0f} KiB -> {len(out) / 1024:7.0f} KiB "
+            f"(base64 {b64_in / 1024:7.0f} -> {b64_out / 1024:6.0f} KiB, -{1 - len(out) / len(clip):.0%})  {ms:6.1f} ms/clip"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark: base64 delivery payload (TTSFileManager.audio_to_base64_uri_async).
+
+For WAV-sized clips, compares building the "base64://..." string sent to
+NapCat with:
+
+  legacy - base64.b64encode(data).decode("utf-8"), then f"base64://{...}"
+           (what send_audio did before; the intermediate str stays alive
+           while the message is sent);
+  new    - chunked encode into one preallocated buffer, one decode to str.
+
+Reports the traced heap peak and the memory still held by the payload(s)
+while "sending", encode time, and the worst event-loop stall seen by a 1 ms
+ticker while the clip is encoded inline vs. offloaded to a worker thread.
+
+Usage:
+  python tools/benchmarks/bench_base64.py [--repeat 10]
+
+utils/file.py is loaded by file path with a stub logger, so this runs without MaiBot.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import importlib.util
+import logging
+import os
+import sys
+import time
+import tracemalloc
+import types
+from pathlib import Path
+
+PLUGIN_ROOT = Path(__file__).resolve().parents[2]
+SIZES_KIB = (64, 256, 1024, 4096, 16384)
+
+
+def load_module():
+    if "src.common.logger" not in sys.modules:
+        logger_mod = types.ModuleType("src.common.logger")
+        logger_mod.get_logger = logging.getLogger
+        sys.modules.setdefault("src", types.ModuleType("src"))
+        sys.modules.setdefault("src.common", types.ModuleType("src.common"))
+        sys.modules["src.common.logger"] = logger_mod
+    spec = importlib.util.spec_from_file_location("easytts_bench_file", PLUGIN_ROOT / "utils" / "file.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def legacy_payload(data: bytes):
+    encoded = base64.b64encode(data).decode("utf-8")
+    return encoded, f"base64://{encoded}"
+
+
+def measure_memory(fn, data: bytes):
+    tracemalloc.start()
+    result = fn(data)
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak, held
+
+
+def measure_time(fn, data: bytes, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(data)
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+async def max_stall(coro_factory) -> float:
+    """Run a 1 ms ticker next to the encode and return its worst lateness in ms."""
+    worst = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal worst
+        while not done.is_set():
+            t0 = time.perf_counter()
+            await asyncio.sleep(0.001)
+            worst = max(worst, (time.perf_counter() - t0) * 1000 - 1)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.005)
+    await coro_factory()
+    done.set()
+    await task
+    return worst
+
+
+async def main_async(args) -> None:
+    mod = load_module()
+    fm = mod.TTSFileManager
+    print(f"offload threshold {mod.BASE64_OFFLOAD_BYTES // 1024} KiB")
+    for kib in SIZES_KIB:
+        data = os.urandom(kib * 1024)
+        assert fm._base64_uri_sync(data) == legacy_payload(data)[1]
+        legacy_peak, legacy_held = measure_memory(legacy_payload, data)
+        new_peak, new_held = measure_memory(fm._base64_uri_sync, data)
+        legacy_ms = measure_time(legacy_payload, data, args.repeat)
+        new_ms = measure_time(fm._base64_uri_sync, data, args.repeat)
+
+        async def inline():
+            fm._base64_uri_sync(data)
+
+        async def offloaded():
+            await asyncio.get_event_loop().run_in_executor(None, fm._base64_uri_sync, data)
+
+        stall_inline = await max_stall(inline)
+        stall_offload = await max_stall(offloaded)
+        print(
+            f"{kib:6d} KiB  peak {legacy_peak / kib / 1024:4.2f}x -> {new_peak / kib / 1024:4.2f}x  "
+            f"held {legacy_held / kib / 1024:4.2f}x -> {new_held / kib / 1024:4.2f}x  "
+            f"encode {legacy_ms:6.2f} -> {new_ms:6.2f} ms  "
+            f"loop stall inline {stall_inline:6.2f} ms / thread {stall_offload:5.2f} ms"
+        )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=10)
+    asyncio.run(main_async(ap.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
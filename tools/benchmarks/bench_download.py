@@ -0,0 +1,123 @@
+"""
+Benchmark: audio download memory (utils/download.py).
+
+Serves WAV-sized payloads from a local aiohttp server and downloads them
+`--concurrency` at a time, comparing the traced Python heap peak (tracemalloc)
+and wall time of:
+
+  read   - resp.read(), what the backend did before (chunks joined at the end);
+  stream - stream_audio() into a buffer preallocated from Content-Length,
+           returned as a read-only memoryview (no final copy);
+  spool  - stream_audio() into a file, batched writes in the thread pool
+           (file delivery mode).
+
+The last column also prints TTSDownloadStats' peak_request_bytes so the
+exported metric can be checked against the traced peak.
+
+Usage:
+  python tools/benchmarks/bench_download.py [--concurrency 1 4 8] [--chunk-kib 64]
+
+Requires aiohttp; utils/download.py is loaded by file path, so this runs without MaiBot.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+PLUGIN_ROOT = Path(__file__).resolve().parents[2]
+SIZES_MIB = (0.5, 2, 8, 32)
+
+
+def load_module():
+    spec = importlib.util.spec_from_file_location("easytts_bench_download", PLUGIN_ROOT / "utils" / "download.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+async def start_server(payloads: dict, chunk: int):
+    async def handler(request: web.Request) -> web.StreamResponse:
+        data = payloads[request.match_info["name"]]
+        resp = web.StreamResponse(headers={"Content-Type": "audio/wav", "Content-Length": str(len(data))})
+        await resp.prepare(request)
+        view = memoryview(data)
+        for i in range(0, len(data), chunk):
+            await resp.write(view[i : i + chunk])
+        return resp
+
+    app = web.Application()
+    app.router.add_get("/{name}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def run_mode(mode, mod, session, url, concurrency, chunk, tmpdir):
+    async def one(i: int):
+        async with session.get(url) as resp:
+            if mode == "read":
+                return len(await resp.read())
+            spool_path = os.path.join(tmpdir, f"clip_{i}.wav") if mode == "spool" else ""
+            audio = await mod.stream_audio(resp, spool_path=spool_path, chunk_size=chunk)
+            if spool_path:
+                os.remove(spool_path)
+            return len(audio)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+async def main_async(args) -> None:
+    mod = load_module()
+    chunk = args.chunk_kib * 1024
+    payloads = {f"{s}": os.urandom(int(s * 1024 * 1024)) for s in SIZES_MIB}
+    runner, base = await start_server(payloads, chunk)
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            async with aiohttp.ClientSession() as session:
+                for concurrency in args.concurrency:
+                    print(f"concurrency {concurrency}")
+                    for size in SIZES_MIB:
+                        url = f"{base}/{size}"
+                        cells = []
+                        for mode in ("read", "stream", "spool"):
+                            mod.TTSDownloadStats._peak_request_bytes = 0
+                            peak, elapsed = await run_mode(mode, mod, session, url, concurrency, chunk, tmpdir)
+                            cell = f"{mode} {peak / 1024 / 1024:7.1f} MiB {elapsed * 1000:6.0f}ms"
+                            if mode != "read":
+                                reported = mod.TTSDownloadStats.stats()["peak_request_bytes"] * concurrency
+                                cell += f" (stats {reported / 1024 / 1024:5.1f})"
+                            cells.append(cell)
+                        print(f"  {size:5} MiB x{concurrency}:  " + "  |  ".join(cells))
+    finally:
+        await runner.cleanup()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    ap.add_argument("--chunk-kib", type=int, default=64)
+    asyncio.run(main_async(ap.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark: emotion heuristic (utils/emotion_lexicon.py) on a corpus of chat lines.
+
+  legacy   - the old _infer_emotion heuristic: five hard-coded keyword tuples
+             checked in priority order with `any(x in t for x in ...)`;
+  compiled - EmotionLexicon: one combined regex over the lexicon, one pass
+             per line, preset + confidence score.
+
+Reports per-line time, and how many lines each approach resolves without an
+LLM call (compiled: confidence > threshold, so a 1-vs-1 tie goes to the LLM). Lines where the two disagree are
+counted too, since the compiled matcher scores presets instead of taking the
+first rule that fires.
+
+Usage:
+  python tools/benchmarks/bench_emotion_lexicon.py [--corpus chat.txt] [--lines 20000] [--threshold 0.5]
+
+Without --corpus a synthetic corpus is generated (neutral chatter mixed with
+keyword-bearing lines). utils/emotion_lexicon.py is loaded by file path, so this runs without MaiBot.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import random
+import time
+from pathlib import Path
+
+PLUGIN_ROOT = Path(__file__).resolve().parents[2]
+
+ALLOWED = ["普通", "疑问", "惊讶", "生气", "开心", "伤心"]
+
+NEUTRAL = [
+    "今天天气还行",
+    "我刚吃完饭",
+    "晚点再说吧",
+    "这个版本更新了不少东西",
+    "你在干什么呢",
+    "明天要早起上班",
+    "那就这样吧",
+    "我去看看",
+    "刚才在路上",
+    "这个插件挺好用的",
+]
+DECORATIONS = ["好耶", "太好了", "？", "诶", "烦死了", "呜呜", "讨厌", "嘿嘿", "真的假的", "不开心", "可恶", "谢谢"]
+
+
+def load_lexicon_class():
+    spec = importlib.util.spec_from_file_location("easytts_bench_emotion_lexicon", PLUGIN_ROOT / "utils" / "emotion_lexicon.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod.EmotionLexicon
+
+
+def legacy_heuristic(text: str, allowed) -> str:
+    t = (text or "").strip()
+    if t:
+        allowed_set = set(allowed)
+        if ("?" in t or "？" in t) and "疑问" in allowed_set:
+            return "疑问"
+        if any(x in t for x in ("诶", "欸", "啊？", "啊!", "啊！", "什么？！", "真的假的", "卧槽", "我靠")) and "惊讶" in allowed_set:
+            return "惊讶"
+        if any(x in t for x in ("烦", "别闹", "别吵", "讨厌", "生气", "气死", "滚", "闭嘴", "你有病", "可恶", "真是的")) and "生气" in allowed_set:
+            return "生气"
+        if any(x in t for x in ("好耶", "太好了", "开心", "嘿嘿", "谢谢", "真棒", "喜欢", "耶")) and "开心" in allowed_set:
+            return "开心"
+        if any(x in t for x in ("难过", "伤心", "哭", "呜呜", "心痛", "好痛", "想哭", "不开心", "委屈")) and "伤心" in allowed_set:
+            return "伤心"
+    return ""
+
+
+def synthetic_corpus(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(n):
+        parts = [rng.choice(NEUTRAL) for _ in range(rng.randint(1, 3))]
+        for _ in range(rng.choice((0, 0, 1, 1, 2))):
+            parts.insert(rng.randint(0, len(parts)), rng.choice(DECORATIONS))
+        lines.append("，".join(parts) + rng.choice(("。", "！", "", "……")))
+    return lines
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", help="text file, one chat line per line")
+    ap.add_argument("--lines", type=int, default=20000)
+    ap.add_argument("--threshold", type=float, default=0.5)
+    args = ap.parse_args()
+
+    if args.corpus:
+        lines = [ln.strip() for ln in Path(args.corpus).read_text(encoding="utf-8").splitlines() if ln.strip()]
+    else:
+        lines = synthetic_corpus(args.lines)
+
+    lexicon = load_lexicon_class().from_config("")
+
+    t0 = time.perf_counter()
+    legacy = [legacy_heuristic(ln, ALLOWED) for ln in lines]
+    legacy_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    compiled = [lexicon.match(ln, ALLOWED) for ln in lines]
+    compiled_s = time.perf_counter() - t0
+
+    legacy_resolved = sum(1 for p in legacy if p)
+    compiled_resolved = sum(1 for p, c in compiled if p and c > args.threshold)
+    low_confidence = sum(1 for p, c in compiled if p and c <= args.threshold)
+    disagree = sum(1 for a, (p, c) in zip(legacy, compiled) if a and p and c > args.threshold and a != p)
+
+    n = len(lines)
+    print(f"{n} lines, threshold={args.threshold}")
+    print(f"legacy   {legacy_s / n * 1e6:7.2f} us/line  resolved without LLM: {legacy_resolved} ({legacy_resolved / n:.1%})")
+    print(
+        f"compiled {compiled_s / n * 1e6:7.2f} us/line  resolved without LLM: {compiled_resolved} ({compiled_resolved / n:.1%})"
+        f"  low-confidence -> LLM: {low_confidence}  disagree with legacy: {disagree}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark: long-text chunked synthesis (UnifiedTTSAction long-text path).
+
+Simulates an endpoint pool (each studio synthesizes one request at a time,
+latency = fixed overhead + per-character cost) and compares, for 200/500/1000
+character replies:
+
+  sequential - chunks synthesized one after another on one studio;
+  parallel   - chunks spread over the pool (what _execute_long_text does),
+               then stitched with TTSWavUtils.concat.
+
+The fake studio returns real 32 kHz mono 16-bit WAVs (~0.2 s of audio per
+character), so the stitch time and output size are real.
+
+Usage:
+  python tools/benchmarks/bench_long_text.py [--endpoints 4] [--chunk 120] [--overhead 1.5] [--per-char 0.02]
+
+Only utils/text.py and utils/wav.py are loaded (by file path), so this runs without MaiBot.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import io
+import time
+import wave
+from pathlib import Path
+
+PLUGIN_ROOT = Path(__file__).resolve().parents[2]
+SAMPLE_RATE = 32000
+
+
+def load(name: str):
+    spec = importlib.util.spec_from_file_location(f"easytts_bench_{name}", PLUGIN_ROOT / "utils" / f"{name}.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def make_wav(seconds: float) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(b"\x01\x00" * int(SAMPLE_RATE * seconds))
+    return buf.getvalue()
+
+
+def make_text(n_chars: int) -> str:
+    base = "今天我们一起去公园散步，看到了很多盛开的花。天气也很好，大家都很开心！"
+    return (base * (n_chars // len(base) + 1))[:n_chars]
+
+
+async def run_case(args, chunk_text, concat, n_chars: int) -> None:
+    text = make_text(n_chars)
+    chunks = chunk_text(text, args.chunk)
+    studios = [asyncio.Semaphore(1) for _ in range(args.endpoints)]
+
+    async def synth(chunk: str, studio: asyncio.Semaphore) -> bytes:
+        async with studio:
+            await asyncio.sleep(args.overhead + args.per_char * len(chunk))
+            return make_wav(0.2 * len(chunk))
+
+    t0 = time.perf_counter()
+    for chunk in chunks:
+        await synth(chunk, studios[0])
+    sequential = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    clips = await asyncio.gather(*(synth(c, studios[i % len(studios)]) for i, c in enumerate(chunks)))
+    synth_s = time.perf_counter() - t0
+    t1 = time.perf_counter()
+    stitched = concat(clips, silence_ms=args.silence_ms)
+    stitch_s = time.perf_counter() - t1
+
+    with wave.open(io.BytesIO(stitched), "rb") as r:
+        duration = r.getnframes() / r.getframerate()
+    print(
+        f"{n_chars:5d} chars  {len(chunks):2d} chunks  sequential {sequential:6.2f}s  "
+        f"parallel {synth_s:6.2f}s + stitch {stitch_s * 1000:6.1f}ms  "
+        f"-> {len(stitched) / 1024:7.0f} KiB, {duration:5.1f}s audio"
+    )
+
+
+async def main_async(args) -> None:
+    chunk_text = load("text").TTSTextUtils.chunk_text
+    concat = load("wav").TTSWavUtils.concat
+    print(
+        f"{args.endpoints} endpoints, chunk <= {args.chunk} chars, "
+        f"latency = {args.overhead}s + {args.per_char * 1000:.0f}ms/char, silence {args.silence_ms}ms"
+    )
+    for n in (200, 500, 1000):
+        await run_case(args, chunk_text, concat, n)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--endpoints", type=int, default=4)
+    ap.add_argument("--chunk", type=int, default=120)
+    ap.add_argument("--overhead", type=float, default=1.5, help="seconds per request (queue join + model warmup)")
+    ap.add_argument("--per-char", type=float, default=0.02, help="seconds per character")
+    ap.add_argument("--silence-ms", type=int, default=250)
+    asyncio.run(main_async(ap.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: Gradio schema refresh (utils/gradio_schema.py) against a local fake studio.
+
+The fake studio serves /gradio_api/info with N characters and answers
+/gradio_api/call/update_preset_ui with a per-call delay, like a ms.show space
+that is awake but slow. Preset discovery is timed with concurrency=1 (the old
+serial behaviour) and with the configured concurrency; a few characters can be
+made to hang to show partial results.
+
+Usage:
+  python tools/benchmarks/bench_schema_fetch.py [--characters 24] [--delay 0.2] [--concurrency 8] [--hang 2]
+
+Requires aiohttp; only utils/sse.py and utils/gradio_schema.py are loaded (by file path), so this runs without MaiBot.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import sys
+import time
+import types
+from pathlib import Path
+
+from aiohttp import ClientSession, web
+
+PLUGIN_ROOT = Path(__file__).resolve().parents[2]
+
+
+def load_fetcher_class():
+    pkg = types.ModuleType("easytts_bench_utils")
+    pkg.__path__ = [str(PLUGIN_ROOT / "utils")]
+    sys.modules[pkg.__name__] = pkg
+    for name in ("sse", "gradio_schema"):
+        spec = importlib.util.spec_from_file_location(f"easytts_bench_utils.{name}", PLUGIN_ROOT / "utils" / f"{name}.py")
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = mod
+        spec.loader.exec_module(mod)
+    return sys.modules["easytts_bench_utils.gradio_schema"].GradioSchemaFetcher
+
+
+def make_fake_studio(n_characters: int, delay: float, hang: int) -> web.Application:
+    chars = [f"char_{i:02d}" for i in range(n_characters)]
+    hanging = set(chars[:hang])
+    events = {}
+
+    async def info(request):
+        return web.json_response(
+            {"named_endpoints": {"/update_preset_ui": {"parameters": [{"type": {"enum": chars}}]}}}
+        )
+
+    async def call(request):
+        body = await request.json()
+        character = body["data"][0]
+        event_id = f"evt-{len(events)}"
+        events[event_id] = character
+        await asyncio.sleep(delay / 2)
+        return web.json_response({"event_id": event_id})
+
+    async def result(request):
+        character = events[request.match_info["event_id"]]
+        await asyncio.sleep(3600 if character in hanging else delay / 2)
+        choices = [[p, p] for p in (f"{character}_普通", f"{character}_开心", f"{character}_生气")]
+        payload = json.dumps([{"choices": choices, "__type__": "update"}], ensure_ascii=False)
+        return web.Response(
+            text=f"event: complete\ndata: {payload}\n\n", content_type="text/event-stream", charset="utf-8"
+        )
+
+    app = web.Application()
+    app.router.add_get("/gradio_api/info", info)
+    app.router.add_post("/gradio_api/call/update_preset_ui", call)
+    app.router.add_get("/gradio_api/call/update_preset_ui/{event_id}", result)
+    return app
+
+
+async def run(args) -> None:
+    fetcher_cls = load_fetcher_class()
+    runner = web.AppRunner(make_fake_studio(args.characters, args.delay, args.hang))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+
+    print(
+        f"fake studio: {args.characters} characters, {args.delay * 1000:.0f}ms per preset call, "
+        f"{args.hang} hanging, per-call timeout {args.timeout}s"
+    )
+    try:
+        async with ClientSession() as session:
+            for concurrency in (1, args.concurrency):
+                fetcher = fetcher_cls(session, timeout=args.timeout, concurrency=concurrency)
+                t0 = time.perf_counter()
+                schema = await fetcher.fetch(base_url, "token")
+                elapsed = time.perf_counter() - t0
+                print(
+                    f"concurrency={concurrency:<3} {elapsed * 1000:8.1f}ms  "
+                    f"characters={len(schema.get('characters') or {})} failed={len(schema.get('failed') or [])}"
+                )
+    finally:
+        await runner.cleanup()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--characters", type=int, default=24)
+    ap.add_argument("--delay", type=float, default=0.2, help="seconds per preset discovery (POST + event stream)")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--hang", type=int, default=0, help="characters whose event stream never completes")
+    ap.add_argument("--timeout", type=float, default=2.0)
+    asyncio.run(run(ap.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Microbenchmark: incremental SSE parser (utils/sse.py) vs the old
+`buffer += chunk; buffer.split("\n", 1)` loop used by the queue/data client.
+
+Usage:
+  python tools/benchmarks/bench_sse.py [--events 20000] [--chunk 4096]
+
+Only the parser module is loaded (by file path), so this runs without MaiBot.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import sys
+import time
+from pathlib import Path
+
+PLUGIN_ROOT = Path(__file__).resolve().parents[2]
+
+
+def load_sse_module():
+    spec = importlib.util.spec_from_file_location("easytts_sse", PLUGIN_ROOT / "utils" / "sse.py")
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def make_stream(n_events: int, payload_chars: int = 16) -> bytes:
+    """A long process_generating/estimation stream followed by process_completed."""
+    parts = []
+    filler = ("生成中……" * (payload_chars // 5 + 1))[:payload_chars]
+    for i in range(n_events):
+        msg = "estimation" if i % 2 else "process_generating"
+        evt = {"msg": msg, "event_id": "e" * 32, "rank": i, "queue_size": 3, "output": {"data": [filler]}}
+        parts.append(f"data: {json.dumps(evt, ensure_ascii=False)}\n\n")
+    done = {"msg": "process_completed", "success": True, "output": {"data": [{"path": "/tmp/gradio/genie_x.wav"}]}}
+    parts.append(f"data: {json.dumps(done)}\n\n")
+    return "".join(parts).encode("utf-8")
+
+
+def chunks_of(raw: bytes, size: int):
+    return [raw[i : i + size] for i in range(0, len(raw), size)]
+
+
+def old_parser(chunks, decode_json: bool) -> int:
+    n = 0
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk.decode("utf-8", errors="ignore")
+        while "\n" in buffer:
+            line, buffer = buffer.split("\n", 1)
+            line = line.strip()
+            if not line.startswith("data:"):
+                continue
+            data_str = line[5:].strip()
+            if not data_str:
+                continue
+            if decode_json:
+                try:
+                    json.loads(data_str)
+                except Exception:
+                    continue
+            n += 1
+    return n
+
+
+def new_parser(sse, chunks, decode_json: bool) -> int:
+    n = 0
+    parser = sse.SSEParser()
+    for chunk in chunks:
+        for evt in parser.feed(chunk):
+            if decode_json:
+                evt.json()
+            n += 1
+    for evt in parser.flush():
+        if decode_json:
+            evt.json()
+        n += 1
+    return n
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--events", type=int, default=20000)
+    ap.add_argument("--chunk", type=int, default=65536, help="bytes per network chunk (aiohttp iter_any yields up to ~64 KiB)")
+    ap.add_argument("--json", action="store_true", help="also json-decode every event in both parsers")
+    args = ap.parse_args()
+
+    sse = load_sse_module()
+    scenarios = [(n, 16) for n in sorted({args.events // 10, args.events // 2, args.events})]
+    # A few very large events (e.g. inline base64 audio in output.data) spanning many chunks.
+    scenarios += [(4, 1_000_000), (4, 4_000_000)]
+    for n_events, payload_chars in scenarios:
+        raw = make_stream(n_events, payload_chars)
+        chunks = chunks_of(raw, args.chunk)
+        n_old, t_old = timed(old_parser, chunks, args.json)
+        n_new, t_new = timed(new_parser, sse, chunks, args.json)
+        assert n_old == n_new, (n_old, n_new)
+        print(
+            f"events={n_events:>6} payload={payload_chars:>8} stream={len(raw) / 1024 / 1024:6.2f} MiB "
+            f"chunk={args.chunk} old={t_old * 1000:9.1f} ms new={t_new * 1000:8.1f} ms "
+            f"speedup={t_old / t_new:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
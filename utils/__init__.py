@@ -8,6 +8,29 @@ sys.dont_write_bytecode = True
 from .text import TTSTextUtils
 from .session import TTSSessionManager
 from .file import TTSFileManager
+from .audio_cache import TTSAudioCache
+from .gradio_schema import GradioSchemaFetcher
+from .translation_cache import TTSTranslationCache
+from .emotion_lexicon import EmotionLexicon
+from .wav import TTSWavUtils
+from .audio_post import AudioPostOptions, TTSAudioPostProcessor
+from .download import AudioTooLargeError, SpooledAudio, TTSDownloadStats, stream_audio
+from .delivery import TTSDeliveryMemory
 
-__all__ = ["TTSTextUtils", "TTSSessionManager", "TTSFileManager"]
-
+__all__ = [
+    "TTSTextUtils",
+    "TTSSessionManager",
+    "TTSFileManager",
+    "TTSAudioCache",
+    "GradioSchemaFetcher",
+    "TTSTranslationCache",
+    "EmotionLexicon",
+    "TTSWavUtils",
+    "AudioPostOptions",
+    "TTSAudioPostProcessor",
+    "AudioTooLargeError",
+    "SpooledAudio",
+    "TTSDownloadStats",
+    "stream_audio",
+    "TTSDeliveryMemory",
+]
@@ -0,0 +1,244 @@
+"""
+合成音频缓存（内容寻址）：内存 LRU（按字节限额）+ 磁盘层（按总大小限额淘汰最久未用）。
+
+key = sha256(归一化文本, 角色, 预设, 远端分句开关, schema 版本)，命中时完全跳过网络请求。
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from src.common.logger import get_logger
+
+from .download import AudioData
+
+logger = get_logger("easytts_audio_cache")
+
+_WS_PATTERN = re.compile(r"\s+")
+
+
+class TTSAudioCache:
+    _memory: "OrderedDict[str, bytes]" = OrderedDict()
+    _memory_bytes: int = 0
+    # 磁盘索引：key -> (文件大小, 最近使用时间)；首次使用某个目录时扫描建立
+    _disk_index: Dict[str, Tuple[int, float]] = {}
+    _disk_bytes: int = 0
+    _disk_dir: Optional[str] = None
+    # 磁盘读写在线程池里执行，索引的修改需要串行化
+    _disk_lock = threading.Lock()
+
+    _memory_hits: int = 0
+    _disk_hits: int = 0
+    _misses: int = 0
+    _stores: int = 0
+    _evictions: int = 0
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        t = unicodedata.normalize("NFKC", text or "")
+        return _WS_PATTERN.sub(" ", t).strip()
+
+    @classmethod
+    def make_key(
+        cls, *, text: str, character: str, preset: str, remote_split: bool, schema_version: str = "", variant: str = ""
+    ) -> str:
+        # variant：缓存的是经过后处理的音频时，带上后处理参数签名
+        parts = [cls.normalize_text(text), character, preset, bool(remote_split), schema_version or ""]
+        if variant:
+            parts.append(variant)
+        raw = json.dumps(parts, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    # ---------- memory tier ----------
+
+    @classmethod
+    def _memory_get(cls, key: str) -> Optional[AudioData]:
+        data = cls._memory.get(key)
+        if data is not None:
+            cls._memory.move_to_end(key)
+        return data
+
+    @classmethod
+    def _memory_put(cls, key: str, data: AudioData, max_bytes: int) -> None:
+        if max_bytes <= 0 or len(data) > max_bytes:
+            return
+        old = cls._memory.pop(key, None)
+        if old is not None:
+            cls._memory_bytes -= len(old)
+        cls._memory[key] = data
+        cls._memory_bytes += len(data)
+        while cls._memory_bytes > max_bytes and cls._memory:
+            _, evicted = cls._memory.popitem(last=False)
+            cls._memory_bytes -= len(evicted)
+            cls._evictions += 1
+
+    # ---------- disk tier ----------
+
+    @classmethod
+    def _disk_path(cls, disk_dir: str, key: str) -> str:
+        return os.path.join(disk_dir, f"{key}.wav")
+
+    @classmethod
+    def _ensure_disk_index(cls, disk_dir: str) -> None:
+        if cls._disk_dir == disk_dir:
+            return
+        os.makedirs(disk_dir, exist_ok=True)
+        index: Dict[str, Tuple[int, float]] = {}
+        total = 0
+        for entry in os.scandir(disk_dir):
+            if not entry.is_file() or not entry.name.endswith(".wav"):
+                continue
+            st = entry.stat()
+            index[entry.name[:-4]] = (st.st_size, st.st_mtime)
+            total += st.st_size
+        cls._disk_index = index
+        cls._disk_bytes = total
+        cls._disk_dir = disk_dir
+
+    @classmethod
+    def _disk_get_sync(cls, disk_dir: str, key: str) -> Optional[bytes]:
+        cls._ensure_disk_index(disk_dir)
+        if key not in cls._disk_index:
+            return None
+        path = cls._disk_path(disk_dir, key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            now = time.time()
+            os.utime(path, (now, now))
+            cls._disk_index[key] = (len(data), now)
+            return data
+        except OSError:
+            size, _ = cls._disk_index.pop(key, (0, 0.0))
+            cls._disk_bytes -= size
+            return None
+
+    @classmethod
+    def _disk_put_sync(cls, disk_dir: str, key: str, data: AudioData, max_bytes: int) -> None:
+        if max_bytes <= 0 or len(data) > max_bytes:
+            return
+        cls._ensure_disk_index(disk_dir)
+        path = cls._disk_path(disk_dir, key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        old_size, _ = cls._disk_index.get(key, (0, 0.0))
+        cls._disk_index[key] = (len(data), time.time())
+        cls._disk_bytes += len(data) - old_size
+        cls._evict_disk(disk_dir, key, max_bytes)
+
+    @classmethod
+    def _evict_disk(cls, disk_dir: str, key: str, max_bytes: int) -> None:
+        if cls._disk_bytes <= max_bytes:
+            return
+        for old_key, (size, _) in sorted(cls._disk_index.items(), key=lambda kv: kv[1][1]):
+            if cls._disk_bytes <= max_bytes:
+                break
+            if old_key == key:
+                continue
+            try:
+                os.remove(cls._disk_path(disk_dir, old_key))
+            except OSError:
+                pass
+            cls._disk_index.pop(old_key, None)
+            cls._disk_bytes -= size
+            cls._evictions += 1
+
+    @classmethod
+    def _disk_put_file_sync(cls, disk_dir: str, key: str, src_path: str, max_bytes: int) -> None:
+        size = os.path.getsize(src_path)
+        if max_bytes <= 0 or size > max_bytes:
+            return
+        cls._ensure_disk_index(disk_dir)
+        path = cls._disk_path(disk_dir, key)
+        tmp_path = f"{path}.tmp"
+        shutil.copyfile(src_path, tmp_path)
+        os.replace(tmp_path, path)
+        old_size, _ = cls._disk_index.get(key, (0, 0.0))
+        cls._disk_index[key] = (size, time.time())
+        cls._disk_bytes += size - old_size
+        cls._evict_disk(disk_dir, key, max_bytes)
+
+    @classmethod
+    def _with_disk_lock(cls, fn, *args):
+        with cls._disk_lock:
+            return fn(*args)
+
+    # ---------- public ----------
+
+    @classmethod
+    async def get(cls, key: str, *, memory_max_bytes: int, disk_dir: str = "") -> Optional[AudioData]:
+        data = cls._memory_get(key)
+        if data is not None:
+            cls._memory_hits += 1
+            return data
+        if disk_dir:
+            try:
+                loop = asyncio.get_event_loop()
+                data = await loop.run_in_executor(None, cls._with_disk_lock, cls._disk_get_sync, disk_dir, key)
+            except Exception as e:
+                logger.warning(f"audio cache disk read failed: {e}")
+                data = None
+            if data is not None:
+                cls._disk_hits += 1
+                # 磁盘命中后回填到内存层
+                cls._memory_put(key, data, memory_max_bytes)
+                return data
+        cls._misses += 1
+        return None
+
+    @classmethod
+    async def put(cls, key: str, data: AudioData, *, memory_max_bytes: int, disk_dir: str = "", disk_max_bytes: int = 0) -> None:
+        if not data:
+            return
+        cls._memory_put(key, data, memory_max_bytes)
+        if disk_dir and disk_max_bytes > 0:
+            try:
+                loop = asyncio.get_event_loop()
+                await loop.run_in_executor(
+                    None, cls._with_disk_lock, cls._disk_put_sync, disk_dir, key, data, disk_max_bytes
+                )
+            except Exception as e:
+                logger.warning(f"audio cache disk write failed: {e}")
+        cls._stores += 1
+
+    @classmethod
+    async def put_file(cls, key: str, path: str, *, disk_dir: str, disk_max_bytes: int) -> None:
+        """已落盘的音频只写入磁盘层（复制文件），不读进内存。"""
+        if not disk_dir or disk_max_bytes <= 0:
+            return
+        try:
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(
+                None, cls._with_disk_lock, cls._disk_put_file_sync, disk_dir, key, path, disk_max_bytes
+            )
+        except Exception as e:
+            logger.warning(f"audio cache disk write failed: {e}")
+            return
+        cls._stores += 1
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        hits = cls._memory_hits + cls._disk_hits
+        total = hits + cls._misses
+        return {
+            "memory_hits": cls._memory_hits,
+            "disk_hits": cls._disk_hits,
+            "misses": cls._misses,
+            "hit_ratio": round(hits / total, 3) if total else 0.0,
+            "stores": cls._stores,
+            "evictions": cls._evictions,
+            "memory_entries": len(cls._memory),
+            "memory_bytes": cls._memory_bytes,
+            "disk_entries": len(cls._disk_index),
+            "disk_bytes": cls._disk_bytes,
+        }
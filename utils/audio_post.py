@@ -0,0 +1,151 @@
+"""
+合成音频后处理（可选，依赖 numpy）：去首尾静音、峰值归一化、下混单声道、重采样。
+
+云端返回的 WAV 常带首尾静音、采样率 32 kHz，直接 base64 发给 NapCat 体积偏大。
+整段采样一次性转成 float32 数组做向量化处理，最后写回 16-bit PCM WAV。
+未安装 numpy 时 available() 为 False，调用方直接跳过（原样发送）。
+"""
+
+import io
+import time
+import wave
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖
+    np = None
+
+
+@dataclass(frozen=True)
+class AudioPostOptions:
+    # 去静音阈值（dBFS，按 10ms 窗口 RMS）；0 = 不去静音
+    trim_db: float = -45.0
+    # 峰值归一化目标（dBFS）；0 = 不归一化
+    normalize_db: float = -1.0
+    mono: bool = True
+    # 目标采样率；0 = 保持原采样率
+    sample_rate: int = 0
+
+    def signature(self) -> str:
+        """参与音频缓存 key：参数变了，缓存里旧的处理结果不再命中。"""
+        return f"post:{self.trim_db}:{self.normalize_db}:{int(self.mono)}:{self.sample_rate}"
+
+
+class TTSAudioPostProcessor:
+    # 去静音后首尾各保留的余量，避免切掉字头/尾音
+    TRIM_PADDING_MS = 60
+    WINDOW_MS = 10
+
+    _clips: int = 0
+    _bytes_in: int = 0
+    _bytes_out: int = 0
+    _seconds: float = 0.0
+    _skipped: int = 0
+
+    @staticmethod
+    def available() -> bool:
+        return np is not None
+
+    @staticmethod
+    def _decode(data: bytes) -> Tuple["np.ndarray", int]:
+        """WAV -> (float32 数组 [帧, 声道]，范围 -1~1, 采样率)。"""
+        with wave.open(io.BytesIO(data), "rb") as r:
+            nchannels, sampwidth, rate = r.getnchannels(), r.getsampwidth(), r.getframerate()
+            raw = r.readframes(r.getnframes())
+        if sampwidth == 1:
+            samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+        elif sampwidth == 2:
+            samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+        elif sampwidth == 3:
+            b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+            ints = (b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)) << 8 >> 8
+            samples = ints.astype(np.float32) / 8388608.0
+        elif sampwidth == 4:
+            samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+        else:
+            raise ValueError(f"unsupported sample width: {sampwidth}")
+        return samples.reshape(-1, nchannels), rate
+
+    @staticmethod
+    def _encode(samples: "np.ndarray", rate: int) -> bytes:
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).round().astype("<i2")
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as w:
+            w.setnchannels(pcm.shape[1])
+            w.setsampwidth(2)
+            w.setframerate(rate)
+            w.writeframes(pcm.tobytes())
+        return buf.getvalue()
+
+    @classmethod
+    def _trim(cls, samples: "np.ndarray", rate: int, trim_db: float) -> "np.ndarray":
+        window = max(1, rate * cls.WINDOW_MS // 1000)
+        n_windows = len(samples) // window
+        if n_windows == 0:
+            return samples
+        frames = samples[: n_windows * window].reshape(n_windows, window, -1)
+        rms = np.sqrt(np.mean(frames * frames, axis=(1, 2)))
+        loud = np.flatnonzero(rms > 10 ** (trim_db / 20.0))
+        if loud.size == 0:
+            return samples
+        pad = rate * cls.TRIM_PADDING_MS // 1000
+        start = max(0, loud[0] * window - pad)
+        end = min(len(samples), (loud[-1] + 1) * window + pad)
+        return samples[start:end]
+
+    @staticmethod
+    def _resample(samples: "np.ndarray", rate: int, target: int) -> "np.ndarray":
+        if len(samples) < 2:
+            return samples
+        if target < rate:
+            # 降采样前做一次滑动平均低通，抑制线性插值带来的混叠
+            width = int(np.ceil(rate / target))
+            kernel = np.ones(width, dtype=np.float32) / width
+            samples = np.stack([np.convolve(samples[:, c], kernel, mode="same") for c in range(samples.shape[1])], axis=1)
+        n_out = int(round(len(samples) * target / rate))
+        src_pos = np.arange(n_out, dtype=np.float64) * (rate / target)
+        src_idx = np.arange(len(samples), dtype=np.float64)
+        return np.stack([np.interp(src_pos, src_idx, samples[:, c]) for c in range(samples.shape[1])], axis=1).astype(
+            np.float32
+        )
+
+    @classmethod
+    def process(cls, data: bytes, options: AudioPostOptions) -> Tuple[bytes, Dict[str, Any]]:
+        """同步处理一段 WAV（CPU 密集，调用方应放到线程池）。失败时抛异常，调用方回退原音频。"""
+        started = time.perf_counter()
+        samples, rate = cls._decode(data)
+        if options.mono and samples.shape[1] > 1:
+            samples = samples.mean(axis=1, keepdims=True)
+        if options.trim_db:
+            samples = cls._trim(samples, rate, options.trim_db)
+        if options.sample_rate and options.sample_rate != rate:
+            samples = cls._resample(samples, rate, options.sample_rate)
+            rate = options.sample_rate
+        if options.normalize_db:
+            peak = float(np.max(np.abs(samples))) if samples.size else 0.0
+            if peak > 1e-6:
+                samples = samples * (10 ** (options.normalize_db / 20.0) / peak)
+        out = cls._encode(samples, rate)
+        elapsed = time.perf_counter() - started
+
+        cls._clips += 1
+        cls._bytes_in += len(data)
+        cls._bytes_out += len(out)
+        cls._seconds += elapsed
+        return out, {"bytes_in": len(data), "bytes_out": len(out), "ms": round(elapsed * 1000, 1)}
+
+    @classmethod
+    def note_skipped(cls) -> None:
+        cls._skipped += 1
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        return {
+            "clips": cls._clips,
+            "skipped": cls._skipped,
+            "bytes_saved": cls._bytes_in - cls._bytes_out,
+            "ratio": round(cls._bytes_out / cls._bytes_in, 3) if cls._bytes_in else None,
+            "avg_ms": round(cls._seconds / cls._clips * 1000, 1) if cls._clips else None,
+        }
@@ -0,0 +1,68 @@
+"""
+语音发送方式记忆：文件发送模式下按 file:// URI -> 本地路径 -> base64 依次尝试，
+不同部署里能用的方式不同（如 Docker 里的 NapCat 读不到宿主机文件，前两种必然失败）。
+
+按平台（适配器）记住上次成功的方式，下次优先尝试；记忆到期后恢复默认顺序重新探测，
+探测期间持续成功不会续期。
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+class TTSDeliveryMemory:
+    # 平台 -> (方式, 学到的时间 time.monotonic())
+    _preferred: Dict[str, Tuple[str, float]] = {}
+    _successes: Dict[str, int] = {}
+    _failures: Dict[str, int] = {}
+    _learned: int = 0
+    _expired: int = 0
+
+    @classmethod
+    def preferred(cls, scope: str, ttl: float) -> Optional[str]:
+        """当前记住的方式；未开启（ttl<=0）、没有记录或已过期时返回 None。"""
+        if ttl <= 0:
+            return None
+        entry = cls._preferred.get(scope)
+        if entry is None:
+            return None
+        method, learned_at = entry
+        if time.monotonic() - learned_at > ttl:
+            del cls._preferred[scope]
+            cls._expired += 1
+            return None
+        return method
+
+    @classmethod
+    def order(cls, scope: str, methods: Sequence[str], ttl: float) -> List[str]:
+        """把记住的方式排到最前，其余保持原顺序。"""
+        method = cls.preferred(scope, ttl)
+        if method not in methods:
+            return list(methods)
+        return [method] + [m for m in methods if m != method]
+
+    @classmethod
+    def record(cls, scope: str, method: str, ok: bool, ttl: float) -> None:
+        if not ok:
+            cls._failures[method] = cls._failures.get(method, 0) + 1
+            entry = cls._preferred.get(scope)
+            if entry and entry[0] == method:
+                del cls._preferred[scope]
+            return
+        cls._successes[method] = cls._successes.get(method, 0) + 1
+        if ttl <= 0:
+            return
+        entry = cls._preferred.get(scope)
+        if entry is None or entry[0] != method:
+            cls._preferred[scope] = (method, time.monotonic())
+            cls._learned += 1
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        return {
+            "successes": dict(cls._successes),
+            "failures": dict(cls._failures),
+            "preferred": {scope: method for scope, (method, _) in cls._preferred.items()},
+            "learned": cls._learned,
+            "expired": cls._expired,
+        }
@@ -0,0 +1,156 @@
+"""
+音频流式下载：分块读取响应体，超过大小上限立即中止；
+内存模式写入按 Content-Length 预分配的缓冲区（预分配有上限，防止异常的响应头），以只读 memoryview 返回，
+峰值约为音频大小的 1 倍（resp.read() 先攒分块再拼接，约 2 倍）；
+落盘模式边下边攒批写进输出文件（写盘在线程池），只占一个攒批缓冲区。各下载的缓冲区占用汇总在 TTSDownloadStats。
+"""
+
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Union
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# 按 Content-Length 预分配的上限；更大的响应先填满预分配部分，其余追加写
+MAX_PREALLOC_BYTES = 16 * 1024 * 1024
+# 落盘模式攒够这么多再写一次盘
+SPOOL_FLUSH_BYTES = 256 * 1024
+
+
+# 内存中的音频：bytes，或下载缓冲区的只读 memoryview（均为 bytes-like，可直接交给 base64 / wave / 文件写入）
+AudioData = Union[bytes, memoryview]
+
+
+class AudioTooLargeError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class SpooledAudio:
+    """已直接写入文件的音频（落盘模式的下载结果）。"""
+
+    path: str
+    size: int
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class TTSDownloadStats:
+    _downloads: int = 0
+    _spooled: int = 0
+    _oversize: int = 0
+    # 正在进行的下载占用的缓冲区字节数（所有并发请求之和）及其峰值；单个请求的最大占用
+    _inflight_bytes: int = 0
+    _peak_inflight_bytes: int = 0
+    _peak_request_bytes: int = 0
+
+    @classmethod
+    def _reserve(cls, n: int) -> None:
+        cls._inflight_bytes += n
+        cls._peak_inflight_bytes = max(cls._peak_inflight_bytes, cls._inflight_bytes)
+
+    @classmethod
+    def _release(cls, n: int) -> None:
+        cls._inflight_bytes -= n
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        return {
+            "downloads": cls._downloads,
+            "spooled": cls._spooled,
+            "oversize": cls._oversize,
+            "inflight_bytes": cls._inflight_bytes,
+            "peak_inflight_bytes": cls._peak_inflight_bytes,
+            "peak_request_bytes": cls._peak_request_bytes,
+        }
+
+
+def _check_size(received: int, max_bytes: int) -> None:
+    if max_bytes > 0 and received > max_bytes:
+        TTSDownloadStats._oversize += 1
+        raise AudioTooLargeError(f"audio larger than {max_bytes} bytes, download aborted")
+
+
+async def _spool(resp: Any, path: str, *, max_bytes: int, chunk_size: int) -> int:
+    """分块攒到 SPOOL_FLUSH_BYTES 再交给线程池写盘（打开/关闭文件也在线程池），不阻塞事件循环。"""
+    loop = asyncio.get_event_loop()
+    received = 0
+    # 固定大小的攒批缓冲区反复使用：每次写盘都等写完才继续填
+    pending = bytearray(SPOOL_FLUSH_BYTES)
+    view = memoryview(pending)
+    filled = 0
+    f = await loop.run_in_executor(None, open, path, "wb")
+    try:
+        async for chunk in resp.content.iter_chunked(chunk_size):
+            n = len(chunk)
+            received += n
+            _check_size(received, max_bytes)
+            if filled + n > SPOOL_FLUSH_BYTES:
+                await loop.run_in_executor(None, f.write, view[:filled])
+                filled = 0
+            if n >= SPOOL_FLUSH_BYTES:
+                await loop.run_in_executor(None, f.write, chunk)
+                continue
+            view[filled : filled + n] = chunk
+            filled += n
+        if filled:
+            await loop.run_in_executor(None, f.write, view[:filled])
+    finally:
+        view.release()
+        await loop.run_in_executor(None, f.close)
+    return received
+
+
+async def stream_audio(
+    resp: Any, *, max_bytes: int = 0, spool_path: str = "", chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Union[memoryview, SpooledAudio]:
+    """
+    读取 aiohttp 响应体。spool_path 非空时写入该文件并返回 SpooledAudio（失败/取消时删除半截文件），
+    否则返回填好的缓冲区的只读 memoryview（不再拷贝一份 bytes；调用方拿不到可变的底层缓冲区）。
+    """
+    length = resp.content_length or 0
+    _check_size(length, max_bytes)
+    TTSDownloadStats._downloads += 1
+
+    if spool_path:
+        reserved = SPOOL_FLUSH_BYTES
+        TTSDownloadStats._reserve(reserved)
+        try:
+            received = await _spool(resp, spool_path, max_bytes=max_bytes, chunk_size=chunk_size)
+        except BaseException:
+            try:
+                os.remove(spool_path)
+            except OSError:
+                pass
+            raise
+        finally:
+            TTSDownloadStats._release(reserved)
+        TTSDownloadStats._spooled += 1
+        TTSDownloadStats._peak_request_bytes = max(TTSDownloadStats._peak_request_bytes, reserved)
+        return SpooledAudio(spool_path, received)
+
+    prealloc = min(length, MAX_PREALLOC_BYTES)
+    buf = bytearray(prealloc)
+    reserved = prealloc
+    TTSDownloadStats._reserve(reserved)
+    received = 0
+    try:
+        async for chunk in resp.content.iter_chunked(chunk_size):
+            n = len(chunk)
+            _check_size(received + n, max_bytes)
+            if received + n <= prealloc:
+                buf[received : received + n] = chunk
+            else:
+                # 没有 Content-Length、超出预分配上限或与实际不符：退化为追加写
+                del buf[received:]
+                buf += chunk
+                TTSDownloadStats._reserve(received + n - reserved)
+                reserved = received + n
+            received += n
+    finally:
+        TTSDownloadStats._release(reserved)
+    if received < len(buf):
+        del buf[received:]
+    TTSDownloadStats._peak_request_bytes = max(TTSDownloadStats._peak_request_bytes, reserved)
+    return memoryview(buf).toreadonly()
@@ -0,0 +1,98 @@
+"""
+情绪（preset）关键词词典：所有关键词编译成一个正则，单次扫描文本即可给每个 preset 计分。
+
+- 关键词按长度降序排进同一个交替式，同一位置优先匹配更长的词（“不开心”不会再算一次“开心”）；
+- 置信度 = 最高分 preset 的命中数 / 全部命中数，只有一个 preset 命中时为 1.0；同分时按词典顺序取靠前的 preset；
+- 调用方在置信度低于阈值时才去问 LLM。
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 内置词典（与旧版硬编码规则一致）；配置里出现的 preset 会整体替换对应条目
+DEFAULT_LEXICON: Dict[str, Tuple[str, ...]] = {
+    "疑问": ("?", "？"),
+    "惊讶": ("诶", "欸", "啊？", "啊!", "啊！", "什么？！", "真的假的", "卧槽", "我靠"),
+    "生气": ("烦", "别闹", "别吵", "讨厌", "生气", "气死", "滚", "闭嘴", "你有病", "可恶", "真是的"),
+    "开心": ("好耶", "太好了", "开心", "嘿嘿", "谢谢", "真棒", "喜欢", "耶"),
+    "伤心": ("难过", "伤心", "哭", "呜呜", "心痛", "好痛", "想哭", "不开心", "委屈"),
+}
+
+
+class EmotionLexicon:
+    # 按词典内容缓存编译结果（配置不变时不重复编译）
+    _compiled: Dict[Tuple[Tuple[str, Tuple[str, ...]], ...], "EmotionLexicon"] = {}
+    _counters: Dict[str, int] = {"llm_avoided": 0, "low_confidence": 0, "no_match": 0}
+
+    def __init__(self, lexicon: Dict[str, Sequence[str]]):
+        # 关键词（小写）-> 所属 preset 列表（同一个词可以属于多个 preset）
+        self._owners: Dict[str, List[str]] = {}
+        self._rank: Dict[str, int] = {preset: i for i, preset in enumerate(lexicon)}
+        for preset, words in lexicon.items():
+            for w in words:
+                w = str(w).strip().lower()
+                if w and preset not in self._owners.setdefault(w, []):
+                    self._owners[w].append(preset)
+        words = sorted(self._owners, key=len, reverse=True)
+        self._pattern = re.compile("|".join(re.escape(w) for w in words), re.IGNORECASE) if words else None
+
+    @staticmethod
+    def parse_spec(raw: Any) -> Dict[str, Tuple[str, ...]]:
+        """
+        配置格式（两种皆可）：
+        - TOML 表：{"开心": ["好耶", "太好了"], ...}
+        - 字符串（便于 WebUI 编辑）："开心=好耶,太好了; 生气=烦,讨厌"（条目用 ; 或换行分隔）
+        """
+        out: Dict[str, Tuple[str, ...]] = {}
+        if isinstance(raw, dict):
+            items: Iterable[Tuple[Any, Any]] = raw.items()
+        elif isinstance(raw, str):
+            items = (
+                entry.split("=", 1) if "=" in entry else entry.split(":", 1)
+                for entry in re.split(r"[;；\n]", raw)
+                if entry.strip() and ("=" in entry or ":" in entry)
+            )
+        else:
+            return out
+        for preset, words in items:
+            preset = str(preset).strip()
+            if isinstance(words, str):
+                words = re.split(r"[,，]", words)
+            if preset and isinstance(words, (list, tuple)):
+                out[preset] = tuple(str(w).strip() for w in words if str(w).strip())
+        return out
+
+    @classmethod
+    def from_config(cls, raw: Any) -> "EmotionLexicon":
+        lexicon = {**DEFAULT_LEXICON, **cls.parse_spec(raw)}
+        key = tuple(lexicon.items())
+        compiled = cls._compiled.get(key)
+        if compiled is None:
+            compiled = cls(lexicon)
+            cls._compiled = {key: compiled}
+        return compiled
+
+    def match(self, text: str, allowed: Optional[Iterable[str]] = None) -> Tuple[str, float]:
+        """返回 (preset, 置信度)；没有命中（或命中的 preset 都不在 allowed 里）时返回 ("", 0.0)。"""
+        if not text or self._pattern is None:
+            return "", 0.0
+        allowed_set = set(allowed) if allowed is not None else None
+        scores: Dict[str, int] = {}
+        for m in self._pattern.finditer(text):
+            for preset in self._owners.get(m.group(0).lower(), ()):
+                if allowed_set is None or preset in allowed_set:
+                    scores[preset] = scores.get(preset, 0) + 1
+        if not scores:
+            return "", 0.0
+        best = min(scores, key=lambda p: (-scores[p], self._rank.get(p, 0)))
+        return best, scores[best] / sum(scores.values())
+
+    @classmethod
+    def note(cls, outcome: str) -> None:
+        """outcome: llm_avoided / low_confidence / no_match。"""
+        cls._counters[outcome] = cls._counters.get(outcome, 0) + 1
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        total = sum(cls._counters.values())
+        return {**cls._counters, "avoided_ratio": round(cls._counters["llm_avoided"] / total, 3) if total else 0.0}
@@ -4,6 +4,7 @@
 
 import asyncio
 import base64
+import binascii
 import os
 import tempfile
 import uuid
@@ -14,6 +15,11 @@ from src.common.logger import get_logger
 logger = get_logger("easytts_file_manager")
 
 MIN_AUDIO_SIZE = 100
+BASE64_URI_PREFIX = b"base64://"
+# 超过该大小的音频放到线程池编码，避免卡住事件循环
+BASE64_OFFLOAD_BYTES = 256 * 1024
+# 分块编码（3 的倍数，块间不产生填充），每块的临时结果很小；事件循环不卡靠的是大音频走线程池，与分块无关
+_BASE64_CHUNK = 3 * 16 * 1024
 
 
 class TTSFileManager:
@@ -108,3 +114,32 @@ class TTSFileManager:
         except Exception as e:
             logger.error(f"audio_to_base64 failed: {e}")
             return ""
+
+    @staticmethod
+    def _base64_uri_sync(data: bytes) -> str:
+        view = memoryview(data)
+        start = len(BASE64_URI_PREFIX)
+        out = bytearray(start + (len(view) + 2) // 3 * 4)
+        out[:start] = BASE64_URI_PREFIX
+        pos = start
+        for i in range(0, len(view), _BASE64_CHUNK):
+            encoded = binascii.b2a_base64(view[i : i + _BASE64_CHUNK], newline=False)
+            out[pos : pos + len(encoded)] = encoded
+            pos += len(encoded)
+        return out.decode("ascii")
+
+    @classmethod
+    async def audio_to_base64_uri_async(cls, data: bytes) -> str:
+        """
+        编码为 "base64://..."（NapCat record 的 file 参数）。直接写入预分配缓冲区，省掉 b64encode 结果和
+        f-string 两份整段拷贝；最后的 decode("ascii") 仍会再拷一份，峰值约为编码后大小的 2 倍，
+        返回后只留 1 份。超过 BASE64_OFFLOAD_BYTES 的音频在线程池里编码，不阻塞事件循环。失败返回空串。
+        """
+        try:
+            if len(data) < BASE64_OFFLOAD_BYTES:
+                return cls._base64_uri_sync(data)
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, cls._base64_uri_sync, data)
+        except Exception as e:
+            logger.error(f"audio_to_base64_uri failed: {e}")
+            return ""
@@ -0,0 +1,115 @@
+"""
+异步抓取云端 easytts（Gradio）的“角色 / 预设”枚举：
+1) GET /gradio_api/info 读取 /update_preset_ui 的 character 枚举；
+2) 对每个 character 调用 /gradio_api/call/update_preset_ui，从事件流里拿到该角色真实的 preset 下拉列表。
+
+只依赖 aiohttp session（由调用方传入，通常来自 TTSSessionManager），不阻塞事件循环。
+第 2 步按 concurrency 限制并发进行，每个角色单独计时（POST + 事件流整体不超过 timeout），
+个别角色失败/超时不影响其它角色，结果里会标记 partial。
+"""
+
+import asyncio
+import json
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from .sse import parse_sse_bytes
+
+
+class GradioSchemaFetcher:
+    def __init__(self, session: aiohttp.ClientSession, *, timeout: float = 15, concurrency: int = 8):
+        self._session = session
+        self._timeout_s = max(1.0, float(timeout))
+        self._timeout = aiohttp.ClientTimeout(total=self._timeout_s)
+        self._concurrency = max(1, int(concurrency))
+
+    @staticmethod
+    def _headers(token: str) -> Dict[str, str]:
+        return {"X-Studio-Token": token, "Cookie": f"studio_token={token}"}
+
+    async def fetch_characters(self, base_url: str, token: str) -> List[str]:
+        async with self._session.get(
+            f"{base_url}/gradio_api/info", headers=self._headers(token), timeout=self._timeout
+        ) as resp:
+            resp.raise_for_status()
+            info = await resp.json(content_type=None)
+        named = info.get("named_endpoints") or {}
+        params = (named.get("/update_preset_ui") or {}).get("parameters") or []
+        char_enum = ((params[0].get("type") or {}).get("enum") or []) if params else []
+        return [str(x).strip() for x in char_enum if str(x).strip()]
+
+    async def fetch_presets(self, base_url: str, token: str, character: str) -> List[str]:
+        headers = self._headers(token)
+        call_url = f"{base_url}/gradio_api/call/update_preset_ui"
+        async with self._session.post(
+            call_url,
+            data=json.dumps({"data": [character]}, ensure_ascii=False).encode("utf-8"),
+            headers={**headers, "Content-Type": "application/json"},
+            timeout=self._timeout,
+        ) as resp:
+            resp.raise_for_status()
+            call_ret = await resp.json(content_type=None)
+        event_id = str(call_ret.get("event_id") or "").strip()
+        if not event_id:
+            return []
+
+        async with self._session.get(
+            f"{call_url}/{event_id}",
+            headers={**headers, "Accept": "text/event-stream"},
+            timeout=self._timeout,
+        ) as resp:
+            resp.raise_for_status()
+            sse_events = parse_sse_bytes(await resp.read())
+
+        data_json = next((evt.data.strip() for evt in sse_events if evt.data.strip()), "")
+        if not data_json:
+            return []
+        updates = json.loads(data_json)
+        if not isinstance(updates, list) or not updates:
+            return []
+        first = updates[0] if isinstance(updates[0], dict) else {}
+        presets = []
+        for pair in first.get("choices") or []:
+            if isinstance(pair, (list, tuple)) and len(pair) >= 2:
+                presets.append(str(pair[1]).strip())
+            elif isinstance(pair, str):
+                presets.append(pair.strip())
+        return [p for p in presets if p]
+
+    async def _fetch_presets_bounded(
+        self, sem: asyncio.Semaphore, base_url: str, token: str, character: str
+    ) -> Optional[List[str]]:
+        """失败/超时返回 None（与“该角色没有预设”的 [] 区分开）。"""
+        async with sem:
+            try:
+                return await asyncio.wait_for(self.fetch_presets(base_url, token, character), self._timeout_s)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                return None
+
+    async def fetch(self, base_url: str, token: str) -> dict:
+        """
+        抓取一个仓库的 schema：{"characters": {角色: [预设...]}, "source": base_url}。
+        有角色失败时额外带上 "partial": True 与 "failed": [角色...]；一个角色都拿不到时返回 {}。
+        """
+        base_url = base_url.rstrip("/")
+        chars = await self.fetch_characters(base_url, token)
+        sem = asyncio.Semaphore(self._concurrency)
+        results = await asyncio.gather(*(self._fetch_presets_bounded(sem, base_url, token, c) for c in chars))
+
+        char_presets: Dict[str, List[str]] = {}
+        failed: List[str] = []
+        for c, presets in zip(chars, results):
+            if presets is None:
+                failed.append(c)
+            elif presets:
+                char_presets[c] = presets
+        if not char_presets:
+            return {}
+        schema: dict = {"characters": char_presets, "source": base_url}
+        if failed:
+            schema["partial"] = True
+            schema["failed"] = failed
+        return schema
@@ -0,0 +1,74 @@
+"""
+轻量统计工具：滑动窗口分位数（用于对冲延迟、延迟报表等）、单次请求的分阶段计时。
+"""
+
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Awaitable, Deque, Dict, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class LatencyWindow:
+    """保存最近 maxlen 个样本（秒），按需计算分位数。"""
+
+    def __init__(self, maxlen: int = 200):
+        self._samples: Deque[float] = deque(maxlen=maxlen)
+
+    def add(self, seconds: float) -> None:
+        if seconds >= 0:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """最近邻分位数；p 取 0~100。没有样本时返回 None。"""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(p / 100.0 * len(ordered)))
+        return ordered[min(rank, len(ordered)) - 1]
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        def ms(v: Optional[float]) -> Optional[float]:
+            return round(v * 1000, 1) if v is not None else None
+
+        return {"count": len(self._samples), "p50_ms": ms(self.percentile(50)), "p99_ms": ms(self.percentile(99))}
+
+
+class StageTimer:
+    """
+    记录一次请求里各阶段的耗时。并发执行的阶段各自计时（总和可能大于 total）；
+    total 为创建计时器到调用 summary()/format() 时的墙钟时间。
+    """
+
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self._stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stages[name] = self._stages.get(name, 0.0) + (time.perf_counter() - started)
+
+    async def run(self, name: str, awaitable: Awaitable[T]) -> T:
+        with self.stage(name):
+            return await awaitable
+
+    def mark(self, name: str) -> None:
+        """记录一个时间点（距创建计时器的墙钟时间），如首条语音发出的时刻。"""
+        self._stages[name] = time.perf_counter() - self._t0
+
+    def summary(self) -> Dict[str, float]:
+        out = {k: round(v * 1000, 1) for k, v in self._stages.items()}
+        out["total"] = round((time.perf_counter() - self._t0) * 1000, 1)
+        return out
+
+    def format(self) -> str:
+        return " ".join(f"{k}={v:.0f}ms" for k, v in self.summary().items())
@@ -1,10 +1,15 @@
 """
 HTTP Session 管理器（参考 tts_voice_plugin）。
+
+两种连接模式：
+- 默认（pooled=False）：每个请求用完即关闭连接（force_close），每次都重新 TCP+TLS 握手；
+- 连接池（pooled=True）：keep-alive 复用连接，按 backend 限制单 host 连接数，空闲连接超时回收。
+通过 aiohttp TraceConfig 统计新建连接（握手）与复用次数。
 """
 
 import asyncio
 from contextlib import asynccontextmanager
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
 
 import aiohttp
 from src.common.logger import get_logger
@@ -18,8 +23,18 @@ class TTSSessionManager:
 
     def __init__(self, *, trust_env: bool = False):
         self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        # 创建 session 时使用的连接参数，参数变化后会重建 session
+        self._session_params: Dict[str, Tuple[bool, float, int]] = {}
         self._default_timeout = 60
         self._trust_env = trust_env
+        self._pooled = False
+        self._keepalive_timeout = 30.0
+        self._host_limits: Dict[str, int] = {}
+        # backend_name -> {"requests", "new_connections", "reused_connections"}
+        self._conn_stats: Dict[str, Dict[str, int]] = {}
+        # 各 session 上进行中的请求数；参数变化被替换下来的旧 session 等请求全部结束后再关闭
+        self._inflight: Dict[aiohttp.ClientSession, int] = {}
+        self._retiring: Set[aiohttp.ClientSession] = set()
 
     @classmethod
     async def get_instance(cls, *, trust_env: bool = False) -> "TTSSessionManager":
@@ -31,22 +46,133 @@ class TTSSessionManager:
             cls._instance._trust_env = trust_env
         return cls._instance
 
+    def configure_pool(self, *, pooled: bool, keepalive_timeout: float = 30.0) -> None:
+        """切换连接模式；已创建的 session 会在下次使用时按新参数重建。"""
+        self._pooled = bool(pooled)
+        self._keepalive_timeout = max(1.0, float(keepalive_timeout))
+
+    def set_host_limit(self, backend_name: str, limit_per_host: int) -> None:
+        """设置某个 backend（通常是一个云端仓库）的单 host 最大连接数。"""
+        self._host_limits[backend_name] = max(1, int(limit_per_host))
+
+    def _make_trace_config(self, backend_name: str) -> aiohttp.TraceConfig:
+        stats = self._conn_stats.setdefault(backend_name, {"requests": 0, "new_connections": 0, "reused_connections": 0})
+
+        async def on_request_start(session, ctx, params):
+            stats["requests"] += 1
+
+        async def on_connection_create_end(session, ctx, params):
+            stats["new_connections"] += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            stats["reused_connections"] += 1
+
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace
+
     async def get_session(self, backend_name: str = "default", timeout: int = None) -> aiohttp.ClientSession:
-        if backend_name not in self._sessions or self._sessions[backend_name].closed:
+        params = (self._pooled, self._keepalive_timeout, self._host_limits.get(backend_name, 5))
+        session = self._sessions.get(backend_name)
+        if session is not None and not session.closed and self._session_params.get(backend_name) != params:
+            # 连接参数变了：旧 session 上可能还有进行中的请求（SSE 结果流可长达数分钟），等它们结束再关闭
+            self._retire(session)
+            session = None
+        if session is None or session.closed:
             timeout_val = timeout or self._default_timeout
-            connector = aiohttp.TCPConnector(
-                limit=10,
-                limit_per_host=5,
-                ttl_dns_cache=300,
-                force_close=True,
-            )
-            self._sessions[backend_name] = aiohttp.ClientSession(
+            pooled, keepalive_timeout, limit_per_host = params
+            if pooled:
+                connector = aiohttp.TCPConnector(
+                    limit=max(10, limit_per_host),
+                    limit_per_host=limit_per_host,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=keepalive_timeout,
+                )
+            else:
+                connector = aiohttp.TCPConnector(
+                    limit=max(10, limit_per_host),
+                    limit_per_host=limit_per_host,
+                    ttl_dns_cache=300,
+                    force_close=True,
+                )
+            session = aiohttp.ClientSession(
                 connector=connector,
                 timeout=aiohttp.ClientTimeout(total=timeout_val),
                 trust_env=self._trust_env,
+                trace_configs=[self._make_trace_config(backend_name)],
             )
-            logger.debug(f"create session: {backend_name} trust_env={self._trust_env}")
-        return self._sessions[backend_name]
+            self._sessions[backend_name] = session
+            self._session_params[backend_name] = params
+            logger.debug(
+                f"create session: {backend_name} trust_env={self._trust_env} pooled={pooled} "
+                f"limit_per_host={limit_per_host} keepalive_timeout={keepalive_timeout}"
+            )
+        return session
+
+    def _retire(self, session: aiohttp.ClientSession) -> None:
+        if self._inflight.get(session, 0) > 0:
+            self._retiring.add(session)
+        else:
+            asyncio.ensure_future(session.close())
+
+    @asynccontextmanager
+    async def _track(self, session: aiohttp.ClientSession) -> AsyncIterator[None]:
+        """统计 session 上进行中的请求；被替换下来的旧 session 在最后一个请求结束时关闭。"""
+        self._inflight[session] = self._inflight.get(session, 0) + 1
+        try:
+            yield
+        finally:
+            left = self._inflight.pop(session) - 1
+            if left > 0:
+                self._inflight[session] = left
+            elif session in self._retiring:
+                self._retiring.discard(session)
+                if not session.closed:
+                    asyncio.ensure_future(session.close())
+
+    async def prewarm(self, base_urls: Dict[str, str], timeout: float = 10) -> Dict[str, bool]:
+        """
+        对每个 backend_name -> base_url 发一次 HEAD，提前完成 TCP+TLS 握手并把连接放回连接池。
+        仅在连接池模式下有意义；返回各 backend 是否预热成功。
+        """
+        if not self._pooled:
+            return {}
+
+        async def warm(backend_name: str, url: str) -> bool:
+            try:
+                session = await self.get_session(backend_name)
+                async with session.head(url, allow_redirects=False, timeout=aiohttp.ClientTimeout(total=timeout)):
+                    return True
+            except Exception as e:
+                logger.debug(f"prewarm failed: {backend_name} {url}: {e}")
+                return False
+
+        names = list(base_urls.keys())
+        results = await asyncio.gather(*(warm(n, base_urls[n]) for n in names))
+        return dict(zip(names, results))
+
+    def connection_stats(self) -> Dict[str, Any]:
+        """每个 backend 以及总体的请求数、新建连接（握手）数、复用数与复用率。"""
+
+        def with_ratio(st: Dict[str, int]) -> Dict[str, Any]:
+            conns = st["new_connections"] + st["reused_connections"]
+            return {
+                **st,
+                "handshakes_per_request": round(st["new_connections"] / st["requests"], 3) if st["requests"] else 0.0,
+                "reuse_ratio": round(st["reused_connections"] / conns, 3) if conns else 0.0,
+            }
+
+        total = {"requests": 0, "new_connections": 0, "reused_connections": 0}
+        for st in self._conn_stats.values():
+            for k in total:
+                total[k] += st[k]
+        return {
+            "pooled": self._pooled,
+            "total": with_ratio(total),
+            "backends": {name: with_ratio(st) for name, st in self._conn_stats.items()},
+        }
 
     @asynccontextmanager
     async def post(
@@ -60,11 +186,12 @@ class TTSSessionManager:
     ):
         session = await self.get_session(backend_name, timeout)
         req_timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
-        resp = await session.post(url, json=json, headers=headers, data=data, timeout=req_timeout)
-        try:
-            yield resp
-        finally:
-            resp.release()
+        async with self._track(session):
+            resp = await session.post(url, json=json, headers=headers, data=data, timeout=req_timeout)
+            try:
+                yield resp
+            finally:
+                resp.release()
 
     @asynccontextmanager
     async def get(
@@ -77,22 +204,26 @@ class TTSSessionManager:
     ):
         session = await self.get_session(backend_name, timeout)
         req_timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
-        resp = await session.get(url, headers=headers, params=params, timeout=req_timeout)
-        try:
-            yield resp
-        finally:
-            resp.release()
+        async with self._track(session):
+            resp = await session.get(url, headers=headers, params=params, timeout=req_timeout)
+            try:
+                yield resp
+            finally:
+                resp.release()
 
     async def close_session(self, backend_name: str = None):
         if backend_name:
+            self._session_params.pop(backend_name, None)
             session = self._sessions.pop(backend_name, None)
             if session and not session.closed:
                 await session.close()
         else:
-            for session in self._sessions.values():
+            for session in [*self._sessions.values(), *self._retiring]:
                 if not session.closed:
                     await session.close()
             self._sessions.clear()
+            self._session_params.clear()
+            self._retiring.clear()
 
     async def __aenter__(self):
         return self
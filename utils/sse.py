@@ -0,0 +1,110 @@
+"""
+增量 SSE（text/event-stream）解析器。
+
+- 直接吃 bytes 分块，UTF-8 增量解码（多字节字符跨块也不会乱码/丢字）；
+- 已处理的数据不会被反复拼接/切分，整体耗时与流长度成线性关系；
+- 按规范处理多行 data:（用 "\\n" 拼接）、event:/id: 字段、注释行与 CRLF 行尾。
+"""
+
+import codecs
+import json
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, AsyncIterator, List, Optional
+
+
+@dataclass
+class SSEEvent:
+    data: str
+    event: str = "message"
+    id: Optional[str] = None
+
+    def json(self) -> Any:
+        return json.loads(self.data)
+
+
+class SSEParser:
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        # 尚未遇到换行的行片段（按块累积，遇到换行时一次性 join）
+        self._partial: List[str] = []
+        self._data_lines: List[str] = []
+        self._event = ""
+        self._last_id: Optional[str] = None
+
+    def feed(self, chunk: bytes) -> List[SSEEvent]:
+        text = self._decoder.decode(chunk)
+        return self._feed_text(text) if text else []
+
+    def flush(self) -> List[SSEEvent]:
+        """流结束：处理最后一行（即使没有换行结尾）并派发尚未派发的事件。"""
+        events = self._feed_text(self._decoder.decode(b"", final=True))
+        if self._partial:
+            line = "".join(self._partial)
+            self._partial = []
+            self._process_line(line.rstrip("\r"), events)
+        self._dispatch(events)
+        return events
+
+    def _feed_text(self, text: str) -> List[SSEEvent]:
+        events: List[SSEEvent] = []
+        if "\n" not in text:
+            self._partial.append(text)
+            return events
+        lines = text.split("\n")
+        if self._partial:
+            self._partial.append(lines[0])
+            lines[0] = "".join(self._partial)
+            self._partial = []
+        tail = lines.pop()
+        if tail:
+            self._partial.append(tail)
+        process = self._process_line
+        for line in lines:
+            process(line[:-1] if line.endswith("\r") else line, events)
+        return events
+
+    def _process_line(self, line: str, events: List[SSEEvent]) -> None:
+        if not line:
+            self._dispatch(events)
+            return
+        if line.startswith("data:"):
+            # 快速路径：绝大多数行都是 data:
+            self._data_lines.append(line[6:] if line.startswith("data: ") else line[5:])
+            return
+        if line.startswith(":"):
+            return
+        field, sep, value = line.partition(":")
+        if sep and value.startswith(" "):
+            value = value[1:]
+        if field == "data":
+            self._data_lines.append(value)
+        elif field == "event":
+            self._event = value
+        elif field == "id":
+            self._last_id = value
+
+    def _dispatch(self, events: List[SSEEvent]) -> None:
+        if self._data_lines:
+            events.append(SSEEvent(data="\n".join(self._data_lines), event=self._event or "message", id=self._last_id))
+        self._data_lines = []
+        self._event = ""
+
+
+def parse_sse_bytes(raw: bytes) -> List[SSEEvent]:
+    """一次性解析完整的 SSE 响应体。"""
+    parser = SSEParser()
+    return parser.feed(raw) + parser.flush()
+
+
+async def iter_sse_events(chunks: AsyncIterable[bytes]) -> AsyncIterator[SSEEvent]:
+    """
+    把字节块异步迭代器（例如 aiohttp 的 resp.content.iter_any()）转换为 SSE 事件异步迭代器。
+    """
+    parser = SSEParser()
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        for evt in parser.feed(chunk):
+            yield evt
+    for evt in parser.flush():
+        yield evt
@@ -2,8 +2,9 @@
 文本处理工具（参考 tts_voice_plugin）。
 """
 
+import json
 import re
-from typing import List, Optional
+from typing import Any, List, Optional
 
 
 class TTSTextUtils:
@@ -76,3 +77,56 @@ class TTSTextUtils:
             sentences = merged
         return sentences
 
+    @classmethod
+    def chunk_text(cls, text: str, max_length: int) -> List[str]:
+        """
+        长文本分段：按句切分后贪心合并成不超过 max_length 的段；
+        单句超长时再按逗号/顿号切，仍超长则硬切。
+        """
+        if not text:
+            return []
+        if max_length <= 0 or len(text) <= max_length:
+            return [text]
+        pieces: List[str] = []
+        for sent in cls.split_sentences(text, min_length=1):
+            if len(sent) <= max_length:
+                pieces.append(sent)
+                continue
+            for part in re.split(r"(?<=[，,、])", sent):
+                while len(part) > max_length:
+                    pieces.append(part[:max_length])
+                    part = part[max_length:]
+                if part:
+                    pieces.append(part)
+        chunks: List[str] = []
+        for piece in pieces:
+            if chunks and len(chunks[-1]) + len(piece) <= max_length:
+                chunks[-1] += piece
+            else:
+                chunks.append(piece)
+        return [c.strip() for c in chunks if c.strip()]
+
+    @classmethod
+    def parse_json_payload(cls, text: str) -> Any:
+        """
+        从 LLM 输出里取出 JSON（容忍 ```json 代码块、前后说明文字）；解析失败返回 None。
+        先整体解析，失败再截取第一个 [ / { 到最后一个 ] / } 之间的部分。
+        """
+        if not text:
+            return None
+        t = text.strip()
+        fence = re.search(r"```(?:json)?\s*(.*?)```", t, re.S)
+        if fence:
+            t = fence.group(1).strip()
+        try:
+            return json.loads(t)
+        except ValueError:
+            pass
+        for open_ch, close_ch in (("[", "]"), ("{", "}")):
+            start, end = t.find(open_ch), t.rfind(close_ch)
+            if 0 <= start < end:
+                try:
+                    return json.loads(t[start : end + 1])
+                except ValueError:
+                    continue
+        return None
@@ -0,0 +1,199 @@
+"""
+翻译记忆：同一句话（归一化后）翻译到同一目标语言的结果在各会话间复用，命中时省掉一次 LLM 调用。
+
+key = sha256(归一化原文, 目标语言, 提示词版本)；提示词改动后版本号随之变化，旧条目自然失效。
+内存 LRU（按条数限额）+ TTL；可选落盘为一个 JSON 文件：插件启动时在后台加载，
+新写入的条目只标记为脏，攒 FLUSH_DELAY 秒后在线程池里整体重写一次（插件卸载时也会落盘）。
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from src.common.logger import get_logger
+
+from .audio_cache import TTSAudioCache
+
+logger = get_logger("easytts_translation_cache")
+
+
+class TTSTranslationCache:
+    # key -> (译文, 写入时间 time.time())
+    _entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+    _disk_path: Optional[str] = None
+    _disk_lock = threading.Lock()
+    _load_task: Optional["asyncio.Task"] = None
+    _flush_task: Optional["asyncio.Task"] = None
+    _dirty: bool = False
+    # 写入后延迟多久落盘（秒）：这段时间内的多次写入合并成一次
+    FLUSH_DELAY: float = 5.0
+
+    _hits: int = 0
+    _misses: int = 0
+    _expired: int = 0
+    _stores: int = 0
+    _evictions: int = 0
+    # 未命中时实际 LLM 调用的累计耗时/次数，用平均值估算命中省下的时间
+    _llm_seconds: float = 0.0
+    _llm_calls: int = 0
+    _saved_seconds: float = 0.0
+    _flushes: int = 0
+
+    @staticmethod
+    def prompt_version(prompt: str) -> str:
+        return hashlib.sha256((prompt or "").encode("utf-8")).hexdigest()[:12]
+
+    @classmethod
+    def make_key(cls, *, text: str, target: str, prompt_version: str) -> str:
+        raw = json.dumps([TTSAudioCache.normalize_text(text), target, prompt_version], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    # ---------- disk ----------
+
+    @classmethod
+    def _load_sync(cls, path: str) -> None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"translation cache load failed: {e}")
+            return
+        items = sorted(
+            ((k, v) for k, v in (data or {}).items() if isinstance(v, list) and len(v) == 2),
+            key=lambda kv: float(kv[1][1] or 0),
+        )
+        for key, (value, stored_at) in items:
+            cls._entries.setdefault(key, (str(value), float(stored_at or 0)))
+
+    @classmethod
+    def _save_sync(cls, path: str, snapshot: Dict[str, Tuple[str, float]]) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({k: [v, int(t)] for k, (v, t) in snapshot.items()}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    async def _load(cls, path: str) -> None:
+        try:
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, cls._with_disk_lock, cls._load_sync, path)
+        except Exception as e:
+            logger.warning(f"translation cache load failed: {e}")
+
+    @classmethod
+    def _ensure_loaded(cls, path: str) -> Optional["asyncio.Task"]:
+        """路径变了（或启动时还没加载）：在后台加载，不阻塞本次查询；返回进行中的加载任务。"""
+        if path and cls._disk_path != path:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return None
+            cls._disk_path = path
+            cls._load_task = loop.create_task(cls._load(path))
+        task = cls._load_task
+        return task if task is not None and not task.done() else None
+
+    @classmethod
+    async def load(cls, path: str) -> None:
+        """插件启动时由后台任务调用：在线程池里加载落盘文件。"""
+        task = cls._ensure_loaded(path)
+        if task is not None:
+            await task
+
+    @classmethod
+    async def _flush_later(cls) -> None:
+        try:
+            await asyncio.sleep(cls.FLUSH_DELAY)
+        finally:
+            cls._flush_task = None
+        await cls.flush()
+
+    @classmethod
+    async def flush(cls) -> None:
+        """把脏数据整体写回文件（在线程池里写）；没有改动时什么都不做。"""
+        # 文件还没加载完就写回会覆盖掉其中的旧条目
+        loading = cls._ensure_loaded("")
+        if loading is not None:
+            await loading
+        path = cls._disk_path
+        if not cls._dirty or not path:
+            return
+        cls._dirty = False
+        snapshot = dict(cls._entries)
+        try:
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, cls._with_disk_lock, cls._save_sync, path, snapshot)
+            cls._flushes += 1
+        except Exception as e:
+            cls._dirty = True
+            logger.warning(f"translation cache disk write failed: {e}")
+
+    # ---------- public ----------
+
+    @classmethod
+    def get(cls, key: str, *, ttl: float, path: str = "") -> Optional[str]:
+        cls._ensure_loaded(path)
+        entry = cls._entries.get(key)
+        if entry is not None and ttl > 0 and time.time() - entry[1] > ttl:
+            cls._entries.pop(key, None)
+            cls._expired += 1
+            entry = None
+        if entry is None:
+            cls._misses += 1
+            return None
+        cls._entries.move_to_end(key)
+        cls._hits += 1
+        if cls._llm_calls:
+            cls._saved_seconds += cls._llm_seconds / cls._llm_calls
+        return entry[0]
+
+    @classmethod
+    async def put(cls, key: str, value: str, *, max_entries: int, path: str = "", llm_seconds: float = 0.0) -> None:
+        if not value:
+            # 翻译失败：既不缓存，也不计入 LLM 平均耗时（否则会高估命中省下的时间）
+            return
+        if llm_seconds > 0:
+            cls._llm_seconds += llm_seconds
+            cls._llm_calls += 1
+        if max_entries <= 0:
+            return
+        cls._ensure_loaded(path)
+        cls._entries.pop(key, None)
+        cls._entries[key] = (value, time.time())
+        cls._stores += 1
+        while len(cls._entries) > max_entries:
+            cls._entries.popitem(last=False)
+            cls._evictions += 1
+        if path:
+            cls._dirty = True
+            if cls._flush_task is None:
+                cls._flush_task = asyncio.get_event_loop().create_task(cls._flush_later())
+
+    @classmethod
+    def _with_disk_lock(cls, fn, *args):
+        with cls._disk_lock:
+            return fn(*args)
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        total = cls._hits + cls._misses
+        return {
+            "hits": cls._hits,
+            "misses": cls._misses,
+            "hit_ratio": round(cls._hits / total, 3) if total else 0.0,
+            "expired": cls._expired,
+            "stores": cls._stores,
+            "evictions": cls._evictions,
+            "entries": len(cls._entries),
+            "avg_llm_ms": round(cls._llm_seconds / cls._llm_calls * 1000, 1) if cls._llm_calls else None,
+            "saved_ms": round(cls._saved_seconds * 1000, 1),
+            "flushes": cls._flushes,
+        }
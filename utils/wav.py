@@ -0,0 +1,50 @@
+"""
+WAV 工具（标准库 wave）：把多段合成结果按采样拼接成一条语音，段间插入静音。
+"""
+
+import io
+import wave
+from typing import List, Sequence
+
+
+class TTSWavUtils:
+    @staticmethod
+    def _silence(frames: int, nchannels: int, sampwidth: int) -> bytes:
+        # 8-bit PCM 是无符号的，静音值为 0x80；16/24/32-bit 为有符号，静音值为 0
+        fill = b"\x80" if sampwidth == 1 else b"\x00"
+        return fill * (frames * nchannels * sampwidth)
+
+    @classmethod
+    def concat(cls, clips: Sequence[bytes], *, silence_ms: int = 0) -> bytes:
+        """
+        拼接多段 WAV：取各段 PCM 帧依次写入，段间插入 silence_ms 毫秒静音；只有一段时原样返回。
+        各段的声道数/位深/采样率必须一致，否则抛 ValueError（调用方据此回退）。
+        """
+        if not clips:
+            raise ValueError("no audio clips")
+        if len(clips) == 1:
+            return bytes(clips[0])
+
+        params = None
+        frames: List[bytes] = []
+        for data in clips:
+            with wave.open(io.BytesIO(data), "rb") as r:
+                p = (r.getnchannels(), r.getsampwidth(), r.getframerate())
+                if params is None:
+                    params = p
+                elif p != params:
+                    raise ValueError(f"wav format mismatch: {p} != {params}")
+                frames.append(r.readframes(r.getnframes()))
+
+        nchannels, sampwidth, framerate = params
+        gap = cls._silence(int(framerate * max(0, silence_ms) / 1000), nchannels, sampwidth)
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as w:
+            w.setnchannels(nchannels)
+            w.setsampwidth(sampwidth)
+            w.setframerate(framerate)
+            for i, chunk in enumerate(frames):
+                if i and gap:
+                    w.writeframesraw(gap)
+                w.writeframesraw(chunk)
+        return buf.getvalue()